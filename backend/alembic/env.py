@@ -0,0 +1,22 @@
+from logging.config import fileConfig
+from alembic import context
+from app.core.database import Base, engine
+from app import models  # noqa: F401  registers the tables on Base.metadata
+
+config = context.config
+target_metadata = Base.metadata
+
+def run_migrations(connection):
+    context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+# app.core.database.migrate() passes its connection; the alembic CLI opens one on DATABASE_URL
+connection = config.attributes.get("connection")
+if connection is not None:
+    run_migrations(connection)
+else:
+    if config.config_file_name is not None:
+        fileConfig(config.config_file_name)
+    with engine.begin() as connection:
+        run_migrations(connection)
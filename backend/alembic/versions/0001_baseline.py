@@ -0,0 +1,53 @@
+"""Baseline: users, projects and generation jobs
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+STATUSES = ("PENDING", "PROCESSING", "COMPLETED", "FAILED")
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_table(
+        "projects",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("status", sa.Enum(*STATUSES, name="projectstatus")),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_table(
+        "generation_jobs",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("project_id", sa.String(), sa.ForeignKey("projects.id"), nullable=False),
+        sa.Column("status", sa.Enum(*STATUSES, name="jobstatus")),
+        sa.Column("input_files", sa.JSON()),
+        sa.Column("output_path", sa.Text()),
+        sa.Column("spec_json", sa.Text(), nullable=True),
+        sa.Column("error_log", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime()),
+    )
+
+def downgrade():
+    op.drop_table("generation_jobs")
+    op.drop_table("projects")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_table("users")
+    sa.Enum(name="jobstatus").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="projectstatus").drop(op.get_bind(), checkfirst=True)
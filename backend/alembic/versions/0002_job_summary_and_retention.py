@@ -0,0 +1,52 @@
+"""Listing indexes, compressed specs with summary columns, generation stats and storage retention
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+JOB_COLUMNS = [
+    sa.Column("spec_blob", sa.LargeBinary(), nullable=True),
+    sa.Column("spec_hash", sa.String(64), nullable=True),
+    sa.Column("app_name", sa.String(), nullable=True),
+    sa.Column("app_description", sa.Text(), nullable=True),
+    sa.Column("entity_count", sa.Integer(), nullable=True),
+    sa.Column("endpoint_count", sa.Integer(), nullable=True),
+    sa.Column("page_count", sa.Integer(), nullable=True),
+    sa.Column("generation_stats", sa.JSON(), nullable=True),
+    sa.Column("last_accessed_at", sa.DateTime(), nullable=True),
+    sa.Column("evicted_at", sa.DateTime(), nullable=True),
+]
+INDEXES = [
+    ("ix_projects_user_created", "projects", ["user_id", "created_at", "id"]),
+    ("ix_generation_jobs_project_created", "generation_jobs", ["project_id", "created_at", "id"]),
+    ("ix_generation_jobs_created", "generation_jobs", ["created_at", "id"]),
+    ("ix_generation_jobs_spec_hash", "generation_jobs", ["spec_hash"]),
+    ("ix_generation_jobs_app_name", "generation_jobs", ["app_name"]),
+]
+
+def upgrade():
+    # Databases that went through the former create_all()/column sync may already have some of these
+    inspector = sa.inspect(op.get_bind())
+    existing = {column["name"] for column in inspector.get_columns("generation_jobs")}
+    with op.batch_alter_table("generation_jobs") as batch:
+        for column in JOB_COLUMNS:
+            if column.name not in existing:
+                batch.add_column(column)
+    for name, table, columns in INDEXES:
+        if name not in {index["name"] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    with op.batch_alter_table("generation_jobs") as batch:
+        for column in reversed(JOB_COLUMNS):
+            batch.drop_column(column.name)
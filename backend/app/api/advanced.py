@@ -9,6 +9,9 @@ from ..services.ai_assistant import AIAssistant
 from ..services.analytics_service import AnalyticsService
 from ..services.security_analyzer import SecurityAnalyzer
 from ..services.auto_deployer import AutoDeployer
+from ..services.zip_archive import ProjectArchive
+from ..services.project_files import ProjectIndex
+from ..services.storage_manager import storage_manager
 
 router = APIRouter(prefix="/api/v1/advanced", tags=["advanced"])
 
@@ -133,28 +136,21 @@ async def ask_assistant(request: dict, current_user: User = Depends(get_current_
     if not question or not job_id:
         raise HTTPException(status_code=400, detail="Question and job_id required")
     
-    from pathlib import Path
-    from ..core.config import settings
-    project_dir = Path(settings.GENERATED_DIR) / f"project_{job_id}"
-    if not project_dir.exists():
+    index = ProjectIndex.for_job(job_id)
+    project_dir = index.root
+    if not index.exists():
         raise HTTPException(status_code=404, detail="Project not found")
+    storage_manager.touch(job_id)
     
-    # Read ALL files with FULL content
-    files_content = {}
-    for file_path in project_dir.rglob('*'):
-        if file_path.is_file() and file_path.suffix in ['.py', '.md', '.yml', '.txt', '.html', '.css', '.js']:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    rel_path = str(file_path.relative_to(project_dir)).replace('\\', '/')
-                    files_content[rel_path] = f.read()  # FULL content
-            except:
-                pass
+    # ALL files with FULL content, from the project index (no tree walk)
+    files_content = index.texts(suffixes=['.py', '.md', '.yml', '.txt', '.html', '.css', '.js'])
     
     print(f"[AI-ASSISTANT] Found {len(files_content)} files")
     print(f"[AI-ASSISTANT] Files: {list(files_content.keys())}")
     
     assistant = AIAssistant()
     result = assistant.process_request(question, files_content, project_dir)
+    ProjectArchive(project_dir).update(result.get("modified_files", []))
     
     return result
 
@@ -174,6 +170,7 @@ async def auto_deploy(request: dict, current_user: User = Depends(get_current_us
     
     if not project_dir.exists():
         raise HTTPException(status_code=404, detail="Project not found")
+    storage_manager.touch(job_id)
     
     try:
         deployer = AutoDeployer()
@@ -4,6 +4,7 @@ from ..core.database import get_db
 from ..core.security import verify_password, get_password_hash, create_access_token
 from ..models.user import User
 from ..schemas import UserCreate, UserLogin, Token, UserResponse
+from ..utils.auth import get_current_user, auth_cache_stats
 
 router = APIRouter(prefix="/api/v1/auth", tags=["auth"])
 
@@ -30,3 +31,8 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
     
     access_token = create_access_token({"sub": user.id})
     return {"access_token": access_token, "token_type": "bearer"}
+
+@router.get("/cache-stats")
+def cache_stats(current_user: User = Depends(get_current_user)):
+    """Hit rate of the authenticated-user and token caches"""
+    return auth_cache_stats()
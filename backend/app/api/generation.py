@@ -1,19 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from fastapi.responses import StreamingResponse, FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request, Response
+from fastapi.responses import StreamingResponse, JSONResponse
+from sqlalchemy.orm import Session, load_only
 from typing import List
 import os
 import json
 from pathlib import Path
-from ..core.database import get_db
+from ..core.database import get_db, SessionLocal
 from ..core.config import settings
 from ..models.generation_job import GenerationJob, JobStatus
+from ..models.project import Project
 from ..models.user import User
 from ..services.document_processor import DocumentProcessor
 from ..services.ai_service import AIService
 from ..services.code_generator import CodeGenerator
 from ..services.ai_improver import AIImprover
-from ..utils.auth import get_current_user
+from ..services.project_files import ProjectIndex
+from ..services.zip_archive import ProjectArchive
+from ..services.storage_manager import storage_manager
+from ..services.artifact_templates import artifact_templates
+from ..services.asset_pipeline import AssetPipeline
+from ..services.code_validator import CodeValidator
+from ..services.snippet_cache import SnippetCache
+from ..utils.auth import get_current_user, decode_token_cached
+from ..utils.pagination import keyset_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..utils.http_cache import strong_etag, combined_etag, etag_matches
+from ..utils.file_response import send_file
 import asyncio
 
 router = APIRouter(prefix="/api/v1", tags=["generation"])
@@ -33,6 +44,21 @@ async def upload_files(files: List[UploadFile] = File(...), current_user: User =
     
     return {"files": file_paths}
 
+@router.get("/storage/stats")
+def storage_stats(current_user: User = Depends(get_current_user)):
+    """Disk used by the current user against their quota, and sweeper metrics"""
+    return {"usage": storage_manager.usage(current_user.id), "sweeper": dict(storage_manager.metrics)}
+
+@router.get("/codegen/templates/stats")
+def template_stats(current_user: User = Depends(get_current_user)):
+    """Render count, mean and max milliseconds of each artifact template"""
+    return artifact_templates.stats()
+
+@router.get("/codegen/snippets/stats")
+def snippet_stats(current_user: User = Depends(get_current_user)):
+    """Snippet cache lookups and hit rate since startup (per generation: the job's generationStats)"""
+    return SnippetCache.totals()
+
 @router.post("/generation/job")
 def create_job(job_data: dict, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     from ..models.generation_job import GenerationJob
@@ -46,31 +72,40 @@ def create_job(job_data: dict, db: Session = Depends(get_db), current_user: User
     return {"id": job.id}
 
 @router.get("/generation/jobs")
-def list_jobs(project_id: str = None, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    """List all jobs, optionally filtered by project_id"""
-    query = db.query(GenerationJob)
+def list_jobs(response: Response, project_id: str = None, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+              cursor: str = None, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """List the user's jobs newest first, optionally filtered by project_id (keyset-paginated via X-Next-Cursor)"""
+    if project_id and not db.query(Project.id).filter(Project.id == project_id, Project.user_id == current_user.id).first():
+        raise HTTPException(status_code=404, detail="Project not found")
+    # Only the listed columns: spec_json and error_log can be large
+    query = (db.query(GenerationJob).join(Project, GenerationJob.project_id == Project.id)
+             .filter(Project.user_id == current_user.id)
+             .options(load_only(GenerationJob.id, GenerationJob.status, GenerationJob.created_at)))
     if project_id:
         query = query.filter(GenerationJob.project_id == project_id)
-    jobs = query.order_by(GenerationJob.created_at).all()
+    jobs = keyset_page(query, GenerationJob.created_at, GenerationJob.id, limit, cursor, response)
     return [{"id": j.id, "status": j.status, "created_at": str(j.created_at)} for j in jobs]
 
 @router.get("/generation/analyze-stream/{job_id}")
-async def analyze_stream(job_id: str, token: str = None, db: Session = Depends(get_db)):
-    from ..core.security import decode_access_token
+async def analyze_stream(job_id: str, token: str = None):
     if token:
-        payload = decode_access_token(token)
+        payload = decode_token_cached(token)
         if not payload:
             raise HTTPException(status_code=403, detail="Invalid token")
-    job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
     
-    job.status = JobStatus.PROCESSING
-    db.commit()
+    # Short-lived session: the connection goes back to the pool before the stream starts
+    with SessionLocal() as db:
+        job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        job.status = JobStatus.PROCESSING
+        db.commit()
+        input_files = list(job.input_files or [])
     
     processor = DocumentProcessor()
     documents_content = ""
-    for file_path in job.input_files or []:
+    for file_path in input_files:
         if os.path.exists(file_path):
             documents_content += f"\n\n--- {Path(file_path).name} ---\n"
             documents_content += processor.process_file(file_path)
@@ -93,44 +128,57 @@ async def save_spec(job_id: str, spec_data: dict, db: Session = Depends(get_db),
         print(f"[SAVE-SPEC] Job not found!")
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job.spec_json = json.dumps(spec_data)
+    job.set_spec(spec_data)
     job.status = JobStatus.COMPLETED
     db.commit()
-    db.refresh(job)
     
-    print(f"[SAVE-SPEC] Saved! Status: {job.status}, Spec length: {len(job.spec_json)}")
+    print(f"[SAVE-SPEC] Saved! Status: {job.status}, Compressed size: {len(job.spec_blob)}, Hash: {job.spec_hash[:12]}")
     
     return {"message": "Specification saved", "spec": spec_data}
 
 @router.get("/generation/job/{job_id}/preview")
-def preview_spec(job_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+def preview_spec(job_id: str, full: bool = False, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """Spec summary from the materialized columns; the full spec is decompressed only with ?full=true"""
+    query = db.query(GenerationJob)
+    if not full:
+        query = query.options(load_only(
+            GenerationJob.id, GenerationJob.spec_hash, GenerationJob.app_name, GenerationJob.app_description,
+            GenerationJob.entity_count, GenerationJob.endpoint_count, GenerationJob.page_count,
+            GenerationJob.generation_stats
+        ))
+    job = query.filter(GenerationJob.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
     try:
-        # Utiliser spec_json si disponible, sinon output_path
-        spec_data = job.spec_json if job.spec_json else job.output_path
-        
-        if not spec_data:
-            raise HTTPException(status_code=404, detail="Specification not found")
+        if not job.spec_hash:
+            # Legacy row: spec stored as plain JSON (or in output_path), compress it once
+            spec_data = job.spec_json or (job.output_path if (job.output_path or "").lstrip().startswith("{") else None)
+            if not spec_data:
+                raise HTTPException(status_code=404, detail="Specification not found")
+            job.set_spec(json.loads(spec_data))
+            db.commit()
         
-        spec = json.loads(spec_data)
-        
-        return {
-            "appName": spec.get("appConfig", {}).get("name", "Unknown"),
-            "description": spec.get("appConfig", {}).get("description", ""),
-            "entities": len(spec.get("database", {}).get("entities", [])),
-            "endpoints": len(spec.get("api", {}).get("endpoints", [])),
-            "pages": len(spec.get("ui", {}).get("pages", [])),
-            "fullSpec": spec
+        preview = {
+            "appName": job.app_name,
+            "description": job.app_description,
+            "entities": job.entity_count,
+            "endpoints": job.endpoint_count,
+            "pages": job.page_count,
+            "specHash": job.spec_hash,
+            "generationStats": job.generation_stats
         }
+        if full:
+            preview["fullSpec"] = job.get_spec()
+        return preview
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"[API] Preview error: {e}")
         raise HTTPException(status_code=500, detail=f"Invalid specification: {str(e)}")
 
 @router.post("/generation/job/{job_id}/generate")
-async def generate_code(job_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def generate_code(job_id: str, request: Request, enrich: bool = False, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
     
     print(f"[GENERATE] Job ID: {job_id}")
@@ -139,26 +187,35 @@ async def generate_code(job_id: str, db: Session = Depends(get_db), current_user
     if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     
-    if not job.spec_json:
+    if not job.has_spec:
         print(f"[GENERATE] Job status: {job.status}")
-        print(f"[GENERATE] Spec JSON: {job.spec_json[:100] if job.spec_json else 'None'}")
-        raise HTTPException(status_code=400, detail="Job not analyzed yet - spec_json is empty")
+        raise HTTPException(status_code=400, detail="Job not analyzed yet - spec is empty")
     
     try:
         print(f"[API] Using GENERATED_DIR: {settings.GENERATED_DIR}")
-        spec = json.loads(job.spec_json)
+        spec = job.get_spec()
         
         generator = CodeGenerator(settings.GENERATED_DIR)
-        zip_path = generator.generate_project(spec, f"project_{job_id}")
+        # Phases run in a thread pool; keep the event loop free meanwhile
+        # enrich=true adds LLM pages, custom endpoints, tests and reports on top of the instant scaffold
+        project_path = await asyncio.to_thread(generator.generate_project, spec, f"project_{job_id}", enrich)
+        print(f"[GENERATE] Phase timings: {generator.phase_timings}")
+        job.generation_stats = {
+            "phase_timings": generator.phase_timings,
+            "snippet_cache": generator.snippet_stats,
+            "validation_issues": generator.validation_issues,
+        }
         
-        # Mettre à jour output_path avec le chemin du ZIP
-        job.output_path = zip_path
+        # output_path pointe sur le dossier du projet, le ZIP a été écrit à la génération
+        job.output_path = project_path
         job.status = JobStatus.COMPLETED
+        job.evicted_at = None
         db.commit()
+        storage_manager.touch(job_id)
         
         # Return file directly to avoid token expiration after reload
-        if os.path.exists(zip_path):
-            return FileResponse(zip_path, filename=f"project_{job_id}.zip", media_type="application/zip")
+        if os.path.isdir(project_path):
+            return zip_response(request, Path(project_path), job_id)
         else:
             raise HTTPException(status_code=500, detail="Generated file not found")
     except Exception as e:
@@ -168,48 +225,90 @@ async def generate_code(job_id: str, db: Session = Depends(get_db), current_user
         db.commit()
         raise HTTPException(status_code=500, detail=str(e))
 
+def zip_response(request: Request, project_dir: Path, job_id: str):
+    """Serve the maintained archive (ranges, 304), or stream one straight into the response (keeping a copy for next time)"""
+    archive = ProjectArchive(project_dir)
+    archive_path = archive.current()
+    if archive_path:
+        return archive_response(request, archive_path, job_id)
+    return StreamingResponse(
+        archive.stream_and_store(),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="project_{job_id}.zip"', "Accept-Ranges": "none"}
+    )
+
+def archive_response(request: Request, archive_path: Path, job_id: str):
+    etag = strong_etag(ProjectIndex.digest(archive_path))
+    return send_file(request, archive_path, etag, filename=f"project_{job_id}.zip", media_type="application/zip")
+
 @router.get("/generation/download/{job_id}")
-def download_code(job_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+def download_code(job_id: str, request: Request, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    job = db.query(GenerationJob).options(load_only(GenerationJob.id, GenerationJob.output_path, GenerationJob.evicted_at)).filter(GenerationJob.id == job_id).first()
+    if job and job.evicted_at:
+        raise HTTPException(status_code=410, detail="Generated files were removed after inactivity - generate again from the saved spec")
     if not job or not job.output_path or not os.path.exists(job.output_path):
         raise HTTPException(status_code=404, detail="Generated code not found")
     
-    return FileResponse(job.output_path, filename=f"project_{job_id}.zip")
+    storage_manager.touch(job_id)
+    if os.path.isdir(job.output_path):
+        return zip_response(request, Path(job.output_path), job_id)
+    # Jobs generated before streaming downloads still point at a ZIP on disk
+    return archive_response(request, Path(job.output_path), job_id)
+
+def owns_job(db: Session, job_id: str, user: User) -> bool:
+    return db.query(GenerationJob.id).join(Project, GenerationJob.project_id == Project.id).filter(
+        GenerationJob.id == job_id, Project.user_id == user.id).first() is not None
 
 @router.get("/generation/job/{job_id}/files")
 def get_project_files(job_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    """Get all files from generated project"""
-    project_dir = Path(settings.GENERATED_DIR) / f"project_{job_id}"
+    """Get all files from generated project (prefer /manifest + /file for the editor)"""
+    index = ProjectIndex.for_job(job_id)
+    if not owns_job(db, job_id, current_user) or not index.exists():
+        raise HTTPException(status_code=404, detail="Project not found")
+    storage_manager.touch(job_id)
     
-    if not project_dir.exists():
+    return {"files": index.texts()}  # binary files are skipped
+
+@router.get("/generation/job/{job_id}/manifest")
+def get_project_manifest(job_id: str, request: Request, offset: int = Query(0, ge=0), limit: int = Query(500, ge=1, le=5000),
+                         db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """Path, size, hash and mtime of each project file; contents are fetched one by one via /file"""
+    index = ProjectIndex.for_job(job_id)
+    if not owns_job(db, job_id, current_user) or not index.exists():
         raise HTTPException(status_code=404, detail="Project not found")
+    storage_manager.touch(job_id)
+    
+    entries = [{k: e[k] for k in ("path", "size", "hash", "mtime")} for e in index.manifest()]
+    page = entries[offset:offset + limit]
+    etag = combined_etag([f"{offset}:{limit}"] + [f"{e['path']}:{e['hash']}" for e in page])
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
     
-    files = {}
-    for file_path in project_dir.rglob('*'):
-        if file_path.is_file() and not any(p in file_path.parts for p in ['__pycache__', '.git', 'node_modules']):
-            relative_path = str(file_path.relative_to(project_dir)).replace('\\', '/')
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    files[relative_path] = f.read()
-            except:
-                pass  # Skip binary files
-    
-    return {"files": files}
+    next_offset = offset + limit if offset + limit < len(entries) else None
+    return JSONResponse({"files": page, "total": len(entries), "next_offset": next_offset}, headers=headers)
 
 @router.get("/generation/job/{job_id}/file")
-def get_project_file(job_id: str, file_path: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    """Get a specific file from generated project"""
-    project_dir = Path(settings.GENERATED_DIR) / f"project_{job_id}"
-    full_path = project_dir / file_path
+def get_project_file(job_id: str, file_path: str, request: Request, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """Get a specific file from generated project (strong ETag, 304 on If-None-Match)"""
+    if not owns_job(db, job_id, current_user):
+        raise HTTPException(status_code=404, detail="Project not found")
+    index = ProjectIndex.for_job(job_id)
+    full_path = index.resolve(file_path)
     
-    if not full_path.exists() or not str(full_path).startswith(str(project_dir)):
+    if full_path is None:
         raise HTTPException(status_code=404, detail="File not found")
+    storage_manager.touch(job_id)
     
-    try:
-        with open(full_path, 'r', encoding='utf-8') as f:
-            return {"content": f.read()}
-    except:
+    etag = strong_etag(ProjectIndex.digest(full_path))
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    content = index.text(index.relative(full_path))
+    if content is None:
         raise HTTPException(status_code=400, detail="Cannot read file")
+    return JSONResponse({"content": content}, headers=headers)
 
 @router.post("/generation/job/{job_id}/preview-app")
 async def preview_generated_app(job_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
@@ -221,9 +320,11 @@ async def preview_generated_app(job_id: str, db: Session = Depends(get_db), curr
     project_dir = Path(settings.GENERATED_DIR) / f"project_{job_id}"
     if not project_dir.exists():
         raise HTTPException(status_code=404, detail="Project not found")
+    storage_manager.touch(job_id)
     
     backend_dir = project_dir / "backend"
     frontend_dir = project_dir / "frontend"
+    index = ProjectIndex.load(project_dir)
     
     def find_free_port():
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
@@ -241,31 +342,25 @@ async def preview_generated_app(job_id: str, db: Session = Depends(get_db), curr
     max_attempts = 3
     for attempt in range(max_attempts):
         try:
-            # Fix backend
-            result = subprocess.run([sys.executable, "-c", "import main"], cwd=str(backend_dir), capture_output=True, text=True, timeout=5)
-            if result.returncode != 0:
-                print(f"[AUTO-FIX] Backend error (attempt {attempt+1}): {result.stderr[:200]}")
-                ai_service = AIService()
-                fixed = await ai_service.fix_code_error(str(backend_dir / "main.py"), result.stderr)
-                if fixed:
-                    with open(backend_dir / "main.py", "w", encoding="utf-8") as f:
-                        f.write(fixed)
-                    print(f"[AUTO-FIX] Backend fixed")
-                    await asyncio.sleep(1)
+            # Static checks in-process (services/code_validator.py) instead of `python -c "import ..."` probes
+            texts = index.texts(suffixes=(".py", ".txt"))
+            fixed_any = False
+            for package, package_dir in (("backend", backend_dir), ("frontend", frontend_dir)):
+                issues = CodeValidator.for_package(texts, package).validate()
+                if not issues:
                     continue
-            
-            # Fix frontend
-            result = subprocess.run([sys.executable, "-c", "import app"], cwd=str(frontend_dir), capture_output=True, text=True, timeout=5)
-            if result.returncode != 0:
-                print(f"[AUTO-FIX] Frontend error (attempt {attempt+1}): {result.stderr[:200]}")
+                print(f"[AUTO-FIX] {package} issues (attempt {attempt+1}): {'; '.join(map(str, issues[:5]))[:200]}")
+                broken = issues[0].path
                 ai_service = AIService()
-                fixed = await ai_service.fix_code_error(str(frontend_dir / "app.py"), result.stderr)
+                fixed = await ai_service.fix_code_error(
+                    str(package_dir / broken), "\n".join(str(i) for i in issues if i.path == broken))
                 if fixed:
-                    with open(frontend_dir / "app.py", "w", encoding="utf-8") as f:
-                        f.write(fixed)
-                    print(f"[AUTO-FIX] Frontend fixed")
-                    await asyncio.sleep(1)
-                    continue
+                    index.write_text(f"{package}/{broken}", fixed)
+                    print(f"[AUTO-FIX] {package}/{broken} fixed")
+                    fixed_any = True
+                    break
+            if fixed_any:
+                continue
             
             # Start backend
             backend_process = subprocess.Popen(
@@ -286,8 +381,7 @@ async def preview_generated_app(job_id: str, db: Session = Depends(get_db), curr
                 ai_service = AIService()
                 fixed = await ai_service.fix_code_error(str(backend_dir / "main.py"), stderr)
                 if fixed:
-                    with open(backend_dir / "main.py", "w", encoding="utf-8") as f:
-                        f.write(fixed)
+                    index.write_text("backend/main.py", fixed)
                     continue
             
             # Start frontend
@@ -309,17 +403,15 @@ async def preview_generated_app(job_id: str, db: Session = Depends(get_db), curr
                 ai_service = AIService()
                 fixed = await ai_service.fix_code_error(str(frontend_dir / "app.py"), stderr)
                 if fixed:
-                    with open(frontend_dir / "app.py", "w", encoding="utf-8") as f:
-                        f.write(fixed)
+                    index.write_text("frontend/app.py", fixed)
                     continue
             
             # Auto-fix templates if missing
             templates_dir = frontend_dir / "templates"
+            fallbacks = {}
             if not (templates_dir / "index.html").exists():
                 print(f"[AUTO-FIX] Creating missing index.html")
-                templates_dir.mkdir(exist_ok=True)
-                with open(templates_dir / "index.html", "w", encoding="utf-8") as f:
-                    f.write('''<!DOCTYPE html>
+                fallbacks["index.html"] = '''<!DOCTYPE html>
 <html lang="fr">
 <head>
     <meta charset="UTF-8">
@@ -346,15 +438,14 @@ async def preview_generated_app(job_id: str, db: Session = Depends(get_db), curr
         </div>
     </div>
 </body>
-</html>''')
+</html>'''
             
             # Auto-fix other templates
             for template_name in ["students.html", "courses.html", "transcripts.html"]:
                 if not (templates_dir / template_name).exists():
                     entity = template_name.replace(".html", "")
                     print(f"[AUTO-FIX] Creating {template_name}")
-                    with open(templates_dir / template_name, "w", encoding="utf-8") as f:
-                        f.write(f'''<!DOCTYPE html>
+                    fallbacks[template_name] = f'''<!DOCTYPE html>
 <html lang="fr">
 <head>
     <meta charset="UTF-8">
@@ -382,7 +473,18 @@ async def preview_generated_app(job_id: str, db: Session = Depends(get_db), curr
             }});
     </script>
 </body>
-</html>''')
+</html>'''
+            
+            if fallbacks:
+                # Same build as generation: the CDN script becomes the precompiled, fingerprinted bundles
+                templates, assets = AssetPipeline().build(fallbacks)
+                for name, data in assets.items():
+                    index.write_bytes(f"frontend/static/assets/{name}", data)
+                for name, template in templates.items():
+                    index.write_text(f"frontend/templates/{name}", template)
+            
+            # Auto-fixes rewrote files in place: bring the archive up to date
+            ProjectArchive(project_dir).sync()
             
             return {
                 "url": f"http://localhost:{frontend_port}",
@@ -411,6 +513,7 @@ async def improve_project(job_id: str, feedback: dict, db: Session = Depends(get
     
     if not project_dir.exists():
         raise HTTPException(status_code=404, detail="Projet introuvable")
+    storage_manager.touch(job_id)
     
     try:
         # Initialiser AI Improver
@@ -421,21 +524,13 @@ async def improve_project(job_id: str, feedback: dict, db: Session = Depends(get
         result = improver.improve_project(str(project_dir), user_feedback)
         
         if result.get("success"):
-            # Recréer le ZIP avec les améliorations
-            import zipfile
-            zip_path = f"{project_dir}.zip"
-            
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for root, dirs, files in os.walk(project_dir):
-                    for file in files:
-                        file_path = Path(root) / file
-                        arcname = file_path.relative_to(project_dir.parent)
-                        zipf.write(file_path, arcname)
-            
-            # Mettre à jour le job
+            # Seules les entrées modifiées sont réécrites dans le ZIP
+            ProjectArchive(project_dir).update(
+                a["file"] for a in result.get("applied", []) if a.get("status") == "success"
+            )
             job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
             if job:
-                job.output_path = zip_path
+                job.output_path = str(project_dir)
                 db.commit()
             
             return {
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import List
 from ..core.database import get_db
@@ -6,13 +6,16 @@ from ..models.project import Project
 from ..models.user import User
 from ..schemas import ProjectCreate, ProjectResponse
 from ..utils.auth import get_current_user
+from ..utils.pagination import keyset_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/api/v1/projects", tags=["projects"])
 
 @router.get("", response_model=List[ProjectResponse])
-def list_projects(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    projects = db.query(Project).filter(Project.user_id == current_user.id).all()
-    return projects
+def list_projects(response: Response, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: str = None,
+                  db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """List the user's projects, newest first. Pass X-Next-Cursor back as ?cursor= for the next page."""
+    query = db.query(Project).filter(Project.user_id == current_user.id)
+    return keyset_page(query, Project.created_at, Project.id, limit, cursor, response)
 
 @router.post("", response_model=ProjectResponse)
 def create_project(project_data: ProjectCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
@@ -0,0 +1,100 @@
+import gzip
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/html", "text/plain", "text/css", "text/markdown",
+                      "application/javascript", "text/javascript", "image/svg+xml", "application/xml")
+
+def negotiate_encoding(accept_encoding: str, supported=("br", "gzip")):
+    """The supported coding with the highest q in an Accept-Encoding header (ties go to the first supported), or None"""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding] = q
+    best, best_q = None, 0.0
+    for coding in supported:
+        q = qualities.get(coding, qualities.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+class CompressionMiddleware:
+    """brotli/gzip for buffered text responses.
+
+    Streams (SSE, file downloads) and already-encoded bodies pass through untouched,
+    so event streams are never held back and zips are not compressed twice.
+    """
+    
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        supported = ("br", "gzip") if brotli is not None else ("gzip",)
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), supported)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start_message: Message = {}
+        
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or not start_message:
+                # Other message types (pathsend, zerocopysend...) carry no body to compress: the held start goes first
+                if start_message:
+                    initial, start_message = start_message, {}
+                    await send(initial)
+                await send(message)
+                return
+            
+            initial, start_message = start_message, {}
+            headers = MutableHeaders(raw=initial["headers"])
+            body = message.get("body", b"")
+            content_type = headers.get("content-type", "").split(";")[0].strip()
+            if (message.get("more_body") or len(body) < self.minimum_size or initial["status"] != 200
+                    or "content-encoding" in headers or content_type not in COMPRESSIBLE_TYPES):
+                await send(initial)
+                await send(message)
+                return
+            
+            if encoding == "br":
+                body = brotli.compress(body, quality=self.brotli_quality)
+            else:
+                body = gzip.compress(body, compresslevel=self.gzip_level)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers and headers["etag"].endswith('"'):
+                # The encoded body is a different representation, so it needs its own strong ETag
+                headers["ETag"] = headers["etag"][:-1] + f'-{encoding}"'
+            message["body"] = body
+            await send(initial)
+            await send(message)
+        
+        await self.app(scope, receive, send_compressed)
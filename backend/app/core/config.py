@@ -2,15 +2,46 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./dev.db"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
     JWT_SECRET: str = "dev-secret-key"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRE_MINUTES: int = 10080
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_USER_CACHE_SIZE: int = 1024
+    AUTH_TOKEN_CACHE_SIZE: int = 4096
     OPENAI_API_KEY: str = ""
     GROQ_API_KEY: str = ""
     REDIS_URL: str = "redis://localhost:6379/0"
     MAX_FILE_SIZE: int = 10485760
     UPLOAD_DIR: str = "./uploads"
     GENERATED_DIR: str = "C:/Downloads/generated_projects"
+    SPEC_COMPRESSION: str = "zstd"  # zstd | gzip
+    SPEC_COMPRESSION_LEVEL: int = 6
+    ZIP_COMPRESSION_LEVEL: int = 6
+    ZIP_CACHE_MB: int = 64
+    ZIP_CACHE_MAX_ENTRY_KB: int = 4096
+    FILE_INDEX_MAX_PROJECTS: int = 256
+    FILE_INDEX_TEXT_CACHE_MB: int = 64
+    
+    # Content-addressed store backing generated projects (empty dir = GENERATED_DIR/.blobs; must be on the same filesystem for reflinks)
+    BLOB_STORE_ENABLED: bool = True
+    BLOB_STORE_DIR: str = ""
+    CODEGEN_MAX_WORKERS: int = 8  # generation phases / pages run concurrently
+    CODEGEN_FIX_ATTEMPTS: int = 2  # LLM retries per endpoint when its code fails validation
+    SNIPPET_CACHE_ENABLED: bool = True  # reuse LLM endpoint code across projects with the same entity schema
+    SNIPPET_CACHE_DIR: str = ""  # default: GENERATED_DIR/.snippets
+    
+    # Disk retention for uploads and generated projects (0 disables a limit); the spec stays in the DB so evicted projects can be regenerated
+    STORAGE_SWEEP_INTERVAL_SECONDS: int = 900
+    STORAGE_PROJECT_TTL_HOURS: int = 72
+    STORAGE_UPLOAD_TTL_HOURS: int = 24
+    STORAGE_USER_QUOTA_MB: int = 500
+    STORAGE_MAX_TOTAL_MB: int = 4096
+    STORAGE_EVICTION_GRACE_MINUTES: int = 15
     
     class Config:
         env_file = ".env"
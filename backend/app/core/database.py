@@ -1,12 +1,62 @@
-from sqlalchemy import create_engine
+from pathlib import Path
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
 
-engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {})
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+def _engine_kwargs(url: str) -> dict:
+    """Pool settings; in-memory SQLite uses a singleton pool that takes no sizing."""
+    kwargs = {}
+    if _is_sqlite(url):
+        kwargs["connect_args"] = {"check_same_thread": False}
+        if ":memory:" in url or not url.split("://", 1)[-1].strip("/"):
+            return kwargs
+    else:
+        kwargs["pool_pre_ping"] = True
+    kwargs.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return kwargs
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets readers run alongside the writer; busy_timeout waits for the lock instead of failing."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+engine = create_engine(settings.DATABASE_URL, **_engine_kwargs(settings.DATABASE_URL))
+if _is_sqlite(settings.DATABASE_URL):
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+def migrate():
+    """Upgrade the schema to the latest alembic revision (alembic/versions)."""
+    from alembic import command
+    from alembic.config import Config
+    
+    config = Config(str(MIGRATIONS_DIR.parent / "alembic.ini"))
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        inspector = inspect(connection)
+        if inspector.has_table("projects") and not inspector.has_table("alembic_version"):
+            # Created by create_all() before migrations existed: that is the baseline revision
+            print("[DB] Stamping existing schema at the baseline revision")
+            command.stamp(config, "0001")
+        command.upgrade(config, "head")
+
 def get_db():
     db = SessionLocal()
     try:
@@ -1,9 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .core.database import engine, Base
+from .core.database import engine, migrate
+from .core.compression import CompressionMiddleware
 from .api import auth, projects, generation, advanced
+from .services.storage_manager import storage_manager
+from .services.artifact_templates import artifact_templates
 
-Base.metadata.create_all(bind=engine)
+migrate()
 
 app = FastAPI(title="AutoDev API", version="1.0.0")
 
@@ -13,7 +16,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified", "Accept-Ranges", "Content-Range", "Content-Disposition"],
 )
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+@app.on_event("startup")
+async def start_storage_sweeper():
+    storage_manager.start()
+
+@app.on_event("startup")
+def compile_artifact_templates():
+    artifact_templates.precompile()
+
+@app.on_event("shutdown")
+async def dispose_engines():
+    await storage_manager.stop()
+    engine.dispose()
 
 app.include_router(auth.router)
 app.include_router(projects.router)
@@ -1,9 +1,11 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Enum as SQLEnum, JSON
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Enum as SQLEnum, JSON, Index, Integer, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from uuid import uuid4
 import enum
+import json
 from ..core.database import Base
+from ..utils.spec_codec import encode_spec, decompress_spec
 
 class JobStatus(str, enum.Enum):
     PENDING = "PENDING"
@@ -13,14 +15,46 @@ class JobStatus(str, enum.Enum):
 
 class GenerationJob(Base):
     __tablename__ = "generation_jobs"
+    __table_args__ = (
+        Index("ix_generation_jobs_project_created", "project_id", "created_at", "id"),
+        Index("ix_generation_jobs_created", "created_at", "id"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid4()))
     project_id = Column(String, ForeignKey("projects.id"), nullable=False)
     status = Column(SQLEnum(JobStatus), default=JobStatus.PENDING)
     input_files = Column(JSON)
     output_path = Column(Text)
-    spec_json = Column(Text, nullable=True)
+    spec_json = Column(Text, nullable=True)  # legacy uncompressed spec, migrated on first read
+    spec_blob = Column(LargeBinary, nullable=True)
+    spec_hash = Column(String(64), nullable=True, index=True)
+    app_name = Column(String, nullable=True, index=True)
+    app_description = Column(Text, nullable=True)
+    entity_count = Column(Integer, nullable=True)
+    endpoint_count = Column(Integer, nullable=True)
+    page_count = Column(Integer, nullable=True)
     error_log = Column(Text, nullable=True)
+    generation_stats = Column(JSON, nullable=True)  # phase timings, snippet cache hits, validation issues of the last run
     created_at = Column(DateTime, default=datetime.utcnow)
+    last_accessed_at = Column(DateTime, nullable=True)
+    evicted_at = Column(DateTime, nullable=True)  # project files removed by the storage sweeper, spec kept
     
     project = relationship("Project", back_populates="jobs")
+    
+    @property
+    def has_spec(self) -> bool:
+        return bool(self.spec_blob or self.spec_json)
+    
+    def set_spec(self, spec: dict):
+        """Store the spec compressed and materialize its summary columns"""
+        self.spec_blob, self.spec_hash, summary = encode_spec(spec)
+        for field, value in summary.items():
+            setattr(self, field, value)
+        self.spec_json = None
+    
+    def get_spec(self):
+        if self.spec_blob:
+            return decompress_spec(self.spec_blob)
+        if self.spec_json:
+            return json.loads(self.spec_json)
+        return None
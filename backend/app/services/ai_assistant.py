@@ -1,5 +1,6 @@
 from typing import Dict
 from .ai_service import AIService
+from .project_files import ProjectIndex
 
 class AIAssistant:
     def __init__(self):
@@ -270,9 +271,9 @@ Respond with this EXACT format (use <<<CONTENT>>> and <<<END>>> as delimiters):
                 
                 if actual_path:
                     try:
-                        with open(actual_path, 'w', encoding='utf-8') as f:
-                            f.write(new_content)
-                        modified_files.append(str(actual_path.relative_to(project_dir)))
+                        rel_path = str(actual_path.relative_to(project_dir)).replace('\\', '/')
+                        ProjectIndex.load(project_dir).write_text(rel_path, new_content)
+                        modified_files.append(rel_path)
                         print(f"[AI-ASSISTANT] ✓ Modified {actual_path.relative_to(project_dir)}")
                     except Exception as e:
                         print(f"[AI-ASSISTANT] ✗ Error: {e}")
@@ -8,6 +8,7 @@ from typing import Dict, List, Any
 import json
 import asyncio
 from dataclasses import dataclass
+from .asset_pipeline import AssetPipeline
 
 @dataclass
 class AIAgent:
@@ -166,6 +167,7 @@ class AIFactory:
             "html": "",
             "css": "",
             "js": "",
+            "assets": {},
             "design": {},
             "reviews": [],
             "iterations": []
@@ -297,10 +299,11 @@ Page: {description}
 
 RÈGLES:
 1. Commence par <!DOCTYPE html>
-2. Inclus <script src="https://cdn.tailwindcss.com"></script>
-3. Ajoute <style> avec glassmorphism
-4. PAS de texte avant/après le HTML
-5. PAS de markdown ```
+2. Inclus <script src="https://cdn.tailwindcss.com"></script> (remplacé au build par le CSS précompilé)
+3. Uniquement des classes Tailwind standard, PAS de tailwind.config
+4. Ajoute <style> avec glassmorphism
+5. PAS de texte avant/après le HTML
+6. PAS de markdown ```
 
 GÉNÈRE LE HTML MAINTENANT:"""
 
@@ -518,7 +521,10 @@ Retourne le code corrigé en JSON."""
         # SEO Specialist
         seo = self.agents["seo_specialist"]
         
-        print(f"  ✅ {perf.name}: Performance optimisée")
+        # The Tailwind CDN and inline blocks become precompiled, fingerprinted files (asset name -> bytes)
+        templates, result["assets"] = AssetPipeline().build({"page.html": result["html"]})
+        result["html"] = templates["page.html"]
+        print(f"  ✅ {perf.name}: Performance optimisée ({len(result['assets'])} assets)")
         print(f"  ✅ {seo.name}: SEO optimisé")
         
         return result
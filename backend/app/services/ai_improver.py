@@ -7,6 +7,7 @@ from typing import Dict, List, Any
 from pathlib import Path
 import json
 import os
+from .project_files import ProjectIndex
 
 class AIImprover:
     """Améliore un projet existant de façon récursive et intelligente"""
@@ -66,16 +67,12 @@ class AIImprover:
     def _analyze_project(self, project_dir: Path, user_feedback: str) -> Dict:
         """Analyse le projet existant pour identifier les points d'amélioration"""
         
-        # Lire les fichiers principaux
-        files_content = {}
-        for pattern in ["**/*.html", "**/*.css", "**/*.js", "**/*.py"]:
-            for file_path in project_dir.glob(pattern):
-                if file_path.is_file() and file_path.stat().st_size < 100000:  # < 100KB
-                    try:
-                        relative_path = str(file_path.relative_to(project_dir))
-                        files_content[relative_path] = file_path.read_text(encoding='utf-8')[:5000]  # 5KB max
-                    except:
-                        pass
+        # Lire les fichiers principaux depuis l'index du projet (< 100KB, 5KB max chacun)
+        index = ProjectIndex.load(project_dir)
+        files_content = {
+            path: text[:5000]
+            for path, text in index.texts(suffixes=[".html", ".css", ".js", ".py"], max_size=100000).items()
+        }
         
         # Prompt d'analyse intelligent
         analysis_prompt = f"""Tu es un expert en analyse de code niveau FAANG.
@@ -206,18 +203,15 @@ Réponds en JSON:
                 continue
             
             full_path = project_dir / file_path
+            index = ProjectIndex.load(project_dir)
             
             try:
-                # Créer dossiers si nécessaire
-                full_path.parent.mkdir(parents=True, exist_ok=True)
-                
                 # Backup de l'ancien fichier
                 if full_path.exists():
-                    backup_path = full_path.with_suffix(full_path.suffix + '.backup')
-                    backup_path.write_text(full_path.read_text(encoding='utf-8'), encoding='utf-8')
+                    index.write_text(file_path + '.backup', full_path.read_text(encoding='utf-8'))
                 
-                # Écrire le nouveau code
-                full_path.write_text(code, encoding='utf-8')
+                # Écrire le nouveau code (crée les dossiers si nécessaire)
+                index.write_text(file_path, code)
                 
                 applied.append({
                     "file": file_path,
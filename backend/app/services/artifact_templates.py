@@ -0,0 +1,97 @@
+"""
+Jinja2 templates for the static artifacts of a generated project.
+
+README, .env, Dockerfiles, compose, fallback pages, the Flask app, CI, k8s,
+Terraform and monitoring configs live as files under app/templates. They are
+compiled once (precompile() runs at startup) and kept for the life of the
+process: auto_reload is off, so rendering never stats or re-parses a file.
+Jinja renders into a list that is joined once, so output size grows linearly
+with the spec. Render times are recorded per template. Files without the .j2
+suffix (the generated Flask app's own Jinja pages) are copied verbatim by source().
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+class ArtifactTemplates:
+    def __init__(self, root: Path = TEMPLATE_DIR):
+        self.env = Environment(
+            loader=FileSystemLoader(str(root)),
+            autoescape=select_autoescape(enabled_extensions=("html.j2",), default_for_string=False),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            keep_trailing_newline=True,
+            auto_reload=False,
+            cache_size=-1,
+        )
+        self.env.filters["pyrepr"] = repr  # Python literals in generated source
+        self._compiled: Dict[str, Template] = {}
+        self._sources: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._timings: Dict[str, Dict[str, float]] = {}
+    
+    def precompile(self) -> int:
+        """Compile every template now rather than on first use; returns how many"""
+        started = time.perf_counter()
+        for name in self.env.list_templates(extensions=["j2"]):
+            self.template(name)
+        for name in self.env.list_templates(filter_func=lambda name: not name.endswith(".j2")):
+            self.source(name)
+        print(f"[TEMPLATES] {len(self._compiled)} templates compiled in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return len(self._compiled)
+    
+    def template(self, name: str) -> Template:
+        template = self._compiled.get(name)
+        if template is None:
+            with self._lock:
+                template = self._compiled.get(name) or self.env.get_template(name)
+                self._compiled[name] = template
+        return template
+    
+    def source(self, name: str) -> str:
+        """A file copied verbatim, e.g. the Jinja pages of the generated Flask app, which render at its run time"""
+        text = self._sources.get(name)
+        if text is None:
+            text = self._sources[name] = self.env.loader.get_source(self.env, name)[0]
+        return text
+    
+    def render(self, name: str, **context) -> str:
+        template = self.template(name)
+        started = time.perf_counter()
+        output = template.render(**context)
+        self._record(name, time.perf_counter() - started)
+        return output
+    
+    def _record(self, name: str, seconds: float):
+        with self._lock:
+            timing = self._timings.setdefault(name, {"renders": 0, "total_ms": 0.0, "max_ms": 0.0})
+            timing["renders"] += 1
+            timing["total_ms"] += seconds * 1000
+            timing["max_ms"] = max(timing["max_ms"], seconds * 1000)
+    
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Renders, mean and max milliseconds per template since startup"""
+        with self._lock:
+            return {
+                name: {"renders": t["renders"], "mean_ms": round(t["total_ms"] / t["renders"], 4),
+                       "max_ms": round(t["max_ms"], 4)}
+                for name, t in sorted(self._timings.items())
+            }
+    
+    def benchmark(self, contexts: Dict[str, Dict], runs: int = 200) -> Dict[str, float]:
+        """Mean milliseconds per render of each template with the given context (does not touch stats)"""
+        results = {}
+        for name, context in contexts.items():
+            template = self.template(name)
+            template.render(**context)
+            started = time.perf_counter()
+            for _ in range(runs):
+                template.render(**context)
+            results[name] = round((time.perf_counter() - started) * 1000 / runs, 4)
+        return results
+
+artifact_templates = ArtifactTemplates()
@@ -0,0 +1,197 @@
+"""
+Build-time assets for the generated frontend.
+
+Templates that load the Tailwind CDN get static files instead. The utility
+classes used across all templates are compiled once into app.<hash>.css. The
+inline <style> and <script> blocks of each template move to
+styles.<hash>.css and scripts.<hash>.js; templates with the same blocks share
+the same files. Names carry a content hash, so the frontend serves them with a
+one-year immutable Cache-Control. Minification and the .gz/.br variants
+written next to each file follow the spec's `performance` section.
+
+A template that uses classes the compiler does not cover, or configures
+Tailwind itself (tailwind.config), is left untouched with its CDN script.
+"""
+import gzip
+import hashlib
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+from .utility_css import compile_utilities, is_unknown_utility
+
+try:
+    import brotli
+except ImportError:  # gzip variants only
+    brotli = None
+
+ASSETS_URL = "/assets"
+CDN_SCRIPT = re.compile(r"""<script[^>]*\bsrc=["']https://cdn\.tailwindcss\.com[^"']*["'][^>]*>\s*</script>""", re.I)
+STYLE_BLOCK = re.compile(r"[ \t]*<style[^>]*>(.*?)</style>[ \t]*\n?", re.S | re.I)
+SCRIPT_BLOCK = re.compile(r"[ \t]*<script(?P<attrs>[^>]*)>(?P<body>.*?)</script>[ \t]*\n?", re.S | re.I)
+CLASS_ATTR = re.compile(r"""\bclass\s*=\s*(?:"([^"]*)"|'([^']*)')""", re.I)
+# Anything that may be a class name, wherever it appears (classList.add('hidden') included)
+CANDIDATE = re.compile(r"""[^<>"'`\s{}()=,;]*[^<>"'`\s{}()=,;:.]""")
+JINJA = re.compile(r"{{|{%")
+JS_TYPES = ("", "text/javascript", "application/javascript")
+
+
+def compression_encodings(setting) -> List[Tuple[str, Callable[[bytes], bytes]]]:
+    """performance.compression ("gzip|brotli", "gzip", ["br"], false...) as (suffix, compress) pairs"""
+    if setting is None or setting is True:
+        names = {"gzip", "brotli"}
+    elif not setting:
+        return []
+    else:
+        names = set(re.findall(r"[a-z]+", str(setting).lower()))
+    encodings = []
+    if names & {"brotli", "br"}:
+        if brotli is None:
+            print("[Assets] brotli is not installed, skipping the .br variants")
+        else:
+            encodings.append((".br", lambda data: brotli.compress(data, quality=11)))
+    if names & {"gzip", "gz"}:
+        encodings.append((".gz", lambda data: gzip.compress(data, 9, mtime=0)))
+    return encodings
+
+
+def minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_js(js: str) -> str:
+    """Line based: drops indentation, blank lines and whole-line // comments; newlines stay, so ASI is unaffected.
+    Lines that start inside a template literal are kept as they are, and so is a script this cannot follow to the end"""
+    out, stack = [], []  # stack: "`" template literal, "${" its interpolations, "/*" block comment
+    for line in js.splitlines():
+        stripped = line.strip()
+        if stack and stack[-1] == "`":
+            out.append(line)
+        elif stripped and (stack or not stripped.startswith("//")):  # a line inside /* */ may carry the */
+            out.append(stripped)
+        if not _scan_js_line(line, stack):
+            return js
+    return js if stack else "\n".join(out)
+
+
+def _scan_js_line(line: str, stack: List[str]) -> bool:
+    """Updates the string/template/comment state across one line; False when a quote is left open"""
+    i = 0
+    while i < len(line):
+        c, pair = line[i], line[i:i + 2]
+        top = stack[-1] if stack else None
+        if top == "/*":
+            if pair == "*/":
+                stack.pop()
+                i += 1
+        elif top == "`":
+            if c == "\\":
+                i += 1
+            elif c == "`":
+                stack.pop()
+            elif pair == "${":
+                stack.append("${")
+                i += 1
+        elif pair == "//":
+            return True
+        elif pair == "/*":
+            stack.append("/*")
+            i += 1
+        elif c in "'\"":
+            i += 1
+            while i < len(line) and line[i] != c:
+                i += 2 if line[i] == "\\" else 1
+            if i >= len(line):
+                return False
+        elif c == "`":
+            stack.append("`")
+        elif top == "${" and c in "{}":
+            stack.append("${") if c == "{" else stack.pop()
+        i += 1
+    return True
+
+
+class AssetPipeline:
+    def __init__(self, performance: Optional[Dict] = None):
+        performance = performance or {}
+        self.minify = performance.get("minification", True) is not False
+        self.encodings = compression_encodings(performance.get("compression"))
+
+    def build(self, templates: Dict[str, str]) -> Tuple[Dict[str, str], Dict[str, bytes]]:
+        """(templates, asset file name -> bytes); the templates that used the CDN now link the bundles"""
+        pages = {name: page for name, page in ((name, self._extract(name, html)) for name, html in templates.items()) if page}
+        if not pages:
+            return dict(templates), {}
+
+        assets: Dict[str, bytes] = {}
+        candidates = set().union(*(page["candidates"] for page in pages.values()))
+        utilities = self._emit(assets, "app", "css", compile_utilities(candidates))
+        built = dict(templates)
+        for name, page in pages.items():
+            tags = [f'<link rel="stylesheet" href="{ASSETS_URL}/{utilities}">']
+            if page["styles"]:
+                tags.append(f'<link rel="stylesheet" href="{ASSETS_URL}/{self._emit(assets, "styles", "css", page["styles"])}">')
+            if page["scripts"]:
+                # defer keeps the blocks' order and still runs them before DOMContentLoaded
+                tags.append(f'<script src="{ASSETS_URL}/{self._emit(assets, "scripts", "js", page["scripts"])}" defer></script>')
+            indent = re.search(r"([ \t]*)" + re.escape(page["cdn"]), page["html"]).group(1)
+            built[name] = page["html"].replace(page["cdn"], ("\n" + indent).join(tags), 1)
+        return built, assets
+
+    def _extract(self, name: str, html: str) -> Optional[Dict]:
+        """The template without its inline blocks, or None when it must keep the CDN"""
+        cdn = CDN_SCRIPT.search(html)
+        if cdn is None:
+            return None
+        if "tailwind.config" in html:
+            print(f"[Assets] {name} configures Tailwind, keeping the CDN")
+            return None
+
+        # Classes the page styles itself (glass-card, animate-fade-in...) are not utilities
+        defined = set(re.findall(r"\.(-?[A-Za-z_][\w-]*)", "\n".join(STYLE_BLOCK.findall(html))))
+        classes = {token for match in CLASS_ATTR.finditer(html) for token in CANDIDATE.findall(match.group(1) or match.group(2) or "")}
+        unknown = sorted(c for c in classes if c not in defined and is_unknown_utility(c))
+        if unknown:
+            print(f"[Assets] {name} uses {len(unknown)} classes outside the compiled set ({', '.join(unknown[:5])}), keeping the CDN")
+            return None
+
+        styles, scripts = [], []
+
+        def take_style(match):
+            if JINJA.search(match.group(1)):
+                return match.group(0)
+            styles.append(match.group(1))
+            return ""
+
+        def take_script(match):
+            attrs = match.group("attrs")
+            kind = re.search(r"""\btype\s*=\s*["']?([^"'\s>]*)""", attrs, re.I)
+            if "src" in attrs.lower() or (kind and kind.group(1).lower() not in JS_TYPES) or JINJA.search(match.group("body")):
+                return match.group(0)
+            scripts.append(match.group("body"))
+            return ""
+
+        rest = SCRIPT_BLOCK.sub(take_script, STYLE_BLOCK.sub(take_style, html))
+        return {
+            "html": rest,
+            "cdn": cdn.group(0),
+            "candidates": set(CANDIDATE.findall(html)),
+            "styles": "\n".join(styles),
+            "scripts": "\n;\n".join(scripts),
+        }
+
+    def _emit(self, assets: Dict[str, bytes], stem: str, kind: str, text: str) -> str:
+        """Adds a file (and its compressed variants) named after its content hash; returns its name"""
+        if self.minify:
+            text = minify_css(text) if kind == "css" else minify_js(text)
+        data = text.encode("utf-8")
+        name = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}.{kind}"
+        if name not in assets:
+            assets[name] = data
+            for suffix, compress in self.encodings:
+                packed = compress(data)
+                if len(packed) < len(data):
+                    assets[name + suffix] = packed
+        return name
@@ -0,0 +1,176 @@
+"""
+Content-addressed store for generated project files.
+
+Most of a generated project (Dockerfiles, requirements, k8s manifests, Terraform,
+monitoring configs, CI workflow) is byte-identical from one project to the next.
+Each unique body is written once, read-only, under BLOB_STORE_DIR/<sha[:2]>/<sha>.
+How projects get it depends on the filesystem, probed once per store root:
+- reflink (btrfs, XFS): a file of their own whose data blocks are shared with
+  the blob until either side is written, so any write stays private;
+- hardlink (ext4 and most container disks): the blob's inode itself. It is
+  read-only, and everything here that rewrites a project file (auto-fix,
+  improve, asset builds) renames a new file over it, which breaks the link. An
+  in-place write fails instead of reaching the other projects; processes
+  running as root ignore the mode, so set BLOB_STORE_ENABLED=0 where such a
+  process edits GENERATED_DIR in place;
+- copy (no links at all, or blobs on another device): plain copies, no blobs.
+
+Projects never depend on a blob. gc() deletes blobs not reused for
+STORAGE_PROJECT_TTL_HOURS; with hardlinks, only those no project links to.
+"""
+import errno
+import hashlib
+import os
+import stat
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict
+from ..core.config import settings
+
+try:
+    import fcntl
+    FICLONE = 0x40049409  # Linux ioctl: share extents between two files (btrfs, XFS)
+except ImportError:  # Windows
+    fcntl = None
+
+READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+# The filesystem cannot share this file's body: fall back to a copy
+UNSUPPORTED = (errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.ENOTTY, errno.EINVAL, errno.EPERM)
+
+class BlobStore:
+    """sha256-addressed file bodies, materialized into projects by reflink or read-only hardlink"""
+    
+    _stats = {"written": 0, "deduplicated": 0, "bytes_saved": 0, "reflinked": 0, "hardlinked": 0, "copied": 0}
+    _stats_lock = threading.Lock()
+    _modes: Dict[str, str] = {}  # store root -> "reflink", "hardlink" or "copy"
+    
+    def __init__(self, root: Path = None):
+        self.root = Path(root or settings.BLOB_STORE_DIR or Path(settings.GENERATED_DIR) / ".blobs")
+        if str(self.root) not in self._modes:
+            self._modes[str(self.root)] = self._probe()
+    
+    @property
+    def mode(self) -> str:
+        return self._modes[str(self.root)]
+    
+    def _probe(self) -> str:
+        """How the filesystem of the root shares a file body; leaves nothing behind"""
+        probe = self.root / f".probe.{uuid.uuid4().hex}"
+        linked = probe.with_name(probe.name + ".link")
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            probe.write_bytes(b"probe")
+            if fcntl is not None:
+                try:
+                    with open(probe, 'rb') as src, open(linked, 'wb') as dst:
+                        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                    return "reflink"
+                except OSError:
+                    linked.unlink(missing_ok=True)
+            os.link(probe, linked)
+            return "hardlink"
+        except OSError as e:
+            print(f"[BLOBS] {self.root} cannot share files ({errno.errorcode.get(e.errno, e.errno)}), writing plain copies")
+            return "copy"
+        finally:
+            probe.unlink(missing_ok=True)
+            linked.unlink(missing_ok=True)
+    
+    def blob_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+    
+    def put(self, data: bytes) -> Path:
+        """Read-only blob holding data, written only if this body has never been stored"""
+        digest = hashlib.sha256(data).hexdigest()
+        blob = self.blob_path(digest)
+        if blob.exists():
+            try:
+                if self.mode == "reflink":
+                    os.utime(blob)  # reused: gc() keeps it (hardlinked blobs are kept by their links)
+            except FileNotFoundError:
+                pass
+            else:
+                self._count("deduplicated", bytes_saved=len(data))
+                return blob
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = blob.with_name(f"{digest}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(data)
+        os.chmod(tmp, READ_ONLY)
+        os.replace(tmp, blob)
+        self._count("written")
+        return blob
+    
+    def materialize(self, target: Path, content) -> Path:
+        """Place content at target as a reflink or hardlink of its blob (a private copy otherwise); replaces whatever was there"""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            if self.mode == "copy" or not self._share(data, tmp):
+                tmp.write_bytes(data)
+                self._count("copied")
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return target
+    
+    def _share(self, data: bytes, dest: Path) -> bool:
+        """Reflink or hardlink the blob of data to dest; False if this file has to be copied"""
+        mode = self.mode
+        for _ in range(2):  # gc() may remove the blob between put() and the link: store it again
+            blob = self.put(data)
+            try:
+                if mode == "reflink":
+                    with open(blob, 'rb') as src, open(dest, 'wb') as dst:
+                        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                else:
+                    os.link(blob, dest)
+                self._count(mode + "ed")
+                return True
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                if e.errno == errno.EMLINK:  # this blob has as many links as the filesystem allows
+                    return False
+                if e.errno not in UNSUPPORTED:
+                    raise
+                # e.g. BLOB_STORE_DIR on another device than the projects
+                print(f"[BLOBS] {self.root} cannot {mode} into {dest.parent} ({errno.errorcode.get(e.errno, e.errno)}), writing plain copies")
+                self._modes[str(self.root)] = "copy"
+                return False
+        return False
+    
+    def gc(self, max_idle_hours: float = None) -> int:
+        """Delete blobs not reused for max_idle_hours and no longer linked (all of them in copy mode); returns their bytes"""
+        reclaimed = 0
+        if not self.root.is_dir():
+            return 0
+        max_idle_hours = settings.STORAGE_PROJECT_TTL_HOURS if max_idle_hours is None else max_idle_hours
+        cutoff = time.time() - max_idle_hours * 3600 if self.mode != "copy" else float("inf")
+        for shard in self.root.iterdir():
+            if not shard.is_dir():
+                continue
+            for blob in shard.iterdir():
+                try:
+                    info = blob.stat()
+                    if info.st_mtime < cutoff and info.st_nlink == 1 and blob.suffix != '.tmp':
+                        blob.unlink()
+                        reclaimed += info.st_size
+                except FileNotFoundError:
+                    pass
+        if reclaimed:
+            print(f"[BLOBS] Reclaimed {reclaimed} bytes")
+        return reclaimed
+    @classmethod
+    def _count(cls, key: str, bytes_saved: int = 0):
+        with cls._stats_lock:
+            cls._stats[key] += 1
+            cls._stats["bytes_saved"] += bytes_saved
+    
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        with cls._stats_lock:
+            return dict(cls._stats)
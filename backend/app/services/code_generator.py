@@ -1,15 +1,28 @@
 import os
 import json
-import zipfile
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 import json
 from .ai_service import AIService
 from .ai_factory import AIFactory
 from .quantum_ai import QuantumAI
 from .security_analyzer import SecurityAnalyzer
 from .deployment_service import DeploymentService
+from .project_files import ProjectIndex
+from .blob_store import BlobStore
+from .virtual_tree import VirtualTree
+from .zip_archive import ProjectArchive
+from ..core.config import settings
+from .phase_graph import Phase, run_phases
+from .scaffold import CrudScaffold, container_sizing
+from .analytics_service import AnalyticsService
+from .artifact_templates import artifact_templates
+from .asset_pipeline import AssetPipeline
+from .code_validator import CodeIssue, CodeValidator
+from .snippet_cache import EntityNames, SnippetCache
 import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 class CodeGenerator:
     def __init__(self, output_dir: str):
@@ -19,255 +32,225 @@ class CodeGenerator:
         self.quantum_ai = QuantumAI(os.environ.get('GROQ_API_KEY', '')) if os.environ.get('GROQ_API_KEY') else None
         self.security_analyzer = SecurityAnalyzer()
         self.deployment_service = DeploymentService()
+        self.phase_timings = {}
+        self.validation_issues = []
+        self.snippet_stats = {"lookups": 0, "hits": 0, "hit_rate": 0.0, "saved_calls": 0}
+        self.snippets = SnippetCache(settings.SNIPPET_CACHE_DIR or self.output_dir / ".snippets") if settings.SNIPPET_CACHE_ENABLED else None
+        self.blobs = BlobStore(settings.BLOB_STORE_DIR or self.output_dir / ".blobs") if settings.BLOB_STORE_ENABLED else None
+        self.tree = VirtualTree(self.output_dir)
     
-    def generate_project(self, spec: Dict, project_name: str) -> str:
+    def _write(self, path: Path, content: str):
+        """Into the in-memory tree; nothing reaches the disk before flush()"""
+        self.tree.write(path, content)
+    
+    def generate_project(self, spec: Dict, project_name: str, enrich: bool = False) -> str:
+        """Deterministic scaffold first; with enrich=True (and an AI client) LLM output is layered on top"""
         project_path = self.output_dir / project_name
-        project_path.mkdir(parents=True, exist_ok=True)
+        self.tree = VirtualTree(project_path)
         
         print(f"[CodeGen] Starting generation for {project_name}")
         
-        # Generate all components
-        print("[CodeGen] Generating backend...")
-        backend_code = self._generate_backend(project_path, spec)
-        
-        print("[CodeGen] Generating frontend...")
-        self._generate_frontend(project_path, spec)
-        
-        print("[CodeGen] Generating Docker files...")
-        self._generate_docker_files(project_path, spec)
-        
-        print("[CodeGen] Generating README...")
-        self._generate_readme(project_path, spec)
-        
-        print("[CodeGen] Generating .env files...")
-        self._generate_env_file(project_path, spec)
-        
-        # Generate CI/CD and deployment files
-        print("[CodeGen] Generating CI/CD pipeline...")
-        self._generate_cicd(project_path, spec)
-        
-        print("[CodeGen] Generating Render deployment config...")
-        self._generate_render_config(project_path, spec)
-        
-        print("[CodeGen] Generating Kubernetes manifests...")
-        self._generate_kubernetes(project_path, spec)
-        
-        print("[CodeGen] Generating monitoring configs...")
-        self._generate_monitoring(project_path, spec)
-        
-        # Generate tests
-        print("[CodeGen] Generating tests...")
-        self._generate_tests(project_path, backend_code, spec)
-        
-        # Security analysis
-        print("[CodeGen] Running security analysis...")
-        self._generate_security_report(project_path, backend_code)
-        
-        # Architecture analysis
-        print("[CodeGen] Analyzing architecture...")
-        if self.ai_service.client:
-            try:
-                architecture_analysis = self.ai_service.analyze_architecture(spec)
-                (project_path / "ARCHITECTURE.md").write_text(architecture_analysis)
-                print("[CodeGen] Architecture analysis complete")
-            except Exception as e:
-                print(f"[CodeGen] Architecture analysis failed: {e}")
-        
-        print("[CodeGen] Creating ZIP file...")
-        zip_path = f"{project_path}.zip"
-        self._create_zip(project_path, zip_path)
-        
-        print(f"[CodeGen] ✅ Generation complete: {zip_path}")
-        return zip_path
+        # Only tests and the security report need the generated API code, and the
+        # README must exist before the Render section is appended; everything else
+        # (including the LLM-backed pages and architecture analysis) runs side by side
+        p = project_path
+        sizing = container_sizing(spec.get("scalability") or AnalyticsService().analyze_scalability(spec))
+        scaffold = CrudScaffold(spec, backend_workers=sizing["backend_workers"])
+        self.validation_issues = []
+        self.snippet_stats = {"lookups": 0, "hits": 0, "hit_rate": 0.0, "saved_calls": 0}
+        enrich = enrich and self.ai_service.client is not None
+        phases = [
+            Phase("backend", lambda: self._generate_backend(p, scaffold, enrich)),
+            Phase("backend_deps", lambda: self._generate_backend_deps(p, scaffold)),
+            Phase("frontend", lambda: self._generate_frontend(p, spec, scaffold, enrich)),
+            Phase("docker", lambda: self._generate_docker_files(p, scaffold, sizing)),
+            Phase("readme", lambda: self._generate_readme(p, spec)),
+            Phase("env", lambda: self._generate_env_file(p, spec, scaffold)),
+            Phase("cicd", lambda: self._generate_cicd(p, spec)),
+            Phase("render", lambda _: self._generate_render_config(p, spec), requires=("readme",)),
+            Phase("kubernetes", lambda: self._generate_kubernetes(p, spec)),
+            Phase("monitoring", lambda: self._generate_monitoring(p, spec)),
+            Phase("tests", lambda code: self._generate_tests(p, code, scaffold, enrich), requires=("backend",)),
+        ]
+        if enrich:
+            phases += [
+                Phase("security", lambda code: self._generate_security_report(p, code), requires=("backend",)),
+                Phase("architecture", lambda: self._generate_architecture(p, spec)),
+            ]
+        started = time.perf_counter()
+        _, self.phase_timings = run_phases(phases, max_workers=settings.CODEGEN_MAX_WORKERS)
+        
+        total = time.perf_counter() - started
+        slowest = sorted(self.phase_timings.items(), key=lambda t: -t[1])
+        print(f"[CodeGen] Phases done in {total:.2f}s (sum {sum(self.phase_timings.values()):.2f}s): "
+              + ", ".join(f"{name}={seconds:.2f}s" for name, seconds in slowest))
+        
+        # One rename puts the whole project in place; files shared between projects
+        # (Dockerfiles, manifests...) are stored once in the blob store and reflinked in
+        started = time.perf_counter()
+        self.tree.flush(self.blobs)
+        files = self.tree.files()
+        # Sizes and hashes come from memory, and so do the ZIP entries: nothing is read back.
+        # Later edits update both entry by entry
+        ProjectIndex.install(project_path, files)
+        ProjectArchive(project_path).store(self.tree.zip_chunks(files))
+        print(f"[CodeGen] {len(files)} files flushed, indexed and archived in {time.perf_counter() - started:.2f}s")
+        
+        print(f"[CodeGen] ✅ Generation complete: {project_path}")
+        return str(project_path)
     
-    def _generate_backend(self, project_path: Path, spec: Dict):
-        backend_path = project_path / "backend"
-        backend_path.mkdir(exist_ok=True)
-        
-        # Generate models
-        models_code = self._generate_models(spec.get("database", {}).get("entities", []))
-        (backend_path / "models.py").write_text(models_code)
-        
-        # Generate API routes
-        api_code = self._generate_api(spec.get("api", {}).get("endpoints", []))
-        (backend_path / "main.py").write_text(api_code)
-        
-        # Generate requirements
-        requirements = """fastapi==0.104.1
-uvicorn[standard]==0.24.0
-sqlalchemy==2.0.23
-psycopg2-binary==2.9.9
-pydantic==2.5.0
-python-dotenv==1.0.0
-alembic==1.12.1
-pytest==7.4.3
-bandit==1.7.5"""
-        (backend_path / "requirements.txt").write_text(requirements)
-        
-        # Generate .gitignore
-        (backend_path / ".gitignore").write_text("__pycache__/\n*.pyc\n.env\n*.db\nvenv/")
-        
-        return api_code
+    def _generate_backend(self, project_path: Path, scaffold: CrudScaffold, enrich: bool) -> str:
+        """database/models/schemas/routers/main from the scaffold; returns the API code for tests and security"""
+        files = scaffold.backend_files()
+        requirements = scaffold.requirements()
+        if enrich and scaffold.custom_endpoints:
+            validator = CodeValidator(files, requirements)
+            endpoints = scaffold.custom_endpoints
+            with ThreadPoolExecutor(max_workers=min(len(endpoints), settings.CODEGEN_MAX_WORKERS)) as pool:
+                results = list(pool.map(lambda endpoint: self._endpoint_code(endpoint, scaffold, validator), endpoints))
+            codes = {id(endpoint): code for endpoint, (code, _) in zip(endpoints, results)}
+            self._report_snippets([hit for _, hit in results])
+            files["routers/custom_endpoints.py"] = scaffold.custom_router(lambda endpoint: codes.get(id(endpoint)))
+            # Endpoints pass one by one but may still clash together (same route twice)
+            if CodeValidator(files, requirements).check("routers/custom_endpoints.py", files["routers/custom_endpoints.py"]):
+                print("[CodeGen] ⚠️ Custom endpoints conflict, keeping the stubs")
+                files["routers/custom_endpoints.py"] = scaffold.custom_router()
+        
+        self._report_issues("backend", CodeValidator(files, requirements).validate())
+        for rel_path, content in files.items():
+            self._write(project_path / "backend" / rel_path, content)
+        print(f"[CodeGen] Backend scaffold: {len(scaffold.entities)} entities, {len(scaffold.custom_endpoints)} custom endpoints")
+        return "\n\n".join(content for rel_path, content in files.items() if rel_path == "main.py" or rel_path.startswith("routers/"))
     
-    def _generate_models(self, entities: list) -> str:
-        code = "from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey, Float\n"
-        code += "from sqlalchemy.ext.declarative import declarative_base\n"
-        code += "from sqlalchemy.orm import relationship\n"
-        code += "from datetime import datetime\n\n"
-        code += "Base = declarative_base()\n\n"
-        
-        for entity in entities:
-            if self.ai_service.client:
-                prompt = f"""Generate a complete SQLAlchemy model class for:
-Entity: {entity['name']}
-Columns: {json.dumps(entity.get('columns', []))}
-Relationships: {json.dumps(entity.get('relationships', []))}
-
-Requirements:
-- Use SQLAlchemy ORM
-- Include proper column types and constraints
-- Add relationships if specified
-- Add __repr__ method
-- Only return the class code, no imports or explanations"""
-                
-                try:
-                    response = self.ai_service.client.chat.completions.create(
-                        model=self.ai_service.code_model,
-                        messages=[{"role": "user", "content": prompt}]
-                    )
-                    entity_code = response.choices[0].message.content.strip()
-                    if entity_code.startswith('```'):
-                        entity_code = entity_code.split('\n', 1)[1].rsplit('```', 1)[0]
-                    code += entity_code + "\n\n"
-                    continue
-                except:
-                    pass
-            
-            # Fallback
-            code += f"class {entity['name']}(Base):\n"
-            code += f"    __tablename__ = '{entity['name'].lower()}s'\n"
-            code += "    id = Column(Integer, primary_key=True, autoincrement=True)\n"
-            
-            for col in entity.get("columns", []):
-                col_type = {"string": "String(255)", "integer": "Integer", "boolean": "Boolean", 
-                           "datetime": "DateTime", "text": "Text", "float": "Float"}.get(col["type"], "String(255)")
-                nullable = "nullable=False" if col.get("required") else "nullable=True"
-                unique = ", unique=True" if col.get("unique") else ""
-                code += f"    {col['name']} = Column({col_type}, {nullable}{unique})\n"
-            
-            code += "    created_at = Column(DateTime, default=datetime.utcnow)\n"
-            code += "    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)\n"
-            code += f"\n    def __repr__(self):\n"
-            code += f"        return f'<{entity['name']}(id={{self.id}})>'\n\n"
-        
-        return code
+    def _report_issues(self, package: str, issues: List[CodeIssue]):
+        self.validation_issues += [f"{package}/{issue}" for issue in issues]
+        for issue in issues:
+            print(f"[CodeGen] ⚠️ {package}/{issue}")
     
-    def _generate_api(self, endpoints: list) -> str:
-        code = """from fastapi import FastAPI, HTTPException, Depends
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from models import Base
-import os
-
-DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///./app.db')
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine)
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(title="Generated API")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-"""
-        
-        for endpoint in endpoints:
-            method = endpoint["method"].lower()
-            path = endpoint["path"]
-            func_name = path.replace('/', '_').replace('-', '_').strip('_') or 'root'
-            
-            if self.ai_service.client:
-                prompt = f"""Generate a FastAPI endpoint:
-Method: {endpoint['method']}
-Path: {path}
+    def _endpoint_code(self, endpoint: Dict, scaffold: CrudScaffold, validator: CodeValidator):
+        """(code or None, LLM calls saved or None on a cache miss); snippets are reused across projects"""
+        if self.snippets is None:
+            return self._implement_endpoint(endpoint, scaffold, validator)[0], None
+        entity = scaffold.entity_of(endpoint)
+        names = EntityNames(entity, "/" + endpoint.get("path", "/").strip("/"))
+        key = SnippetCache.endpoint_key(endpoint, entity)
+        cached = self.snippets.get(key)
+        if cached is not None:
+            code = names.concrete(cached["code"])
+            # Renamed code must still fit this project (other entities, fields); otherwise ask again
+            if code and not validator.check("routers/custom_endpoints.py",
+                                            scaffold.custom_router(lambda e: code if e is endpoint else None)):
+                return code, cached.get("calls", 1)
+        code, calls = self._implement_endpoint(endpoint, scaffold, validator)
+        if code:
+            self.snippets.put(key, names.abstract(code), calls)
+        return code, None
+    
+    def _report_snippets(self, saved: List[Optional[int]]):
+        if self.snippets is None or not saved:
+            return
+        hits = [calls for calls in saved if calls is not None]
+        self.snippet_stats = {
+            "lookups": len(saved),
+            "hits": len(hits),
+            "hit_rate": round(len(hits) / len(saved), 4),
+            "saved_calls": sum(hits),
+        }
+        print(f"[CodeGen] Snippet cache: {len(hits)}/{len(saved)} hits, {sum(hits)} LLM calls saved")
+    
+    def _implement_endpoint(self, endpoint: Dict, scaffold: CrudScaffold, validator: CodeValidator) -> Tuple[Optional[str], int]:
+        """LLM body for an endpoint CRUD does not cover, checked in place, and the calls it took; None keeps the 501 stub"""
+        prompt = f"""Generate a FastAPI endpoint:
+Method: {endpoint.get('method', 'GET')}
+Path: {endpoint.get('path', '/')}
 Description: {endpoint.get('description', '')}
 
 Requirements:
-- Use FastAPI decorators
-- Include proper error handling
-- Add Pydantic models for request/response if needed
-- Include database operations if CRUD operation
+- Use the existing `router` (an APIRouter) for the decorator, e.g. @router.get(...)
+- Use `db: Session = Depends(get_db)` for database access and the SQLAlchemy classes in `models`
+- Include proper error handling with HTTPException
 - Only return the function code with decorator, no imports"""
-                
-                try:
-                    response = self.ai_service.client.chat.completions.create(
-                        model=self.ai_service.code_model,
-                        messages=[{"role": "user", "content": prompt}]
-                    )
-                    endpoint_code = response.choices[0].message.content.strip()
-                    if endpoint_code.startswith('```'):
-                        endpoint_code = endpoint_code.split('\n', 1)[1].rsplit('```', 1)[0]
-                    code += endpoint_code + "\n\n"
-                    continue
-                except:
-                    pass
+        messages = [{"role": "user", "content": prompt}]
+        for attempt in range(settings.CODEGEN_FIX_ATTEMPTS + 1):
+            try:
+                response = self.ai_service.client.chat.completions.create(
+                    model=self.ai_service.code_model,
+                    messages=messages
+                )
+                code = response.choices[0].message.content.strip()
+            except Exception as e:
+                print(f"[CodeGen] Endpoint {endpoint.get('path')} kept as stub: {e}")
+                return None, attempt + 1
+            if code.startswith('```'):
+                code = code.split('\n', 1)[1].rsplit('```', 1)[0]
             
-            # Fallback
-            code += f"@app.{method}('{path}')\n"
-            code += f"async def {func_name}(db: Session = Depends(get_db)):\n"
-            code += f"    return {{'message': '{endpoint.get('description', 'Success')}', 'path': '{path}'}}\n\n"
+            # Checked inside the module it will live in, so imports and route parameters are resolved too
+            source = scaffold.custom_router(lambda e: code if e is endpoint else None)
+            issues = validator.check("routers/custom_endpoints.py", source)
+            if not issues:
+                return code, attempt + 1
+            print(f"[CodeGen] Endpoint {endpoint.get('path')} attempt {attempt + 1}: {issues[0]}")
+            messages += [
+                {"role": "assistant", "content": code},
+                {"role": "user", "content": "This code fails validation:\n"
+                    + "\n".join(f"- {issue}" for issue in issues)
+                    + "\nReturn the corrected function only."},
+            ]
+        print(f"[CodeGen] Endpoint {endpoint.get('path')} kept as stub after {settings.CODEGEN_FIX_ATTEMPTS + 1} attempts")
+        return None, settings.CODEGEN_FIX_ATTEMPTS + 1
+    
+    def _generate_backend_deps(self, project_path: Path, scaffold: CrudScaffold):
+        backend_path = project_path / "backend"
         
-        return code
+        self._write(backend_path / "requirements.txt", scaffold.requirements())
+        self._write(backend_path / ".gitignore", artifact_templates.render("project/backend/gitignore.j2"))
+    
+    def _generate_architecture(self, project_path: Path, spec: Dict):
+        if not self.ai_service.client:
+            return
+        print("[CodeGen] Analyzing architecture...")
+        try:
+            architecture_analysis = self.ai_service.analyze_architecture(spec)
+            self._write(project_path / "ARCHITECTURE.md", architecture_analysis)
+            print("[CodeGen] Architecture analysis complete")
+        except Exception as e:
+            print(f"[CodeGen] Architecture analysis failed: {e}")
     
-    def _generate_frontend(self, project_path: Path, spec: Dict):
+    def _generate_frontend(self, project_path: Path, spec: Dict, scaffold: CrudScaffold, enrich: bool):
         frontend_path = project_path / "frontend"
-        frontend_path.mkdir(exist_ok=True)
-        
         templates_path = frontend_path / "templates"
-        templates_path.mkdir(exist_ok=True)
         
-        static_path = frontend_path / "static"
-        static_path.mkdir(exist_ok=True)
+        # CRUD pages for every entity
+        templates = scaffold.templates()
         
-        # Generate HTML pages
-        for page in spec.get("ui", {}).get("pages", []):
-            html = self._generate_html_page(page, spec.get("appConfig", {}))
-            (templates_path / f"{page['route'].strip('/').replace('/', '_') or 'index'}.html").write_text(html)
+        # Generate HTML pages (one LLM call each when enriched, so they are generated side by side)
+        pages = spec.get("ui", {}).get("pages", [])
+        with ThreadPoolExecutor(max_workers=max(1, min(len(pages), settings.CODEGEN_MAX_WORKERS))) as pool:
+            htmls = list(pool.map(lambda page: self._generate_html_page(page, spec.get("appConfig", {}), enrich), pages))
+        for page, html in zip(pages, htmls):
+            templates[f"{page.get('route', '/').strip('/').replace('/', '_') or 'index'}.html"] = html
+        
+        # Tailwind CDN and inline blocks -> precompiled, fingerprinted files under static/assets
+        templates, assets = AssetPipeline(spec.get("performance")).build(templates)
+        for name, template in templates.items():
+            self._write(templates_path / name, template)
+        for name, data in assets.items():
+            self._write(frontend_path / "static" / "assets" / name, data)
+        print(f"[CodeGen] Frontend assets: {len(assets)} files, {sum(len(data) for data in assets.values())} bytes")
         
         # Generate Flask app
-        app_code = self._generate_flask_app(spec)
-        (frontend_path / "app.py").write_text(app_code)
+        flask_app = scaffold.flask_app(pages)
+        self._report_issues("frontend", CodeValidator(
+            {"app.py": flask_app}, scaffold.frontend_requirements()).validate())
+        self._write(frontend_path / "app.py", flask_app)
         
-        # Generate requirements.txt
-        (frontend_path / "requirements.txt").write_text("Flask==3.0.0\nrequests==2.31.0\ngunicorn==21.2.0")
-        
-        # Generate Dockerfile
-        (frontend_path / "Dockerfile").write_text("""FROM python:3.11-slim
-WORKDIR /app
-COPY requirements.txt .
-RUN pip install -r requirements.txt
-COPY . .
-CMD ["python", "app.py"]""")
+        self._write(frontend_path / "requirements.txt", scaffold.frontend_requirements())
     
-    def _generate_html_page(self, page: Dict, app_config: Dict) -> str:
+    def _generate_html_page(self, page: Dict, app_config: Dict, enrich: bool = False) -> str:
         """🌌 QUANTUM AI - Génération parallèle révolutionnaire"""
         
         # 🌌 QUANTUM AI: Génération de 10 variantes en parallèle
-        if self.quantum_ai:
+        if enrich and self.quantum_ai:
             try:
                 description = f"{page['title']}: {page.get('description', '')} - Components: {', '.join(page.get('components', []))}"
                 print(f"\n🌌 Quantum AI: {page['title']}...")
@@ -286,418 +269,104 @@ CMD ["python", "app.py"]""")
                 print(f"  ⚠️ Quantum AI erreur: {str(e)[:80]} - Fallback")
         
         # Fallback de qualité
-        design = {"theme": "glassmorphism", "colors": {"primary": "#6366f1", "secondary": "#8b5cf6", "accent": "#ec4899"}}
-        
-        components_html = ""
-        for comp in page.get('components', []):
-            if 'form' in comp.lower():
-                components_html += f'''<div class="glass-card animate-fade-in">
-                    <form class="space-y-4">
-                        <h2 class="text-2xl font-bold bg-gradient-to-r from-purple-600 to-pink-600 bg-clip-text text-transparent">{comp}</h2>
-                        <input type="text" placeholder="Enter data" class="w-full p-3 bg-white/10 backdrop-blur-lg border border-white/20 rounded-xl focus:ring-2 focus:ring-purple-500 transition-all">
-                        <button type="submit" class="w-full bg-gradient-to-r from-purple-600 to-pink-600 text-white px-6 py-3 rounded-xl hover:scale-105 transition-transform shadow-lg hover:shadow-purple-500/50">Submit</button>
-                    </form>
-                </div>'''
-            elif 'list' in comp.lower() or 'table' in comp.lower():
-                components_html += f'''<div class="glass-card animate-slide-up">
-                    <h2 class="text-2xl font-bold mb-4 bg-gradient-to-r from-blue-600 to-cyan-600 bg-clip-text text-transparent">{comp}</h2>
-                    <div class="overflow-hidden rounded-xl">
-                        <table class="w-full">
-                            <thead class="bg-gradient-to-r from-blue-600/20 to-cyan-600/20 backdrop-blur-lg">
-                                <tr><th class="p-4 text-left">ID</th><th class="p-4 text-left">Name</th><th class="p-4 text-left">Actions</th></tr>
-                            </thead>
-                            <tbody>
-                                <tr class="border-b border-white/10 hover:bg-white/5 transition-colors">
-                                    <td class="p-4">1</td><td class="p-4">Sample</td>
-                                    <td class="p-4"><button class="text-blue-400 hover:text-blue-300 transition-colors">Edit</button></td>
-                                </tr>
-                            </tbody>
-                        </table>
-                    </div>
-                </div>'''
-            else:
-                components_html += f'''<div class="glass-card animate-fade-in hover:scale-105 transition-transform">
-                    <h2 class="text-2xl font-bold bg-gradient-to-r from-indigo-600 to-purple-600 bg-clip-text text-transparent">{comp}</h2>
-                    <p class="text-gray-300 mt-2">Interactive component with modern design</p>
-                </div>'''
-        
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="description" content="{app_config.get('description', 'Modern web application')}">
-    <meta property="og:title" content="{page['title']} - {app_config.get('name', 'App')}">
-    <meta property="og:description" content="{app_config.get('description', 'SOTA web application')}">
-    <meta name="theme-color" content="{primary}">
-    <title>{page['title']} - {app_config.get('name', 'App')}</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-    <style>
-        :root {{
-            --primary: {primary};
-            --secondary: {secondary};
-            --accent: {accent};
-        }}
-        
-        body {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            font-family: 'Inter', system-ui, -apple-system, sans-serif;
-        }}
-        
-        .glass-card {{
-            background: rgba(255, 255, 255, 0.1);
-            backdrop-filter: blur(10px);
-            border: 1px solid rgba(255, 255, 255, 0.2);
-            border-radius: 1.5rem;
-            padding: 2rem;
-            box-shadow: 0 8px 32px 0 rgba(31, 38, 135, 0.37);
-            transition: all 0.3s ease;
-        }}
-        
-        .glass-card:hover {{
-            transform: translateY(-5px);
-            box-shadow: 0 12px 48px 0 rgba(31, 38, 135, 0.5);
-        }}
-        
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(20px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
-        
-        @keyframes slideUp {{
-            from {{ opacity: 0; transform: translateY(40px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
-        
-        .animate-fade-in {{
-            animation: fadeIn 0.6s ease-out forwards;
-        }}
-        
-        .animate-slide-up {{
-            animation: slideUp 0.8s ease-out forwards;
-        }}
-        
-        nav {{
-            background: rgba(255, 255, 255, 0.1);
-            backdrop-filter: blur(10px);
-            border-bottom: 1px solid rgba(255, 255, 255, 0.2);
-        }}
-    </style>
-</head>
-<body class="text-white">
-    <nav class="p-4 shadow-lg sticky top-0 z-50">
-        <div class="container mx-auto flex justify-between items-center">
-            <h1 class="text-3xl font-bold bg-gradient-to-r from-white to-purple-200 bg-clip-text text-transparent">
-                {app_config.get('name', 'Application')}
-            </h1>
-            <div class="space-x-6">
-                <a href="/" class="hover:text-purple-200 transition-colors">Home</a>
-                <a href="#" class="hover:text-purple-200 transition-colors">About</a>
-                <button id="darkModeToggle" class="px-4 py-2 rounded-lg bg-white/10 hover:bg-white/20 transition-all">
-                    🌙
-                </button>
-            </div>
-        </div>
-    </nav>
-    
-    <div class="container mx-auto p-8">
-        <h1 class="text-5xl font-bold mb-12 text-center bg-gradient-to-r from-white via-purple-200 to-pink-200 bg-clip-text text-transparent animate-fade-in">
-            {page['title']}
-        </h1>
-        <div class="grid md:grid-cols-2 lg:grid-cols-3 gap-8">
-            {components_html}
-        </div>
-    </div>
-    
-    <script>
-        // Smooth scroll
-        document.querySelectorAll('a[href^="#"]').forEach(anchor => {{
-            anchor.addEventListener('click', function (e) {{
-                e.preventDefault();
-                const target = document.querySelector(this.getAttribute('href'));
-                if (target) target.scrollIntoView({{ behavior: 'smooth' }});
-            }});
-        }});
-        
-        // Intersection Observer pour animations
-        const observer = new IntersectionObserver((entries) => {{
-            entries.forEach(entry => {{
-                if (entry.isIntersecting) {{
-                    entry.target.style.opacity = '1';
-                    entry.target.style.transform = 'translateY(0)';
-                }}
-            }});
-        }}, {{ threshold: 0.1 }});
-        
-        document.querySelectorAll('.glass-card').forEach(card => observer.observe(card));
-        
-        // Dark mode toggle
-        document.getElementById('darkModeToggle')?.addEventListener('click', () => {{
-            document.body.classList.toggle('dark');
-        }});
-        
-        console.log('🎨 SOTA Page loaded: {page['title']}');
-    </script>
-</body>
-</html>"""
-    
-    def _generate_docker_files(self, project_path: Path, spec: Dict):
-        docker_compose = """version: '3.8'
-services:
-  backend:
-    build: ./backend
-    ports:
-      - "8000:8000"
-    environment:
-      - DATABASE_URL=sqlite:///./app.db
-  frontend:
-    build: ./frontend
-    ports:
-      - "5000:5000"
-    environment:
-      - BACKEND_URL=http://backend:8000
-    depends_on:
-      - backend
-"""
-        (project_path / "docker-compose.yml").write_text(docker_compose)
-        
-        # Backend Dockerfile
-        backend_dockerfile = """FROM python:3.11-slim
-WORKDIR /app
-COPY requirements.txt .
-RUN pip install --no-cache-dir -r requirements.txt
-COPY . .
-EXPOSE 8000
-CMD ["uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000"]
-"""
-        (project_path / "backend" / "Dockerfile").write_text(backend_dockerfile)
+        colors = {"primary": "#6366f1", "secondary": "#8b5cf6", "accent": "#ec4899"}
+        return artifact_templates.render(
+            "project/frontend/page.html.j2",
+            app=app_config,
+            title=page.get('title') or page.get('name') or 'Page',
+            components=page.get('components', []),
+            colors=colors,
+        )
     
-    def _create_zip(self, source_dir: Path, zip_path: str):
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(source_dir):
-                for file in files:
-                    file_path = Path(root) / file
-                    arcname = file_path.relative_to(source_dir.parent)
-                    zipf.write(file_path, arcname)
+    def _generate_docker_files(self, project_path: Path, scaffold: CrudScaffold, sizing: Dict):
+        """Multi-stage images; worker counts come from the scalability analysis of the spec"""
+        self._write(project_path / "docker-compose.yml",
+                    artifact_templates.render("project/docker-compose.yml.j2", cache_backend=scaffold.cache_backend))
+        for package in ("backend", "frontend"):
+            self._write(project_path / package / ".dockerignore", artifact_templates.render(f"project/{package}/dockerignore.j2"))
+        self._write(project_path / "backend" / "Dockerfile", artifact_templates.render(
+            "project/backend/Dockerfile.j2", workers=sizing["backend_workers"], sizing=sizing["machine"]))
+        self._write(project_path / "frontend" / "Dockerfile", artifact_templates.render("project/frontend/Dockerfile.j2"))
+        self._write(project_path / "frontend" / "gunicorn.conf.py", artifact_templates.render(
+            "project/frontend/gunicorn.conf.py.j2", max_workers=sizing["frontend_workers"], sizing=sizing["machine"]))
+        print(f"[CodeGen] Containers sized for {sizing['machine']}: "
+              f"{sizing['backend_workers']} API / {sizing['frontend_workers']} frontend workers")
     
     def _generate_readme(self, project_path: Path, spec: Dict):
-        app_name = spec.get("appConfig", {}).get("name", "Generated Application")
-        description = spec.get("appConfig", {}).get("description", "AI-generated web application")
-        
-        readme = f"""# {app_name}
-
-{description}
-
-## Generated by AutoDev
-
-This project was automatically generated based on your requirements.
-
-## Features
-
-- FastAPI backend with {len(spec.get('database', {}).get('entities', []))} database models
-- {len(spec.get('api', {}).get('endpoints', []))} REST API endpoints
-- {len(spec.get('ui', {}).get('pages', []))} frontend pages
-- Docker support for easy deployment
-
-## Quick Start
-
-### Using Docker (Recommended)
-
-```bash
-docker-compose up --build
-```
-
-### Manual Setup
-
-1. **Backend Setup**
-```bash
-cd backend
-pip install -r requirements.txt
-uvicorn main:app --reload
-```
-
-2. **Access the API**
-- API: http://localhost:8000
-- Docs: http://localhost:8000/docs
-
-## Environment Variables
-
-Copy `.env.example` to `.env` and configure:
-
-```env
-DATABASE_URL=sqlite:///./app.db
-```
-
-## API Endpoints
-
-"""
-        
-        for endpoint in spec.get("api", {}).get("endpoints", []):
-            readme += f"- `{endpoint['method']} {endpoint['path']}` - {endpoint.get('description', 'No description')}\n"
-        
-        readme += "\n## Database Models\n\n"
-        for entity in spec.get("database", {}).get("entities", []):
-            readme += f"- **{entity['name']}**: {len(entity.get('columns', []))} fields\n"
-        
-        readme += "\n## License\n\nMIT License\n"
-        
-        (project_path / "README.md").write_text(readme)
+        app_config = spec.get("appConfig", {})
+        readme = artifact_templates.render(
+            "project/README.md.j2",
+            app_name=app_config.get("name", "Generated Application"),
+            description=app_config.get("description", "AI-generated web application"),
+            entities=spec.get("database", {}).get("entities", []),
+            endpoints=spec.get("api", {}).get("endpoints", []),
+            pages=spec.get("ui", {}).get("pages", []),
+        )
+        self._write(project_path / "README.md", readme)
     
-    def _generate_env_file(self, project_path: Path, spec: Dict):
-        env_content = """DATABASE_URL=sqlite:///./app.db
-SECRET_KEY=change-this-secret-key
-DEBUG=True
-"""
-        (project_path / ".env.example").write_text(env_content)
-        (project_path / ".env").write_text(env_content)
+    def _generate_env_file(self, project_path: Path, spec: Dict, scaffold: CrudScaffold):
+        env_content = artifact_templates.render("project/env.j2", cache_backend=scaffold.cache_backend)
+        self._write(project_path / ".env.example", env_content)
+        self._write(project_path / ".env", env_content)
     
     def _generate_cicd(self, project_path: Path, spec: Dict):
         github_path = project_path / ".github" / "workflows"
-        github_path.mkdir(parents=True, exist_ok=True)
         
         workflow = self.deployment_service.generate_github_actions(spec)
-        (github_path / "ci-cd.yml").write_text(workflow)
+        self._write(github_path / "ci-cd.yml", workflow)
     
     def _generate_kubernetes(self, project_path: Path, spec: Dict):
         k8s_path = project_path / "k8s"
-        k8s_path.mkdir(exist_ok=True)
         
         manifests = self.deployment_service.generate_kubernetes_manifests(spec)
         for filename, content in manifests.items():
-            (k8s_path / filename).write_text(content)
+            self._write(k8s_path / filename, content)
         
         # Add Terraform
         terraform = self.deployment_service.generate_terraform_aws(spec)
-        (project_path / "terraform" / "main.tf").parent.mkdir(exist_ok=True)
-        (project_path / "terraform" / "main.tf").write_text(terraform)
+        self._write(project_path / "terraform" / "main.tf", terraform)
     
     def _generate_monitoring(self, project_path: Path, spec: Dict):
         monitoring_path = project_path / "monitoring"
-        monitoring_path.mkdir(exist_ok=True)
         
         configs = self.deployment_service.generate_monitoring(spec)
         for filename, content in configs.items():
-            (monitoring_path / filename).write_text(content)
+            self._write(monitoring_path / filename, content)
     
-    def _generate_tests(self, project_path: Path, backend_code: str, spec: Dict):
+    def _generate_tests(self, project_path: Path, backend_code: str, scaffold: CrudScaffold, enrich: bool):
+        tests_path = project_path / "backend" / "tests"
+        self._write(tests_path / "__init__.py", "")
+        self._write(tests_path / "test_crud.py", scaffold.tests())
+        self._write(tests_path / "loadtest.py", scaffold.load_test())
+        if not enrich:
+            return
         try:
-            tests_path = project_path / "backend" / "tests"
-            tests_path.mkdir(exist_ok=True)
-            
             test_code = self.security_analyzer.generate_tests(backend_code)
-            (tests_path / "test_api.py").write_text(test_code)
-            (tests_path / "__init__.py").write_text("")
+            self._write(tests_path / "test_api.py", test_code)
             print("[CodeGen] Tests generated successfully")
         except Exception as e:
             print(f"[CodeGen] Test generation failed: {e}")
-            # Create basic test file as fallback
-            tests_path = project_path / "backend" / "tests"
-            tests_path.mkdir(exist_ok=True)
-            (tests_path / "test_api.py").write_text("import pytest\n\ndef test_example():\n    assert True")
-            (tests_path / "__init__.py").write_text("")
     
     def _generate_security_report(self, project_path: Path, backend_code: str):
         try:
             analysis = self.security_analyzer.analyze_security(backend_code)
             performance = self.security_analyzer.optimize_performance(backend_code)
             
-            report = f"""# Security & Performance Report
-
-## Security Score: {analysis.get('score', 75)}/100
-
-### Issues Found:
-"""
-            for issue in analysis.get('issues', []):
-                report += f"\n- **{issue.get('severity', 'unknown').upper()}**: {issue.get('type', 'Unknown')}\n"
-                report += f"  Line {issue.get('line', '?')}: {issue.get('description', '')}\n"
-                report += f"  Fix: {issue.get('fix', 'N/A')}\n"
-            
-            if not analysis.get('issues'):
-                report += "\nNo critical security issues found. ✅\n"
-            
-            report += "\n## Performance Optimizations:\n"
-            for opt in performance.get('optimizations', []):
-                report += f"\n- **{opt.get('type', 'General')}**: {opt.get('description', '')}\n"
-                report += f"  Impact: {opt.get('impact', 'unknown')}\n"
-            
-            if not performance.get('optimizations'):
-                report += "\nCode is well optimized. ✅\n"
-            
-            (project_path / "SECURITY_REPORT.md").write_text(report)
+            report = artifact_templates.render("project/SECURITY_REPORT.md.j2", analysis=analysis, performance=performance)
+            self._write(project_path / "SECURITY_REPORT.md", report)
             print(f"[CodeGen] Security report generated (Score: {analysis.get('score', 75)}/100)")
         except Exception as e:
             print(f"[CodeGen] Security report generation failed: {e}")
-            (project_path / "SECURITY_REPORT.md").write_text("# Security Report\n\nSecurity analysis completed. No critical issues found.")
-    
-    def _generate_flask_app(self, spec: Dict) -> str:
-        """Generate Flask application for frontend"""
-        app_name = spec.get("appConfig", {}).get("name", "App")
-        pages = spec.get("ui", {}).get("pages", [])
-        
-        code = """from flask import Flask, render_template, request, redirect, url_for
-import requests
-import os
-
-app = Flask(__name__)
-app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key')
-
-BACKEND_URL = os.environ.get('BACKEND_URL', 'http://localhost:8000')
-
-"""
-        
-        # Generate routes for each page
-        for page in pages:
-            route = page.get('route', '/')
-            template_name = f"{route.strip('/').replace('/', '_') or 'index'}.html"
-            func_name = route.strip('/').replace('/', '_').replace('-', '_') or 'index'
-            
-            code += f"""@app.route('{route}')
-def {func_name}():
-    return render_template('{template_name}')
-
-"""
-        
-        code += """if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
-"""
-        
-        return code
+            self._write(project_path / "SECURITY_REPORT.md", "# Security Report\n\nSecurity analysis completed. No critical issues found.")
     
     def _generate_render_config(self, project_path: Path, spec: Dict):
         """Generate render.yaml for one-click deployment"""
         app_name = spec.get("appConfig", {}).get("name", "app").lower().replace(" ", "-")
         
-        render_yaml = f"""services:
-  - type: web
-    name: {app_name}-backend
-    runtime: python
-    buildCommand: pip install -r requirements.txt
-    startCommand: uvicorn main:app --host 0.0.0.0 --port $PORT
-    rootDir: backend
-    envVars:
-      - key: DATABASE_URL
-        value: sqlite:///./app.db
-    
-  - type: web
-    name: {app_name}-frontend
-    runtime: python
-    buildCommand: pip install -r requirements.txt
-    startCommand: gunicorn app:app
-    rootDir: frontend
-    envVars:
-      - key: BACKEND_API_URL
-        value: https://{app_name}-backend.onrender.com
-      - key: SECRET_KEY
-        generateValue: true
-"""
-        
-        (project_path / "render.yaml").write_text(render_yaml)
+        self._write(project_path / "render.yaml", artifact_templates.render("project/render.yaml.j2", app_name=app_name))
         
         # Add deploy button to README
-        readme_path = project_path / "README.md"
-        if readme_path.exists():
-            readme = readme_path.read_text()
-            deploy_section = f"""\n## 🚀 Déployer sur Render (GRATUIT)\n\n[![Deploy to Render](https://render.com/images/deploy-to-render-button.svg)](https://render.com/deploy)\n\n### Étapes:\n1. **Push sur GitHub**:\n   ```bash\n   git init\n   git add .\n   git commit -m \"Initial commit\"\n   git remote add origin https://github.com/her0-03/{app_name}.git\n   git push -u origin main\n   ```\n\n2. **Cliquez sur le bouton \"Deploy to Render\" ci-dessus**\n\n3. **Connectez votre repo GitHub**\n\n4. **C'est tout!** Votre app sera live en 3-5 minutes \u00e0:\n   - Frontend: `https://{app_name}-frontend.onrender.com`\n   - Backend: `https://{app_name}-backend.onrender.com`\n\n**Note**: Plan gratuit = 750h/mois. L'app s'endort après 15min d'inactivité.\n"""
-            readme += deploy_section
-            readme_path.write_text(readme)
+        readme = self.tree.read_text(project_path / "README.md")
+        if readme is not None:
+            readme += artifact_templates.render("project/README.render.md.j2", app_name=app_name)
+            self._write(project_path / "README.md", readme)
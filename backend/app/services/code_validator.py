@@ -0,0 +1,337 @@
+"""
+Static checks for generated Python code, run in-process before files are written.
+
+For one generated package (backend/ or frontend/), CodeValidator checks that:
+- every file compiles;
+- every import resolves, either to a module of the package, the standard
+  library or a declared requirement;
+- names imported from a package module exist in that module;
+- names used while a module is imported are defined. This covers decorators,
+  default values, annotations and module-level statements;
+- route decorators (FastAPI and Flask) match their function: path parameters
+  are arguments, and no method/path or Flask endpoint is registered twice.
+
+Together these catch what `python -c "import main"` used to report, without an
+interpreter start or running any generated code.
+"""
+import ast
+import builtins
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+# requirement name -> importable module, where they differ
+DISTRIBUTION_MODULES = {
+    "python-dotenv": "dotenv", "psycopg2-binary": "psycopg2", "pyyaml": "yaml", "pillow": "PIL",
+    "python-jose": "jose", "python-multipart": "multipart", "beautifulsoup4": "bs4",
+    "scikit-learn": "sklearn", "email-validator": "email_validator", "flask-sqlalchemy": "flask_sqlalchemy",
+    "flask-wtf": "flask_wtf", "flask-login": "flask_login", "flask-cors": "flask_cors",
+}
+
+# modules that come with a requirement without being listed
+TRANSITIVE_MODULES = {
+    "fastapi": {"starlette", "pydantic", "pydantic_core", "typing_extensions", "annotated_types"},
+    "flask": {"werkzeug", "jinja2", "markupsafe", "itsdangerous", "click", "blinker"},
+    "requests": {"urllib3", "certifi", "idna", "charset_normalizer"},
+    "httpx": {"httpcore", "anyio", "sniffio", "h11", "certifi", "idna"},
+    "uvicorn": {"h11", "click"},
+    "pytest": {"_pytest", "pluggy", "iniconfig"},
+    "sqlalchemy": {"greenlet", "typing_extensions"},
+    "alembic": {"mako"},
+}
+
+ROUTE_METHODS = {"get", "post", "put", "patch", "delete", "head", "options", "api_route", "websocket"}
+BUILTIN_NAMES = set(dir(builtins)) | {"__file__", "__name__", "__doc__", "__spec__", "__path__",
+                                      "__package__", "__loader__", "__builtins__", "__annotations__"}
+STDLIB_MODULES = set(getattr(sys, "stdlib_module_names", ())) | set(sys.builtin_module_names)
+
+@dataclass
+class CodeIssue:
+    path: str
+    line: int
+    message: str
+    
+    def __str__(self):
+        return f"{self.path}:{self.line}: {self.message}"
+
+def requirement_modules(requirements: str) -> Set[str]:
+    """Top-level modules a requirements.txt makes importable"""
+    modules = set()
+    for line in requirements.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line or line.startswith("-"):
+            continue
+        name = re.split(r"[\[=<>~!;\s]", line, 1)[0].lower()
+        module = DISTRIBUTION_MODULES.get(name, name.replace("-", "_"))
+        modules.add(module)
+        modules |= TRANSITIVE_MODULES.get(module, set())
+    return modules
+
+def module_name(path: str) -> str:
+    """routers/product.py -> routers.product, routers/__init__.py -> routers"""
+    parts = Path(path).with_suffix("").parts
+    if parts and parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
+
+class CodeValidator:
+    """Checks the .py files of one package root; paths are relative to that root"""
+    
+    def __init__(self, files: Dict[str, str], requirements: Optional[str] = None):
+        self.sources = {path: src for path, src in files.items() if path.endswith(".py")}
+        self.allowed = requirement_modules(requirements) if requirements is not None else None
+        self._trees: Dict[str, Optional[ast.Module]] = {}
+    
+    @classmethod
+    def for_package(cls, texts: Dict[str, str], package: str) -> "CodeValidator":
+        """Validator over the `package/` part of project-relative texts (e.g. ProjectIndex.texts())"""
+        prefix = package.rstrip("/") + "/"
+        files = {path[len(prefix):]: src for path, src in texts.items() if path.startswith(prefix)}
+        return cls(files, texts.get(prefix + "requirements.txt"))
+    
+    def validate(self) -> List[CodeIssue]:
+        issues = []
+        for path, source in self.sources.items():
+            issues += self.check(path, source)
+        return issues
+    
+    def check(self, path: str, source: str) -> List[CodeIssue]:
+        """Issues of one file; `source` replaces the package's version of `path` for this check only"""
+        try:
+            tree = ast.parse(source, path)
+            compile(tree, path, "exec")
+        except SyntaxError as e:
+            return [CodeIssue(path, e.lineno or 0, f"SyntaxError: {e.msg}")]
+        except ValueError as e:
+            return [CodeIssue(path, 0, str(e))]
+        issues = self._check_imports(path, tree)
+        issues += self._check_module_attributes(path, tree)
+        issues += self._check_import_time_names(path, tree)
+        issues += self._check_routes(path, tree)
+        return issues
+    
+    # --- imports -------------------------------------------------------------
+    
+    def _tree(self, path: str) -> Optional[ast.Module]:
+        if path not in self._trees:
+            try:
+                self._trees[path] = ast.parse(self.sources[path], path)
+            except SyntaxError:
+                self._trees[path] = None
+        return self._trees[path]
+    
+    def _local_modules(self) -> Dict[str, str]:
+        return {module_name(path): path for path in self.sources}
+    
+    def _check_imports(self, path: str, tree: ast.Module) -> List[CodeIssue]:
+        issues = []
+        local = self._local_modules()
+        local_roots = {name.split(".")[0] for name in local}
+        package = module_name(path).rpartition(".")[0] if not path.endswith("__init__.py") else module_name(path)
+        
+        def check_module(name: str, line: int) -> bool:
+            root = name.split(".")[0]
+            if root in local_roots:
+                if name not in local:
+                    issues.append(CodeIssue(path, line, f"No module named '{name}' in the generated project"))
+                    return False
+                return True
+            if root in STDLIB_MODULES or root == "__future__":
+                return False
+            if self.allowed is not None and root.lower() not in self.allowed and root not in self.allowed:
+                issues.append(CodeIssue(path, line, f"No module named '{root}' (not in requirements.txt)"))
+            return False
+        
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    check_module(alias.name, node.lineno)
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    base = package.split(".") if package else []
+                    base = base[:len(base) - (node.level - 1)] if node.level > 1 else base
+                    name = ".".join(base + ([node.module] if node.module else []))
+                else:
+                    name = node.module or ""
+                if name and not check_module(name, node.lineno):
+                    continue
+                exported = self._exports(local.get(name)) if name else set()
+                for alias in node.names:
+                    if alias.name == "*" or f"{name}.{alias.name}".lstrip(".") in local:
+                        continue
+                    if exported is not None and alias.name not in exported:
+                        issues.append(CodeIssue(path, node.lineno, f"cannot import name '{alias.name}' from '{name}'"))
+        return issues
+    
+    def _check_module_attributes(self, path: str, tree: ast.Module) -> List[CodeIssue]:
+        """`import models` then models.Foo: Foo must be defined in the package's models.py"""
+        local = self._local_modules()
+        aliases = {}
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.name in local and (alias.asname or "." not in alias.name):
+                        aliases[alias.asname or alias.name] = alias.name
+        issues, reported = [], set()
+        for node in ast.walk(tree):
+            if not (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)
+                    and node.value.id in aliases and isinstance(node.ctx, ast.Load)):
+                continue
+            module = aliases[node.value.id]
+            exported = self._exports(local[module])
+            if exported is None or node.attr in exported or f"{module}.{node.attr}" in local:
+                continue
+            if (module, node.attr) not in reported:
+                reported.add((module, node.attr))
+                issues.append(CodeIssue(path, node.lineno, f"AttributeError: module '{module}' has no attribute '{node.attr}'"))
+        return issues
+    
+    def _exports(self, path: Optional[str]) -> Optional[Set[str]]:
+        """Names bound at the top level of a package module; None if unknown (star import, syntax error)"""
+        tree = self._tree(path) if path else None
+        if tree is None:
+            return None
+        names = set()
+        for node in tree.body:
+            if isinstance(node, ast.ImportFrom) and any(a.name == "*" for a in node.names):
+                return None
+            names |= _bound_names(node)
+        return names
+    
+    # --- names evaluated while importing -------------------------------------
+    
+    def _check_import_time_names(self, path: str, tree: ast.Module) -> List[CodeIssue]:
+        if any(isinstance(n, ast.ImportFrom) and any(a.name == "*" for a in n.names) for n in tree.body):
+            return []
+        defined = set(BUILTIN_NAMES)
+        for node in tree.body:
+            defined |= _bound_names(node)
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Global, ast.Nonlocal)):
+                defined |= set(node.names)
+        
+        lazy_annotations = any(isinstance(n, ast.ImportFrom) and n.module == "__future__"
+                               and any(a.name == "annotations" for a in n.names) for n in tree.body)
+        issues, reported = [], set()
+        for expr, scope in _import_time_expressions(tree.body, annotations=not lazy_annotations):
+            local = set(scope)
+            for node in ast.walk(expr):
+                if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+                    local.add(node.id)
+                elif isinstance(node, ast.arg):
+                    local.add(node.arg)
+            for node in ast.walk(expr):
+                if (isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load)
+                        and node.id not in defined and node.id not in local and node.id not in reported):
+                    reported.add(node.id)
+                    issues.append(CodeIssue(path, node.lineno, f"NameError: name '{node.id}' is not defined"))
+        return issues
+    
+    # --- routes --------------------------------------------------------------
+    
+    def _check_routes(self, path: str, tree: ast.Module) -> List[CodeIssue]:
+        issues = []
+        seen_routes, flask_endpoints = {}, {}
+        for node in ast.walk(tree):
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            args = {a.arg for a in node.args.args + node.args.kwonlyargs + node.args.posonlyargs}
+            takes_kwargs = node.args.kwarg is not None
+            for decorator in node.decorator_list:
+                route = _route(decorator)
+                if route is None:
+                    continue
+                owner, method, route_path, endpoint = route
+                if method == "route":  # Flask
+                    params = re.findall(r"<(?:[^:<>]+:)?([^<>]+)>", route_path)
+                    endpoint = endpoint or node.name
+                    key = (owner, endpoint)
+                    if key in flask_endpoints and flask_endpoints[key] != node.name:
+                        issues.append(CodeIssue(path, node.lineno,
+                                                f"View function mapping is overwriting an existing endpoint function: {endpoint}"))
+                    flask_endpoints[key] = node.name
+                else:
+                    params = re.findall(r"{([^}:]+)(?::[^}]*)?}", route_path)
+                    key = (owner, method, route_path)
+                    if key in seen_routes and seen_routes[key] != node.name:
+                        issues.append(CodeIssue(path, node.lineno,
+                                                f"{method.upper()} {route_path} is already handled by {seen_routes[key]}()"))
+                    seen_routes.setdefault(key, node.name)
+                missing = [p for p in params if p not in args]
+                if missing and not takes_kwargs:
+                    issues.append(CodeIssue(path, node.lineno,
+                                            f"{node.name}() lacks path parameter(s) {', '.join(missing)} of route '{route_path}'"))
+        return issues
+
+def _route(decorator: ast.expr):
+    """(owner, method, path, endpoint) for @x.get("/p") / @x.route("/p", endpoint=...), else None"""
+    if not (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute)):
+        return None
+    method = decorator.func.attr
+    if method not in ROUTE_METHODS and method != "route":
+        return None
+    path_arg = decorator.args[0] if decorator.args else next(
+        (k.value for k in decorator.keywords if k.arg in ("path", "rule")), None)
+    if not (isinstance(path_arg, ast.Constant) and isinstance(path_arg.value, str)):
+        return None
+    endpoint = next((k.value.value for k in decorator.keywords
+                     if k.arg == "endpoint" and isinstance(k.value, ast.Constant)), None)
+    return ast.unparse(decorator.func.value), method, path_arg.value, endpoint
+
+def _bound_names(node: ast.stmt) -> Set[str]:
+    """Names a module-level statement binds (including inside if/try/with/for blocks)"""
+    names = set()
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return {node.name}
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        for alias in node.names:
+            names.add(alias.asname or alias.name.split(".")[0])
+        return names
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store):
+            names.add(child.id)
+        elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(child.name)
+        elif isinstance(child, (ast.Import, ast.ImportFrom)):
+            names |= {a.asname or a.name.split(".")[0] for a in child.names}
+        elif isinstance(child, ast.ExceptHandler) and child.name:
+            names.add(child.name)
+    return names
+
+def _import_time_expressions(body: List[ast.stmt], scope: Set[str] = frozenset(), annotations: bool = True):
+    """(node, extra names in scope) for every part of `body` executed on import"""
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for part in node.decorator_list + node.args.defaults + [d for d in node.args.kw_defaults if d]:
+                yield part, scope
+            if not annotations:
+                continue
+            for arg in node.args.args + node.args.kwonlyargs + node.args.posonlyargs:
+                if arg.annotation is not None:
+                    yield arg.annotation, scope
+            if node.returns is not None:
+                yield node.returns, scope
+        elif isinstance(node, ast.ClassDef):
+            for part in node.decorator_list + node.bases + [k.value for k in node.keywords]:
+                yield part, scope
+            class_names = set(scope)
+            for child in node.body:
+                class_names |= _bound_names(child)
+            yield from _import_time_expressions(node.body, class_names, annotations)
+        elif isinstance(node, (ast.If, ast.For, ast.While, ast.With, ast.Try)):
+            for field in ("test", "iter", "target"):
+                part = getattr(node, field, None)
+                if part is not None:
+                    yield part, scope
+            for item in getattr(node, "items", []):
+                yield item, scope
+            for block in ("body", "orelse", "finalbody"):
+                yield from _import_time_expressions(getattr(node, block, []), scope, annotations)
+            for handler in getattr(node, "handlers", []):
+                if handler.type is not None:
+                    yield handler.type, scope
+                yield from _import_time_expressions(handler.body, scope, annotations)
+        elif not isinstance(node, (ast.Import, ast.ImportFrom, ast.Global, ast.Nonlocal)):
+            yield node, scope
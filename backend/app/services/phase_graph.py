@@ -0,0 +1,58 @@
+"""
+Run named phases as a dependency graph.
+
+Every phase declares the phases whose results it needs. A phase starts as soon
+as those have finished, so independent phases (and their LLM calls) overlap in
+a thread pool. The first failure cancels the phases that have not started and
+is re-raised.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+@dataclass
+class Phase:
+    name: str
+    run: Callable[..., Any]  # called with the results of `requires`, in order
+    requires: Tuple[str, ...] = field(default_factory=tuple)
+
+def run_phases(phases: List[Phase], max_workers: int = 8) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """Returns (results, seconds) keyed by phase name"""
+    by_name = {p.name: p for p in phases}
+    for phase in phases:
+        missing = [r for r in phase.requires if r not in by_name]
+        if missing:
+            raise ValueError(f"Phase {phase.name} requires unknown phases {missing}")
+    
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+    pending = dict(by_name)
+    running = {}
+    
+    def timed(phase: Phase, args: list):
+        started = time.perf_counter()
+        try:
+            return phase.run(*args)
+        finally:
+            timings[phase.name] = round(time.perf_counter() - started, 3)
+    
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="phase") as pool:
+        while pending or running:
+            for name, phase in list(pending.items()):
+                if all(r in results for r in phase.requires):
+                    del pending[name]
+                    running[pool.submit(timed, phase, [results[r] for r in phase.requires])] = name
+            if not running:
+                raise ValueError(f"Dependency cycle between phases {sorted(pending)}")
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    for other in running:
+                        other.cancel()
+                    raise error
+                results[name] = future.result()
+    return results, timings
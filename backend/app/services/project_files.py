@@ -0,0 +1,311 @@
+"""
+Per-project file index shared by the editor, the AI assistant, the improver and
+the ZIP writer.
+
+The index (path, size, mtime, sha256, language) is built once when a project is
+generated and persisted next to it as project_<id>.index.json. Every write made
+through our APIs goes through ProjectIndex.write_text(), which updates that one
+entry, so listing files is a lookup instead of a walk of the tree. File texts
+are cached in memory and revalidated against the file's mtime and size.
+"""
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..core.config import settings
+
+IGNORED_PARTS = {'__pycache__', '.git', 'node_modules'}
+
+LANGUAGES = {
+    '.py': 'python', '.html': 'html', '.htm': 'html', '.css': 'css', '.js': 'javascript',
+    '.ts': 'typescript', '.json': 'json', '.md': 'markdown', '.yml': 'yaml', '.yaml': 'yaml',
+    '.txt': 'text', '.tf': 'terraform', '.toml': 'toml', '.ini': 'ini', '.sh': 'shell',
+    '.sql': 'sql', '.env': 'dotenv', '.example': 'dotenv',
+}
+
+def language_for(path: str) -> str:
+    name = Path(path).name
+    if name == 'Dockerfile':
+        return 'dockerfile'
+    return LANGUAGES.get(Path(path).suffix.lower(), 'text')
+
+class _TextCache:
+    """Byte-bounded LRU of decoded file texts keyed by (path, mtime_ns, size)"""
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key) -> Optional[str]:
+        with self._lock:
+            text = self._data.get(key)
+            if text is not None:
+                self._data.move_to_end(key)
+            return text
+    
+    def put(self, key, text: str):
+        cost = len(text)
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                return
+            self._data[key] = text
+            self.size += cost
+            while self.size > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.size -= len(evicted)
+
+class ProjectIndex:
+    """File index of one generated project"""
+    
+    MAX_DIGESTS_PER_PROJECT = 20_000
+    
+    # Digests are grouped by loaded project ("" for files of none) and dropped with its index
+    _digests: Dict[str, "OrderedDict[str, Tuple[int, int, str]]"] = {}
+    _instances: "OrderedDict[str, ProjectIndex]" = OrderedDict()
+    _lock = threading.Lock()
+    _texts = _TextCache(settings.FILE_INDEX_TEXT_CACHE_MB * 1024 * 1024)
+    
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.index_path = Path(f"{self.root}.index.json")
+        self.entries: Dict[str, Dict] = {}
+        self._loaded = False
+        self._write_lock = threading.Lock()
+    
+    @classmethod
+    def for_job(cls, job_id: str) -> "ProjectIndex":
+        return cls.load(Path(settings.GENERATED_DIR) / f"project_{job_id}")
+    
+    @classmethod
+    def load(cls, root: Path) -> "ProjectIndex":
+        """Shared instance for a project; read from disk, or built by one walk if missing"""
+        key = os.path.abspath(root)
+        with cls._lock:
+            index = cls._instances.get(key)
+            if index is not None:
+                cls._instances.move_to_end(key)
+        if index is None:
+            index = cls(Path(root))
+            if not index.exists():
+                index._loaded = True  # nothing to share for a project that does not exist
+                return index
+            with cls._lock:
+                index = cls._instances.setdefault(key, index)
+                cls._register(key, index)
+        with index._write_lock:
+            if not index._loaded:
+                index._read_or_build()
+                index._loaded = True
+        return index
+    
+    def exists(self) -> bool:
+        return self.root.is_dir()
+    
+    def _read_or_build(self):
+        if not self.exists():
+            self.entries = {}
+            return
+        try:
+            data = json.loads(self.index_path.read_text(encoding='utf-8'))
+            self.entries = {e["path"]: e for e in data["files"]}
+        except (FileNotFoundError, ValueError, KeyError):
+            self._build()
+    
+    @classmethod
+    def install(cls, root: Path, files: Dict[str, Tuple[int, str]]) -> "ProjectIndex":
+        """Index of a tree just written from memory: sizes and hashes are known, only mtimes are stat()ed"""
+        index = cls(Path(root))
+        digests = {}
+        for rel, (size, digest) in files.items():
+            full_path = index.root / rel
+            stat = full_path.stat()
+            index.entries[rel] = {"path": rel, "size": size, "mtime": stat.st_mtime, "hash": digest,
+                                  "language": language_for(rel)}
+            digests[os.path.abspath(full_path)] = (stat.st_mtime_ns, stat.st_size, digest)
+        index._loaded = True
+        index._save()
+        key = os.path.abspath(index.root)
+        with cls._lock:
+            cls._register(key, index)
+            cls._digests[key] = bucket = OrderedDict(digests)
+            while len(bucket) > cls.MAX_DIGESTS_PER_PROJECT:
+                bucket.popitem(last=False)
+        print(f"[INDEX] Indexed {len(index.entries)} files in {index.root.name} (from memory)")
+        return index
+    
+    @classmethod
+    def _register(cls, key: str, index: "ProjectIndex"):
+        """Make `index` the most recently used; evicts the least recently used ones and their digests (lock held)"""
+        cls._instances[key] = index
+        cls._instances.move_to_end(key)
+        while len(cls._instances) > settings.FILE_INDEX_MAX_PROJECTS:
+            evicted, _ = cls._instances.popitem(last=False)
+            cls._digests.pop(evicted, None)
+    
+    def rebuild(self) -> "ProjectIndex":
+        """Full walk; used once at generation time or when the index file is missing"""
+        with self._write_lock:
+            self._build()
+            self._loaded = True
+        return self
+    
+    def _build(self):
+        self.entries = {}
+        for root, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs if d not in IGNORED_PARTS]
+            for file in files:
+                file_path = Path(root) / file
+                self.entries[self.relative(file_path)] = self._entry(file_path)
+        self._save()
+        print(f"[INDEX] Indexed {len(self.entries)} files in {self.root.name}")
+    
+    def _save(self):
+        tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        tmp_path.write_text(json.dumps({"files": list(self.entries.values())}), encoding='utf-8')
+        os.replace(tmp_path, self.index_path)
+    
+    def _entry(self, file_path: Path) -> Dict:
+        stat = file_path.stat()
+        rel = self.relative(file_path)
+        return {
+            "path": rel,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "hash": self.digest(file_path, stat),
+            "language": language_for(rel)
+        }
+    
+    def relative(self, file_path: Path) -> str:
+        return str(file_path.relative_to(self.root)).replace('\\', '/')
+    
+    def resolve(self, relative_path: str) -> Optional[Path]:
+        """Absolute path of a project file, or None if missing or outside the project"""
+        root = self.root.resolve()
+        full_path = (root / relative_path).resolve()
+        if root not in full_path.parents or not full_path.is_file():
+            return None
+        return full_path
+    
+    # --- queries -------------------------------------------------------------
+    
+    def manifest(self) -> List[Dict]:
+        return sorted(self.entries.values(), key=lambda e: e["path"])
+    
+    def files(self, suffixes: Optional[Iterable[str]] = None, max_size: Optional[int] = None) -> List[Dict]:
+        suffixes = set(suffixes) if suffixes else None
+        return [e for e in self.manifest()
+                if (suffixes is None or Path(e["path"]).suffix in suffixes)
+                and (max_size is None or e["size"] < max_size)]
+    
+    def text(self, relative_path: str) -> Optional[str]:
+        """UTF-8 content (None for binary or missing files), served from the text cache when unchanged"""
+        full_path = self.root / relative_path
+        try:
+            stat = full_path.stat()
+        except FileNotFoundError:
+            return None
+        key = (str(full_path), stat.st_mtime_ns, stat.st_size)
+        text = self._texts.get(key)
+        if text is None:
+            try:
+                text = full_path.read_text(encoding='utf-8')
+            except (UnicodeDecodeError, OSError):
+                return None
+            self._texts.put(key, text)
+        return text
+    
+    def texts(self, suffixes: Optional[Iterable[str]] = None, max_size: Optional[int] = None) -> Dict[str, str]:
+        result = {}
+        for entry in self.files(suffixes, max_size):
+            text = self.text(entry["path"])
+            if text is not None:
+                result[entry["path"]] = text
+        return result
+    
+    # --- writes --------------------------------------------------------------
+    
+    def write_text(self, relative_path: str, content: str):
+        self.write_bytes(relative_path, content.encode('utf-8'))
+    
+    def write_bytes(self, relative_path: str, data: bytes):
+        """Write to a new file renamed over the old one, so readers of the old file never see a partial write"""
+        full_path = self.root / relative_path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = full_path.with_name(f".{full_path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, full_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self.record_write(relative_path)
+    
+    def record_write(self, relative_path: str):
+        """Refresh the entry of a file written outside write_text()"""
+        full_path = self.root / relative_path
+        with self._write_lock:
+            if full_path.is_file():
+                entry = self._entry(full_path)
+                self.entries[entry["path"]] = entry
+            else:
+                self.entries.pop(self.relative(full_path), None)
+            self._save()
+    
+    def forget(self):
+        """Drop the index (project deleted or regenerated)"""
+        key = os.path.abspath(self.root)
+        with self._lock:
+            self._instances.pop(key, None)
+            self._digests.pop(key, None)
+        self.index_path.unlink(missing_ok=True)
+    
+    @classmethod
+    def digest(cls, file_path: Path, stat=None) -> str:
+        """sha256 of the file; only re-read when mtime or size changed"""
+        stat = stat or file_path.stat()
+        key = os.path.abspath(file_path)
+        with cls._lock:
+            cached = cls._digest_bucket(key).get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        
+        sha = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        cls._cache_digest(key, stat, digest)
+        return digest
+    
+    @classmethod
+    def remember_digest(cls, file_path: Path, digest: str):
+        """Seed the digest cache for a file whose sha256 was computed while writing it"""
+        cls._cache_digest(os.path.abspath(file_path), file_path.stat(), digest)
+    
+    @classmethod
+    def _digest_bucket(cls, path: str) -> "OrderedDict[str, Tuple[int, int, str]]":
+        """Digests of the loaded project holding an absolute path, its project_<id>.zip included (lock held)"""
+        owner = path[:-len(".zip")] if path.endswith(".zip") else path
+        while owner not in cls._instances:
+            parent = os.path.dirname(owner)
+            if parent == owner:
+                owner = ""
+                break
+            owner = parent
+        return cls._digests.setdefault(owner, OrderedDict())
+    
+    @classmethod
+    def _cache_digest(cls, path: str, stat, digest: str):
+        with cls._lock:
+            bucket = cls._digest_bucket(path)
+            bucket[path] = (stat.st_mtime_ns, stat.st_size, digest)
+            bucket.move_to_end(path)
+            while len(bucket) > cls.MAX_DIGESTS_PER_PROJECT:
+                bucket.popitem(last=False)
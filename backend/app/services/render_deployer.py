@@ -2,6 +2,7 @@ import os
 import requests
 import zipfile
 from pathlib import Path
+from .project_files import ProjectIndex
 
 class RenderDeployer:
     """Deploy generated apps to Render automatically"""
@@ -115,8 +116,7 @@ class RenderDeployer:
 """
         
         # Save render.yaml in project
-        with open(project_dir / "render.yaml", "w") as f:
-            f.write(render_yaml)
+        ProjectIndex.load(project_dir).write_text("render.yaml", render_yaml)
         
         # Return deploy button markdown
         return f"[![Deploy to Render](https://render.com/images/deploy-to-render-button.svg)](https://render.com/deploy?repo=https://github.com/her0-03/{app_name})"
@@ -0,0 +1,831 @@
+"""
+Deterministic project scaffold: turns `database.entities` and `api.endpoints`
+into a runnable FastAPI backend (models, Pydantic schemas, one CRUD router per
+entity) and a Flask frontend with list/create/edit/delete pages, without any
+LLM call. CodeGenerator layers optional AI enrichment on top of it.
+"""
+import hashlib
+import keyword
+import math
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+from .artifact_templates import artifact_templates
+
+# spec type -> (SQLAlchemy column type, Python type, HTML input type)
+COLUMN_TYPES = {
+    "string": ("String(255)", "str", "text"),
+    "text": ("Text", "str", "textarea"),
+    "integer": ("Integer", "int", "number"),
+    "float": ("Float", "float", "number"),
+    "boolean": ("Boolean", "bool", "checkbox"),
+    "datetime": ("DateTime", "datetime", "datetime-local"),
+    "date": ("Date", "date", "date"),
+}
+
+# Other spellings of those types found in specs
+TYPE_ALIASES = {
+    "str": "string", "varchar": "string", "char": "string", "email": "string", "uuid": "string",
+    "int": "integer", "bigint": "integer", "smallint": "integer", "serial": "integer",
+    "bool": "boolean", "number": "float", "decimal": "float", "double": "float", "numeric": "float",
+    "timestamp": "datetime", "longtext": "text",
+}
+
+# Attribute names that would shadow SQLAlchemy or Pydantic internals
+RESERVED_ATTRS = {"id", "created_at", "updated_at", "metadata", "registry", "query",
+                  "json", "dict", "copy", "schema", "validate", "construct", "fields"}
+
+CRUD_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+
+# Budget of routes without a `rate_limit` hint when security.rate_limiting is on: 100 requests/minute
+DEFAULT_RATE_LIMIT = (100, 60)
+
+# Traffic share of each method in the generated load test when an endpoint has no `weight`: reads dominate
+LOAD_WEIGHTS = {"GET": 10, "POST": 3, "PUT": 2, "PATCH": 2, "DELETE": 1}
+
+# Relationship cardinalities as written in specs -> canonical kind
+RELATION_KINDS = {
+    "one-to-many": "one-to-many", "1-n": "one-to-many", "1:n": "one-to-many", "has-many": "one-to-many",
+    "many-to-one": "many-to-one", "n-1": "many-to-one", "n:1": "many-to-one", "belongs-to": "many-to-one",
+    "many-to-many": "many-to-many", "n-n": "many-to-many", "n:m": "many-to-many", "m:n": "many-to-many",
+    "one-to-one": "one-to-one", "1-1": "one-to-one", "1:1": "one-to-one", "has-one": "one-to-one",
+}
+
+# Units of the spec's `caching` and `rate_limit` hints ("5 minutes", "1h", "100/hour")
+TTL_UNITS = {"s": 1, "sec": 1, "second": 1, "seconde": 1, "m": 60, "min": 60, "minute": 60,
+             "h": 3600, "hr": 3600, "hour": 3600, "heure": 3600, "d": 86400, "day": 86400, "jour": 86400}
+
+def ttl_seconds(hint) -> int:
+    """'5 minutes', '1h', 300 -> seconds; 0 for none/no/disabled or anything unreadable"""
+    if isinstance(hint, bool) or hint is None:
+        return 0
+    if isinstance(hint, (int, float)):
+        return max(int(hint), 0)
+    match = re.match(r"\s*(\d+(?:\.\d+)?)\s*([a-z]*)", str(hint).lower())
+    if not match:
+        return 0
+    unit = match.group(2).rstrip("s") or "s"
+    return int(float(match.group(1)) * TTL_UNITS.get(unit, TTL_UNITS.get(unit + "s", 0)))
+
+def rate_budget(hint) -> Optional[Tuple[int, int]]:
+    """'100/hour', '10 per minute', '500/15min' -> (requests, period in seconds); None if unreadable"""
+    match = re.match(r"\s*(\d+)\s*(?:/|per)\s*(\d*)\s*([a-z]*)", str(hint or "").lower())
+    if not match or not int(match.group(1)):
+        return None
+    unit = match.group(3).rstrip("s") or "s"
+    seconds = TTL_UNITS.get(unit, TTL_UNITS.get(unit + "s"))
+    if seconds is None:
+        return None
+    return int(match.group(1)), int(match.group(2) or 1) * seconds
+
+# Resident memory of one worker process in MB, used to cap worker counts on the target machine
+WORKER_MEMORY_MB = {"backend": 192, "frontend": 128}
+
+def container_sizing(scalability: Optional[Dict]) -> Dict:
+    """Worker counts for the machine of a scalability analysis ('4 vCPU, 8GB RAM'); 1 vCPU/1 GB if unreadable"""
+    vertical = ((scalability or {}).get("scaling_strategy") or {}).get("vertical") or {}
+    machine = str(vertical.get("recommended") or vertical.get("current") or "")
+    cpus = re.search(r"(\d+(?:\.\d+)?)\s*v?cpu", machine, re.I)
+    memory = re.search(r"(\d+(?:\.\d+)?)\s*([gm])i?b", machine, re.I)
+    cpus = max(1, math.ceil(float(cpus.group(1)))) if cpus else 1
+    memory_mb = int(float(memory.group(1)) * (1024 if memory.group(2).lower() == "g" else 1)) if memory else 1024
+    return {
+        "machine": f"{cpus} vCPU, {memory_mb} MB",
+        # One event loop per CPU; blocking endpoints run on each worker's thread pool
+        "backend_workers": max(1, min(cpus, memory_mb // WORKER_MEMORY_MB["backend"])),
+        "frontend_workers": max(1, min(2 * cpus + 1, memory_mb // WORKER_MEMORY_MB["frontend"])),
+    }
+
+def route_pattern(path: str) -> str:
+    """Regex matching the concrete paths of a route (/orders/{id} -> ^/orders/[^/]+$)"""
+    parts = re.split(r"({[^}/]+})", "/" + path.strip("/"))
+    return "^" + "".join("[^/]+" if part.startswith("{") else re.escape(part) for part in parts) + "/?$"
+
+def requirements_file(text: str) -> str:
+    """One requirement per line, newline-terminated (pip, `cat >>` and diffs expect the final newline)"""
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip()) + "\n"
+
+def snake(name: str) -> str:
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", name.strip())
+    name = re.sub(r"[^0-9a-zA-Z]+", "_", name).strip("_").lower()
+    if not name or name[0].isdigit():
+        name = f"f_{name}"
+    return name
+
+def pascal(name: str) -> str:
+    name = "".join(part[:1].upper() + part[1:] for part in re.split(r"[^0-9a-zA-Z]+", name) if part) or "Item"
+    return f"E{name}" if name[0].isdigit() else name
+
+def plural(word: str) -> str:
+    if word.endswith("y") and word[-2:-1] not in "aeiou":
+        return word[:-1] + "ies"
+    if word.endswith(("s", "x", "z", "ch", "sh")):
+        return word + "es"
+    return word + "s"
+
+def identifier(name: str) -> str:
+    ident = re.sub(r"[^0-9a-zA-Z_]", "_", name.strip()) or "field"
+    if ident[0].isdigit():
+        ident = f"f_{ident}"
+    if keyword.iskeyword(ident) or ident in RESERVED_ATTRS:
+        ident = f"{ident}_value"
+    return ident
+
+class Field:
+    def __init__(self, column: Dict):
+        self.column = column.get("name", "field")
+        self.attr = identifier(self.column)
+        kind = str(column.get("type", "string")).lower().split("(")[0].strip()
+        kind = TYPE_ALIASES.get(kind, kind)
+        self.type = kind if kind in COLUMN_TYPES else "string"
+        self.sql_type, self.py_type, self.input_type = COLUMN_TYPES[self.type]
+        self.references = column.get("references") or column.get("foreignKey")
+        self.target: Optional["Entity"] = None  # entity this column points to, once resolved
+        self.one_to_one = False
+        self.required = bool(column.get("required"))
+        self.unique = bool(column.get("unique"))
+        self.label = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", self.column).replace("_", " ").capitalize()
+
+class Entity:
+    def __init__(self, spec: Dict):
+        self.name = pascal(spec.get("name", "Item"))
+        self.snake = snake(self.name)
+        self.plural = plural(self.snake)
+        self.description = spec.get("description", "")
+        self.relationships = [r for r in spec.get("relationships") or [] if isinstance(r, dict)]
+        self.indexes = spec.get("indexes") or []
+        self.relations: List[Relation] = []
+        seen = set()
+        self.fields: List[Field] = []
+        for column in spec.get("columns", []):
+            field = Field(column)
+            if snake(field.column) in ("id", "created_at", "updated_at") or field.attr in seen:
+                continue  # added by the scaffold itself
+            seen.add(field.attr)
+            self.fields.append(field)
+        self.prefix = f"/api/v1/{self.plural.replace('_', '-')}"
+    
+    def matches(self, segment: str) -> bool:
+        segment = snake(segment)
+        return segment in (self.snake, self.plural)
+    
+    def claim(self, name: str) -> str:
+        """An attribute name not yet used by a column or relationship of this entity"""
+        used = {"id", "created_at", "updated_at"} | {f.attr for f in self.fields} | {r.attr for r in self.relations}
+        name = identifier(name)
+        while name in used:
+            name += "_rel"
+        return name
+    
+    def column_name(self, name: str) -> Optional[str]:
+        """Database column for a name found in the spec (`indexes`), or None if unknown"""
+        key = snake(str(name))
+        if key in ("id", "created_at", "updated_at"):
+            return key
+        for field in self.fields:
+            if key in (snake(field.column), snake(field.attr)):
+                return field.column
+        return None
+    
+    def index_groups(self) -> List[Tuple[str, ...]]:
+        """Composite indexes: each spec index and each foreign key, followed by id so that
+        filtered lists (WHERE col = ? ORDER BY id) are served from the index alone"""
+        groups = []
+        for entry in self.indexes:
+            names = entry if isinstance(entry, (list, tuple)) else str(entry).split(",")
+            columns = [c for c in (self.column_name(n) for n in names if str(n).strip()) if c]
+            if not columns or (len(columns) == 1 and any(f.unique and f.column == columns[0] for f in self.fields)):
+                continue  # unknown, or already indexed by its unique constraint
+            groups.append(tuple(dict.fromkeys(columns + ["id"])))
+        groups += [(f.column, "id") for f in self.fields if f.target is not None and not f.one_to_one]
+        return list(dict.fromkeys(groups))
+    
+    def filter_fields(self) -> List[Field]:
+        """Columns a list endpoint can filter on without a scan: unique ones and index leaders"""
+        leading = {group[0] for group in self.index_groups()}
+        return [f for f in self.fields if f.unique or f.column in leading]
+
+class Relation:
+    """relationship() attribute of an entity. Relations load on first access only: no response
+    schema includes them, so reads never pull in the graph of related rows; a query that
+    returns a relation asks for it with selectinload()/joinedload()"""
+    
+    def __init__(self, kind: str, attr: str, target: "Entity", collection: bool, back: str = "",
+                 secondary: Optional[str] = None, foreign_key: Optional[str] = None, remote_side: Optional[str] = None):
+        self.kind = kind
+        self.attr = attr
+        self.target = target
+        self.collection = collection
+        self.back = back
+        self.secondary = secondary
+        self.foreign_key = foreign_key
+        self.remote_side = remote_side
+    
+    def source(self) -> str:
+        args = [f'"{self.target.name}"']
+        if self.secondary:
+            args.append(f'secondary="{self.secondary}"')
+        if self.back:
+            args.append(f'back_populates="{self.back}"')
+        if self.foreign_key:
+            args.append(f'foreign_keys="[{self.foreign_key}]"')
+        if self.remote_side:
+            args.append(f'remote_side="{self.remote_side}"')
+        if not self.collection and self.kind == "one-to-one":
+            args.append("uselist=False")
+        args.append('lazy="select"')
+        return f"    {self.attr} = relationship({', '.join(args)})"
+
+class CrudScaffold:
+    """Files of a CRUD application derived from a spec; every method returns source text"""
+    
+    def __init__(self, spec: Dict, backend_workers: int = 1):
+        self.spec = spec
+        self.backend_workers = backend_workers
+        self.app_config = spec.get("appConfig", {})
+        self.app_name = self.app_config.get("name", "App")
+        self.entities = self._unique([Entity(e) for e in spec.get("database", {}).get("entities", [])])
+        self.association_tables: List[Tuple[str, Entity, Entity]] = []
+        self._link()
+        self.custom_endpoints = self._bind_endpoints(spec.get("api", {}).get("endpoints", []))
+        # Redis when the spec's infrastructure names it, or when several API workers must share the cache
+        # and the rate-limit buckets; the in-process store otherwise
+        shared_state = bool(self.cache_rules() or self.rate_limits() or self.default_rate_limit())
+        named = "redis" in str(spec.get("infrastructure", {}).get("caching", "")).lower()
+        self.cache_backend = "redis" if named or (shared_state and backend_workers > 1) else "memory"
+    
+    @staticmethod
+    def _unique(entities: List[Entity]) -> List[Entity]:
+        seen, result = set(), []
+        for entity in entities:
+            if entity.name not in seen:
+                seen.add(entity.name)
+                result.append(entity)
+        return result
+    
+    def _bind_endpoints(self, endpoints: List[Dict]) -> List[Dict]:
+        """Use the spec's paths as CRUD prefixes; endpoints CRUD does not cover are returned"""
+        custom = []
+        for endpoint in endpoints:
+            path = "/" + endpoint.get("path", "/").strip("/")
+            method = endpoint.get("method", "GET").upper()
+            segments = path.strip("/").split("/")
+            entity, base = self._entity_for(segments)
+            if entity is None or method not in CRUD_METHODS:
+                custom.append(endpoint)
+                continue
+            rest = segments[len(base):]
+            if len(rest) > 1 or (rest and not rest[0].startswith("{")):
+                custom.append(endpoint)  # nested or action route, e.g. /orders/{id}/cancel
+                continue
+            if entity.prefix == f"/api/v1/{entity.plural.replace('_', '-')}":
+                entity.prefix = "/" + "/".join(base)
+        return custom
+    
+    def entity_named(self, name: str) -> Optional[Entity]:
+        name = str(name or "").split(".")[0]
+        for entity in self.entities:
+            if entity.name == pascal(name) or entity.matches(name):
+                return entity
+        return None
+    
+    def _link(self):
+        """Resolve foreign keys and `relationships` into columns, relationship() attributes and association tables"""
+        for entity in self.entities:
+            for field in entity.fields:
+                if field.references:
+                    self._foreign_key(entity, self.entity_named(field.references), field=field)
+        pairs = set()
+        for entity in self.entities:
+            for relationship in entity.relationships:
+                kind = RELATION_KINDS.get(re.sub(r"[\s_]+", "-", str(relationship.get("type", "")).strip().lower()))
+                target = self.entity_named(relationship.get("target") or relationship.get("entity"))
+                if kind is None or target is None:
+                    continue
+                if kind == "one-to-many":
+                    self._foreign_key(target, entity)
+                elif kind == "many-to-one":
+                    self._foreign_key(entity, target)
+                elif kind == "one-to-one":
+                    self._foreign_key(entity, target, one_to_one=True)
+                elif target is not entity and frozenset((entity.name, target.name)) not in pairs:
+                    pairs.add(frozenset((entity.name, target.name)))
+                    self.association_tables.append(("_".join(sorted((entity.plural, target.plural))), entity, target))
+        
+        for child in self.entities:
+            keys = [f for f in child.fields if f.target is not None]
+            for field in keys:
+                parent = field.target
+                shared = sum(1 for f in keys if f.target is parent) > 1
+                base = snake(field.column)
+                scalar = child.claim(base[:-3] if base.endswith("_id") and len(base) > 3 else parent.snake)
+                many_name = child.snake if field.one_to_one else child.plural
+                if shared or parent is child:
+                    many_name = f"{scalar}_{many_name}"
+                foreign_key = f"{child.name}.{field.attr}" if shared else None
+                kind = "one-to-one" if field.one_to_one else "many-to-one"
+                # the claim on the parent must see the child's attribute when both are the same class
+                child.relations.append(Relation(kind, scalar, parent, False, foreign_key=foreign_key,
+                                                remote_side=f"{child.name}.id" if parent is child else None))
+                many = parent.claim(many_name)
+                child.relations[-1].back = many
+                parent.relations.append(Relation("one-to-one" if field.one_to_one else "one-to-many", many, child,
+                                                 not field.one_to_one, back=scalar, foreign_key=foreign_key))
+        for table, left, right in self.association_tables:
+            left_attr, right_attr = left.claim(right.plural), right.claim(left.plural)
+            left.relations.append(Relation("many-to-many", left_attr, right, True, back=right_attr, secondary=table))
+            right.relations.append(Relation("many-to-many", right_attr, left, True, back=left_attr, secondary=table))
+    
+    def _foreign_key(self, child: Entity, parent: Optional[Entity], field: Optional[Field] = None, one_to_one: bool = False):
+        """child.<parent>_id -> parent.id, reusing a column the spec already declares"""
+        if parent is None:
+            return
+        if field is None:
+            if any(f.target is parent for f in child.fields) or any(f.target is child and f.one_to_one for f in parent.fields):
+                return  # declared from the other side as well
+            column = f"{parent.snake}_id"
+            field = next((f for f in child.fields if f.target is None and snake(f.column) == column), None)
+            if field is None:
+                field = Field({"name": column, "type": "integer"})
+                child.fields.append(field)
+        field.target = parent
+        field.type = "integer"
+        field.sql_type, field.py_type, field.input_type = COLUMN_TYPES["integer"]
+        if one_to_one:
+            field.one_to_one = field.unique = True
+    
+    def entity_of(self, endpoint: Dict) -> Optional[Entity]:
+        """Entity an endpoint's path is about (/orders/{id}/cancel -> Order), if any"""
+        for segment in reversed(endpoint.get("path", "/").strip("/").split("/")):
+            if segment.startswith("{"):
+                continue
+            for entity in self.entities:
+                if entity.matches(segment):
+                    return entity
+        return None
+    
+    def _entity_for(self, segments: List[str]) -> Tuple[Optional[Entity], List[str]]:
+        for i in range(len(segments) - 1, -1, -1):
+            if segments[i].startswith("{"):
+                continue
+            for entity in self.entities:
+                if entity.matches(segments[i]):
+                    return entity, segments[:i + 1]
+            break
+        return None, []
+    
+    # --- backend -------------------------------------------------------------
+    
+    def database(self) -> str:
+        return '''import os
+from sqlalchemy import create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+
+engine = create_engine(DATABASE_URL, connect_args=connect_args, pool_pre_ping=True)
+# Objects stay readable after commit: no SELECT to refresh what was just written
+SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, expire_on_commit=False)
+Base = declarative_base()
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+'''
+    
+    def models(self) -> str:
+        fields = [f for e in self.entities for f in e.fields]
+        sql_types = {f.sql_type.split("(")[0] for f in fields} | {"Integer", "DateTime"}
+        if any(f.target for f in fields) or self.association_tables:
+            sql_types.add("ForeignKey")
+        if self.association_tables or any(e.index_groups() for e in self.entities):
+            sql_types.add("Index")
+        if self.association_tables:
+            sql_types.add("Table")
+        lines = [
+            "from datetime import datetime",
+            f"from sqlalchemy import Column, {', '.join(sorted(sql_types))}",
+        ]
+        if any(e.relations for e in self.entities):
+            lines.append("from sqlalchemy.orm import relationship")
+        lines += ["from database import Base", ""]
+        for table, left, right in self.association_tables:
+            lines += [
+                "",
+                f"{table} = Table(",
+                f'    "{table}",',
+                "    Base.metadata,",
+                f'    Column("{left.snake}_id", ForeignKey("{left.plural}.id", ondelete="CASCADE"), primary_key=True),',
+                f'    Column("{right.snake}_id", ForeignKey("{right.plural}.id", ondelete="CASCADE"), primary_key=True),',
+                f'    Index("{self._index_name(table, [right.snake + "_id"])}", "{right.snake}_id"),',
+                ")",
+                "",
+            ]
+        for entity in self.entities:
+            lines += ["", f"class {entity.name}(Base):"]
+            if entity.description:
+                lines.append(f'    """{self._docstring(entity.description)}"""')
+            lines.append(f'    __tablename__ = "{entity.plural}"')
+            groups = entity.index_groups()
+            if groups:
+                lines.append("    __table_args__ = (")
+                for group in groups:
+                    columns = ", ".join(f'"{c}"' for c in group)
+                    lines.append(f'        Index("{self._index_name(entity.plural, group)}", {columns}),')
+                lines.append("    )")
+            lines += ["", "    id = Column(Integer, primary_key=True, autoincrement=True)"]
+            for field in entity.fields:
+                args = [repr(field.column)] if field.attr != field.column else []
+                args.append(field.sql_type)
+                if field.target is not None:
+                    ondelete = "CASCADE" if field.required else "SET NULL"
+                    args.append(f'ForeignKey("{field.target.plural}.id", ondelete="{ondelete}")')
+                args.append("nullable=False" if field.required else "nullable=True")
+                if field.unique:
+                    args.append("unique=True")
+                lines.append(f"    {field.attr} = Column({', '.join(args)})")
+            lines += [
+                "    created_at = Column(DateTime, default=datetime.utcnow)",
+                "    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)",
+            ]
+            if entity.relations:
+                lines.append("")
+                lines += [relation.source() for relation in entity.relations]
+            lines += [
+                "",
+                "    def __repr__(self):",
+                f"        return f\"<{entity.name}(id={{self.id}})>\"",
+                "",
+            ]
+        return "\n".join(lines)
+    
+    def schemas(self) -> str:
+        lines = [
+            "from datetime import date, datetime",
+            "from typing import Optional",
+            "from pydantic import BaseModel, ConfigDict",
+            "",
+        ]
+        for entity in self.entities:
+            name = entity.name
+            lines += ["", f"class {name}Base(BaseModel):"]
+            body = []
+            for field in entity.fields:
+                if field.required:
+                    body.append(f"    {field.attr}: {field.py_type}")
+                else:
+                    body.append(f"    {field.attr}: Optional[{field.py_type}] = None")
+            lines += body or ["    pass"]
+            lines += ["", "", f"class {name}Create({name}Base):", "    pass", "",
+                      "", f"class {name}Update(BaseModel):"]
+            lines += [f"    {f.attr}: Optional[{f.py_type}] = None" for f in entity.fields] or ["    pass"]
+            lines += [
+                "", "", f"class {name}Read({name}Base):",
+                "    model_config = ConfigDict(from_attributes=True)",
+                "",
+                "    id: int",
+                "    created_at: Optional[datetime] = None",
+                "    updated_at: Optional[datetime] = None",
+                "",
+                "",
+                f"class {name}BulkUpdate({name}Update):",
+                "    id: int",
+                "",
+            ]
+        return "\n".join(lines)
+    
+    def router(self, entity: Entity) -> str:
+        filters = [{"attr": f.attr, "py_type": f.py_type,
+                    "param": f"{f.attr}_filter" if f.attr in ("response", "after", "limit", "db") else f.attr}
+                   for f in entity.filter_fields()]
+        return artifact_templates.render(
+            "project/backend/router.py.j2",
+            entity=entity,
+            filters=filters,
+            fields=["id"] + [f.attr for f in entity.fields] + ["created_at", "updated_at"],
+            datetime_filters=sorted({f["py_type"] for f in filters} & {"date", "datetime"}),
+        )
+    
+    def custom_router(self, implement: Optional[Callable[[Dict], Optional[str]]] = None) -> str:
+        """Endpoints the spec describes beyond CRUD: 501 stubs unless `implement` returns code for them"""
+        lines = [
+            "from fastapi import APIRouter, Depends, HTTPException",
+            "from sqlalchemy.orm import Session",
+            "from database import get_db",
+            "import models",
+            "",
+            "router = APIRouter(tags=[\"custom\"])",
+            "",
+        ]
+        used = set()
+        for endpoint in self.custom_endpoints:
+            code = implement(endpoint) if implement else None
+            if code:
+                lines += ["", code.strip(), ""]
+                continue
+            method = endpoint.get("method", "GET").lower()
+            if method not in ("get", "post", "put", "patch", "delete"):
+                method = "get"
+            path = "/" + endpoint.get("path", "/").strip("/")
+            params = [identifier(p) for p in re.findall(r"{([^}/]+)}", path)]
+            path = re.sub(r"{([^}/]+)}", lambda m: "{" + identifier(m.group(1)) + "}", path)
+            func = f"{method}_{snake(path) if path != '/' else 'root'}"
+            while func in used:
+                func += "_"
+            used.add(func)
+            description = endpoint.get("description", "") or f"{method.upper()} {path}"
+            args = ", ".join([f"{p}: str" for p in params] + ["db: Session = Depends(get_db)"])
+            lines += [
+                "",
+                f'@router.{method}("{path}")',
+                f"def {func}({args}):",
+                f'    """{self._docstring(description)}"""',
+                f'    raise HTTPException(status_code=501, detail={description!r})',
+                "",
+            ]
+        return "\n".join(lines)
+    
+    def cache_rules(self) -> List[Dict]:
+        """GET routes of the spec with a `caching` hint, and their TTL in seconds"""
+        rules = []
+        for endpoint in self.spec.get("api", {}).get("endpoints", []):
+            ttl = ttl_seconds(endpoint.get("caching"))
+            if ttl and endpoint.get("method", "GET").upper() == "GET":
+                rules.append({"pattern": route_pattern(endpoint.get("path", "/")), "ttl": ttl})
+        return list({rule["pattern"]: rule for rule in rules}.values())
+    
+    def cache(self) -> str:
+        resources = [{"pattern": route_pattern(e.get("path", "/")), "name": self.entity_of(e).plural}
+                     for e in self.custom_endpoints if self.entity_of(e) is not None]
+        resources += [{"pattern": f"^{re.escape(entity.prefix)}(/|$)", "name": entity.plural}
+                      for entity in sorted(self.entities, key=lambda e: -len(e.prefix))]
+        return artifact_templates.render("project/backend/cache.py.j2", rules=self.cache_rules(),
+                                         resources=resources, backend=self.cache_backend)
+    
+    def rate_limits(self) -> List[Dict]:
+        """Per-endpoint budgets of the spec's `rate_limit` hints"""
+        rules = []
+        for endpoint in self.spec.get("api", {}).get("endpoints", []):
+            budget = rate_budget(endpoint.get("rate_limit"))
+            if budget:
+                rules.append({"method": endpoint.get("method", "GET").upper(), "pattern": route_pattern(endpoint.get("path", "/")),
+                              "limit": budget[0], "period": budget[1]})
+        return list({(rule["method"], rule["pattern"]): rule for rule in rules}.values())
+    
+    def default_rate_limit(self) -> Optional[Dict]:
+        """Budget of the routes without a hint when security.rate_limiting is on"""
+        if not self.spec.get("security", {}).get("rate_limiting"):
+            return None
+        return {"limit": DEFAULT_RATE_LIMIT[0], "period": DEFAULT_RATE_LIMIT[1]}
+    
+    def rate_limiter(self) -> str:
+        return artifact_templates.render("project/backend/rate_limit.py.j2", rules=self.rate_limits(),
+                                         default=self.default_rate_limit(), backend=self.cache_backend)
+    
+    def load_scenarios(self) -> List[Dict]:
+        """Load-test scenarios: api.endpoints (CRUD routes of every entity when there are none) with
+        their weight, the field types of their body and the collection each path parameter draws ids from"""
+        endpoints = self.spec.get("api", {}).get("endpoints", [])
+        if not endpoints:
+            endpoints = [{"method": method, "path": entity.prefix + suffix} for entity in self.entities
+                         for method, suffix in (("GET", ""), ("POST", ""), ("GET", "/{id}"), ("PATCH", "/{id}"))]
+        scenarios = []
+        for endpoint in endpoints:
+            method = str(endpoint.get("method", "GET")).upper()
+            path = "/" + endpoint.get("path", "/").strip("/")
+            entity = self.entity_of(endpoint)
+            body = None
+            if method in ("POST", "PUT", "PATCH"):
+                if entity is not None and not any(e is endpoint for e in self.custom_endpoints):
+                    body = {f.attr: f"ref:{f.target.prefix}" if f.target is not None else f.py_type for f in entity.fields}
+                elif isinstance(endpoint.get("request_body"), dict):
+                    body = {name: Field({"name": name, "type": kind}).py_type for name, kind in endpoint["request_body"].items()}
+            params = {}
+            for match in re.finditer(r"{([^}/]+)}", path):
+                params[match.group(1)] = path[:match.start()].rstrip("/")
+            weight = endpoint.get("weight")
+            scenarios.append({
+                "name": f"{method} {path}",
+                "method": method,
+                "path": path,
+                "weight": weight if isinstance(weight, (int, float)) and weight > 0 else LOAD_WEIGHTS.get(method, 1),
+                "body": body,
+                "params": params,
+            })
+        return list({s["name"]: s for s in scenarios}.values())
+    
+    def load_test(self) -> str:
+        return artifact_templates.render("project/backend/loadtest.py.j2", app_name=self.app_name, scenarios=self.load_scenarios())
+    
+    def main(self) -> str:
+        lines = [
+            "from fastapi import FastAPI",
+            "from fastapi.middleware.cors import CORSMiddleware",
+            "from database import Base, engine",
+            "import models  # noqa: F401 - registers the tables",
+        ]
+        lines += [f"from routers.{e.snake} import router as {e.snake}_router" for e in self.entities]
+        if self.custom_endpoints:
+            lines.append("from routers.custom_endpoints import router as custom_router")
+        if self.cache_rules():
+            lines.append("from cache import ResponseCache")
+        limited = bool(self.rate_limits() or self.default_rate_limit())
+        if limited:
+            lines.append("from rate_limit import RateLimiter")
+        lines += [
+            "",
+            "Base.metadata.create_all(bind=engine)",
+            "",
+            f"app = FastAPI(title={(self.app_name + ' API')!r}, description={self.app_config.get('description', '')!r}, version=\"1.0.0\")",
+            "",
+        ]
+        # The last one added runs first: CORS, then the rate limiter (cached hits count too), then the cache
+        if self.cache_rules():
+            lines += ["app.add_middleware(ResponseCache)", ""]
+        if limited:
+            lines += ["app.add_middleware(RateLimiter)", ""]
+        lines += [
+            "app.add_middleware(",
+            "    CORSMiddleware,",
+            '    allow_origins=["*"],',
+            "    allow_credentials=True,",
+            '    allow_methods=["*"],',
+            '    allow_headers=["*"],',
+            '    expose_headers=["X-Next-Cursor", "Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining"],',
+            ")",
+            "",
+        ]
+        lines += [f"app.include_router({e.snake}_router)" for e in self.entities]
+        if self.custom_endpoints:
+            lines.append("app.include_router(custom_router)")
+        lines += [
+            "",
+            "",
+            '@app.get("/health")',
+            "def health():",
+            '    return {"status": "ok"}',
+            "",
+        ]
+        return "\n".join(lines)
+    
+    def tests(self) -> str:
+        lines = [
+            "import os",
+            "",
+            'os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")',
+            'os.environ.setdefault("RATE_LIMIT_ENABLED", "0")  # only test_rate_limit counts requests',
+            "",
+            "from fastapi.testclient import TestClient",
+            "from main import app",
+            "",
+            "client = TestClient(app)",
+            "",
+            "",
+            "def test_health():",
+            '    assert client.get("/health").json() == {"status": "ok"}',
+            "",
+        ]
+        for entity in self.entities:
+            sample = {f.attr: self._sample(f) for f in entity.fields if f.required or f.unique}
+            batch = [{f.attr: self._sample(f, i) for f in entity.fields if f.required or f.unique} for i in range(1, 4)]
+            lines += [
+                "",
+                f"def test_{entity.snake}_crud():",
+                f"    created = client.post(\"{entity.prefix}\", json={sample!r})",
+                "    assert created.status_code == 201, created.text",
+                '    item_id = created.json()["id"]',
+                f'    assert client.get(f"{entity.prefix}/{{item_id}}").status_code == 200',
+                f'    assert any(i["id"] == item_id for i in client.get("{entity.prefix}").json())',
+                f'    assert client.delete(f"{entity.prefix}/{{item_id}}").status_code == 204',
+                f'    assert client.get(f"{entity.prefix}/{{item_id}}").status_code == 404',
+                "",
+                "",
+                f"def test_{entity.snake}_bulk_and_pages():",
+                f"    created = client.post(\"{entity.prefix}/bulk\", json={batch!r})",
+                "    assert created.status_code == 201, created.text",
+                '    ids = [item["id"] for item in created.json()]',
+                f'    page = client.get("{entity.prefix}", params={{"after": ids[0] - 1, "limit": 2, "fields": "id"}})',
+                '    assert [item["id"] for item in page.json()] == ids[:2]',
+                f'    rest = client.get("{entity.prefix}", params={{"after": page.headers["X-Next-Cursor"], "limit": 2}})',
+                '    assert rest.json()[0]["id"] == ids[2]',
+                f'    updated = client.patch("{entity.prefix}/bulk", json=[{{"id": i}} for i in ids])',
+                '    assert updated.status_code == 200, updated.text',
+                f'    deleted = client.delete("{entity.prefix}/bulk", params={{"ids": ids}})',
+                '    assert deleted.json() == {"deleted": 3}',
+                "",
+            ]
+        cached = next((e for e in self.entities if any(re.match(r["pattern"], e.prefix) for r in self.cache_rules())), None)
+        if cached is not None:
+            sample = {f.attr: self._sample(f, 9) for f in cached.fields if f.required or f.unique}
+            lines += [
+                "",
+                f"def test_{cached.snake}_list_is_cached_until_a_write():",
+                f'    first = client.get("{cached.prefix}")',
+                f'    assert client.get("{cached.prefix}").headers["X-Cache"] == "HIT"',
+                f'    assert client.get("{cached.prefix}", headers={{"If-None-Match": first.headers["ETag"]}}).status_code == 304',
+                f'    assert client.post("{cached.prefix}", json={sample!r}).status_code == 201',
+                f'    assert client.get("{cached.prefix}").headers["X-Cache"] == "MISS"',
+                "",
+            ]
+        if self.rate_limits() or self.default_rate_limit():
+            lines += [
+                "",
+                "def test_rate_limit():",
+                "    import re",
+                "    from rate_limit import MemoryBuckets, RateLimiter",
+                '    limited = TestClient(RateLimiter(app, MemoryBuckets(), rules=[("GET", re.compile("^/health$"), 2, 60)], enabled=True))',
+                '    assert [limited.get("/health").status_code for _ in range(3)] == [200, 200, 429]',
+                '    assert int(limited.get("/health").headers["Retry-After"]) >= 1',
+                "",
+            ]
+        return "\n".join(lines)
+    
+    def requirements(self) -> str:
+        # redis is installed whenever a cache or limiter can use it, so the backend can be switched at deploy time
+        redis = bool(self.cache_rules() or self.rate_limits() or self.default_rate_limit())
+        return requirements_file(artifact_templates.render("project/backend/requirements.txt.j2", redis=redis))
+    
+    def frontend_requirements(self) -> str:
+        return requirements_file(artifact_templates.render("project/frontend/requirements.txt.j2"))
+    
+    def backend_files(self, implement: Optional[Callable[[Dict], Optional[str]]] = None) -> Dict[str, str]:
+        files = {
+            "database.py": self.database(),
+            "models.py": self.models(),
+            "schemas.py": self.schemas(),
+            "main.py": self.main(),
+            "routers/__init__.py": "",
+        }
+        if self.cache_rules():
+            files["cache.py"] = self.cache()
+        if self.rate_limits() or self.default_rate_limit():
+            files["rate_limit.py"] = self.rate_limiter()
+        for entity in self.entities:
+            files[f"routers/{entity.snake}.py"] = self.router(entity)
+        if self.custom_endpoints:
+            files["routers/custom_endpoints.py"] = self.custom_router(implement)
+        return files
+    
+    # --- frontend ------------------------------------------------------------
+    
+    def resources(self) -> Dict[str, Dict]:
+        """label: column shown for an item in the select boxes of the resources pointing to it"""
+        resources = {}
+        for entity in self.entities:
+            fields = []
+            for f in entity.fields:
+                field = {"name": f.attr, "label": f.label, "type": f.input_type, "python": f.py_type, "required": f.required}
+                if f.target is not None:
+                    field["choices"] = f.target.plural
+                fields.append(field)
+            label = next((f.attr for f in entity.fields if f.py_type == "str" and f.target is None), "id")
+            resources[entity.plural] = {"title": entity.name, "endpoint": entity.prefix, "label": label, "fields": fields}
+        return resources
+    
+    def flask_app(self, pages: List[Dict]) -> str:
+        page_routes = []
+        for page in pages:
+            route = page.get("route", "/")
+            page_routes.append({
+                "route": route,
+                "func": "page_" + (snake(route) if route.strip("/") else "index"),
+                "template": f"{route.strip('/').replace('/', '_') or 'index'}.html",
+            })
+        has_index = any(p.get("route", "/").strip("/") == "" for p in pages)
+        return artifact_templates.render(
+            "project/frontend/app.py.j2",
+            app_name=self.app_name,
+            resources=self.resources(),
+            page_routes=page_routes,
+            index_resource=None if has_index else next(iter(self.resources()), None),
+        )
+    
+    def templates(self) -> Dict[str, str]:
+        return {name: artifact_templates.source(f"project/frontend/templates/{name}")
+                for name in ("base.html", "resource_list.html", "resource_form.html")}
+    
+    # --- helpers -------------------------------------------------------------
+    
+    @staticmethod
+    def _index_name(table: str, columns) -> str:
+        """ix_<table>_<columns>, shortened with a hash past PostgreSQL's 63 characters"""
+        name = f"ix_{table}_{'_'.join(snake(c) for c in columns)}"
+        if len(name) > 63:
+            name = f"{name[:54]}_{hashlib.sha1(name.encode()).hexdigest()[:8]}"
+        return name
+    
+    @staticmethod
+    def _docstring(text: str) -> str:
+        return " ".join(str(text).split()).replace("\\", "/").replace('"', "'")
+    
+    @staticmethod
+    def _sample(field: Field, n: int = 0):
+        """Test value; a different n gives a different value (unique columns)"""
+        if field.py_type == "str":
+            return f"sample-{field.attr}-{n}" if n else f"sample-{field.attr}"
+        return {"int": 1 + n, "float": 1.5 + n, "bool": True, "datetime": f"2024-01-{1 + n:02d}T00:00:00",
+                "date": f"2024-01-{1 + n:02d}"}[field.py_type]
@@ -0,0 +1,143 @@
+"""
+LLM code snippets shared between projects, keyed by normalized entity schema.
+
+The same entities (User, Product, Order, Student...) come back from one tenant
+to the next, and so do their custom endpoints ("cancel an order", "enroll a
+student"). An entity is normalized before hashing: columns are sorted by their
+snake_case name, types are canonical, required/unique flags are kept and
+foreign keys are reduced to their shape. The class, table and route names are
+left out, except for relationship attributes (order.user) that code may use. The endpoint's method, path shape and description are hashed with
+that schema, with the entity's names replaced by placeholders.
+
+A snippet is stored with placeholders for the entity and field names, and is
+renamed deterministically for the project that reuses it. Entries live under
+SNIPPET_CACHE_DIR/<sha[:2]>/<sha>.json, like the blob store.
+"""
+import hashlib
+import json
+import re
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+from ..core.config import settings
+from ..utils.cache import TTLCache
+from .scaffold import Entity, snake
+
+CACHE_VERSION = 2
+
+def normalize_entity(entity: Entity) -> Dict:
+    """Name-independent shape of an entity: its columns in a canonical order and form"""
+    columns = [{
+        "name": snake(field.column),
+        "type": field.type,
+        "required": field.required,
+        "unique": field.unique,
+        "fk": bool(field.target or field.references),
+    } for field in entity.fields]
+    relations = sorted(f"{r.kind}:{r.attr}" for r in entity.relations)
+    return {"columns": sorted(columns, key=lambda c: c["name"]), "relationships": relations}
+
+class EntityNames:
+    """Entity-specific identifiers of one project, and the placeholders standing for them in the cache"""
+    
+    PLACEHOLDER = re.compile(r"__(?:PATH|ENTITY|entities|entity|field\d+|param\d+)__")
+    
+    def __init__(self, entity: Optional[Entity], path: str):
+        self.path = path
+        # placeholder -> (name, regex); class names also match as a prefix (OrderCreate), snake
+        # names as a part of snake_case (get_order); fields and params only as whole identifiers
+        self.names: Dict[str, tuple] = {}
+        if entity is not None:
+            self.names["__ENTITY__"] = (entity.name, rf"(?<![A-Z0-9]){re.escape(entity.name)}(?![a-z0-9])")
+            self.names["__entities__"] = (entity.plural, rf"(?<![A-Za-z0-9]){re.escape(entity.plural)}(?![a-z0-9])")
+            self.names["__entity__"] = (entity.snake, rf"(?<![A-Za-z0-9]){re.escape(entity.snake)}(?![a-z0-9])")
+            for i, field in enumerate(sorted(entity.fields, key=lambda f: snake(f.column))):
+                self.names[f"__field{i}__"] = (field.attr, rf"\b{re.escape(field.attr)}\b")
+        for i, param in enumerate(re.findall(r"{([^}/:]+)", path)):
+            self.names.setdefault(f"__param{i}__", (param, rf"\b{re.escape(param)}\b"))
+    
+    def abstract(self, code: str) -> str:
+        """Project names -> placeholders (route path first, then one pass over all identifiers)"""
+        for literal in (repr(self.path), json.dumps(self.path)):
+            code = code.replace(literal, "__PATH__")
+        if not self.names:
+            return code
+        ordered = sorted(self.names.items(), key=lambda item: len(item[1][0]), reverse=True)
+        pattern = re.compile("|".join(f"(?P<g{i}>{regex})" for i, (_, (_, regex)) in enumerate(ordered)))
+        return pattern.sub(lambda m: ordered[int(m.lastgroup[1:])][0], code)
+    
+    def concrete(self, template: str) -> str:
+        """Placeholders -> this project's names; None if the template needs a name this project lacks"""
+        values = {placeholder: name for placeholder, (name, _) in self.names.items()}
+        values["__PATH__"] = json.dumps(self.path)
+        if any(p not in values for p in self.PLACEHOLDER.findall(template)):
+            return None
+        return self.PLACEHOLDER.sub(lambda m: values[m.group(0)], template)
+
+class SnippetCache:
+    _lock = threading.Lock()
+    _memory = TTLCache(maxsize=2048, ttl=24 * 3600)  # in front of the files
+    _totals = {"lookups": 0, "hits": 0, "stored": 0}
+    
+    def __init__(self, root: Path = None):
+        self.root = Path(root or settings.SNIPPET_CACHE_DIR or Path(settings.GENERATED_DIR) / ".snippets")
+    
+    @staticmethod
+    def endpoint_key(endpoint: Dict, entity: Optional[Entity]) -> str:
+        path = "/" + endpoint.get("path", "/").strip("/")
+        description = " ".join(str(endpoint.get("description", "")).lower().split())
+        if entity is not None:
+            words = sorted({entity.name.lower(), entity.snake, entity.plural, entity.plural.replace("_", "-")}, key=len, reverse=True)
+            pattern = r"\b(" + "|".join(map(re.escape, words)) + r")\b"
+            path = re.sub(pattern, "{entity}", path, flags=re.IGNORECASE)
+            description = re.sub(pattern, "{entity}", description)
+        path = re.sub(r"{(?!entity})[^}/]+}", "{param}", path)
+        path = re.sub(r"^/api/v\d+", "", path)
+        payload = {
+            "v": CACHE_VERSION,
+            "kind": "endpoint",
+            "method": endpoint.get("method", "GET").upper(),
+            "path": path,
+            "description": description,
+            "entity": normalize_entity(entity) if entity is not None else None,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """{"code": template, "calls": LLM calls it took} or None"""
+        with self._lock:
+            self._totals["lookups"] += 1
+        entry = self._memory.get(key)
+        if entry is None:
+            try:
+                entry = json.loads(self._path(key).read_text(encoding='utf-8'))
+            except (FileNotFoundError, ValueError):
+                return None
+            if entry.get("v") != CACHE_VERSION or "code" not in entry:
+                return None
+            self._memory.set(key, entry)
+        with self._lock:
+            self._totals["hits"] += 1
+        return entry
+    
+    def put(self, key: str, template: str, calls: int = 1):
+        entry = {"v": CACHE_VERSION, "code": template, "calls": calls}
+        self._memory.set(key, entry)
+        with self._lock:
+            self._totals["stored"] += 1
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{key}.{uuid.uuid4().hex}.tmp")
+        tmp.write_text(json.dumps(entry), encoding='utf-8')
+        tmp.replace(path)
+    
+    @classmethod
+    def totals(cls) -> Dict[str, float]:
+        with cls._lock:
+            totals = dict(cls._totals)
+        totals["hit_rate"] = round(totals["hits"] / totals["lookups"], 4) if totals["lookups"] else 0.0
+        return totals
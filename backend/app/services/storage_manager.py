@@ -0,0 +1,265 @@
+"""
+Retention for UPLOAD_DIR and GENERATED_DIR.
+
+A background sweep removes, in this order:
+- uploads older than STORAGE_UPLOAD_TTL_HOURS, except those an unfinished job
+  (PENDING/PROCESSING, created within STORAGE_PROJECT_TTL_HOURS) still reads;
+- project trees (with their ZIP and index) not accessed for STORAGE_PROJECT_TTL_HOURS;
+- the least recently accessed projects and uploads of each user above STORAGE_USER_QUOTA_MB;
+- the least recently accessed items overall above STORAGE_MAX_TOTAL_MB.
+
+An evicted job keeps its spec and summary columns. Only evicted_at is set, and
+generating again rebuilds the files. Accesses are recorded in memory by touch()
+and written to last_accessed_at in bulk at the start of each sweep.
+"""
+import asyncio
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from sqlalchemy import bindparam, update
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.generation_job import GenerationJob, JobStatus
+from ..models.project import Project
+from .blob_store import BlobStore
+from .project_files import ProjectIndex
+from .zip_archive import ProjectArchive
+
+MB = 1024 * 1024
+
+@dataclass
+class StoredItem:
+    user_id: str
+    last_used: datetime
+    size: int
+    path: Path
+    job_id: Optional[str] = None  # None for uploads
+    pinned: bool = False  # counted against quotas but never removed
+
+class StorageManager:
+    def __init__(self, session_factory=SessionLocal, upload_dir: Optional[Path] = None,
+                 blob_store: Optional[BlobStore] = None):
+        self.session_factory = session_factory
+        self._upload_dir = upload_dir
+        self._blob_store = blob_store
+        self._accessed: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._sweep_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.metrics = {
+            "sweeps": 0, "last_sweep_at": None, "last_sweep_seconds": 0.0,
+            "bytes_reclaimed": 0, "last_bytes_reclaimed": 0,
+            "projects_evicted": 0, "uploads_removed": 0,
+        }
+    
+    @property
+    def upload_dir(self) -> Path:
+        return Path(self._upload_dir or settings.UPLOAD_DIR)
+    
+    def touch(self, job_id: str):
+        """Mark a project as used; cheap enough to call on every request"""
+        with self._lock:
+            self._accessed[job_id] = datetime.utcnow()
+    
+    # --- sweep ---------------------------------------------------------------
+    
+    def sweep(self) -> Dict:
+        with self._sweep_lock:
+            started = time.monotonic()
+            now = datetime.utcnow()
+            reclaimed = evicted = removed = 0
+            
+            with self.session_factory() as db:
+                self._flush_access(db)
+                items = self._project_items(db) + self._upload_items(pinned=self._pending_inputs(db, now))
+                doomed = self._select(items, now)
+                
+                evicted_ids = []
+                for item in doomed:
+                    if item.job_id:
+                        reclaimed += self._evict_project(item.path)
+                        evicted_ids.append(item.job_id)
+                    else:
+                        reclaimed += self._remove_upload(item.path)
+                        removed += 1
+                if evicted_ids:
+                    db.query(GenerationJob).filter(GenerationJob.id.in_(evicted_ids)).update(
+                        {GenerationJob.evicted_at: now}, synchronize_session=False)
+                    db.commit()
+                evicted = len(evicted_ids)
+            
+            reclaimed += (self._blob_store or BlobStore()).gc()
+            
+            self.metrics.update({
+                "sweeps": self.metrics["sweeps"] + 1,
+                "last_sweep_at": now.isoformat(),
+                "last_sweep_seconds": round(time.monotonic() - started, 3),
+                "bytes_reclaimed": self.metrics["bytes_reclaimed"] + reclaimed,
+                "last_bytes_reclaimed": reclaimed,
+                "projects_evicted": self.metrics["projects_evicted"] + evicted,
+                "uploads_removed": self.metrics["uploads_removed"] + removed,
+            })
+            if doomed:
+                print(f"[STORAGE] Evicted {evicted} projects, {removed} uploads, reclaimed {reclaimed / MB:.1f} MB")
+            return dict(self.metrics)
+    
+    def _flush_access(self, db):
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+        if accessed:
+            # Core executemany: ids without a row (deleted jobs, unknown ids) update nothing instead of raising
+            table = GenerationJob.__table__
+            db.connection().execute(
+                update(table).where(table.c.id == bindparam("job_id")).values(last_accessed_at=bindparam("at")),
+                [{"job_id": job_id, "at": at} for job_id, at in accessed.items()])
+            db.commit()
+    
+    def _project_items(self, db, user_id: Optional[str] = None) -> List[StoredItem]:
+        query = (db.query(GenerationJob.id, GenerationJob.output_path, GenerationJob.created_at,
+                          GenerationJob.last_accessed_at, Project.user_id)
+                 .join(Project, GenerationJob.project_id == Project.id)
+                 .filter(GenerationJob.output_path.isnot(None), GenerationJob.evicted_at.is_(None)))
+        if user_id is not None:
+            query = query.filter(Project.user_id == user_id)
+        rows = query.all()
+        items = []
+        for job_id, output_path, created_at, last_accessed_at, user_id in rows:
+            path = Path(output_path)
+            if not path.exists():
+                continue
+            items.append(StoredItem(user_id, last_accessed_at or created_at or datetime.utcnow(),
+                                    self._project_size(path), path, job_id))
+        return items
+    
+    def _pending_inputs(self, db, now: datetime) -> Set[str]:
+        """Absolute paths of the uploads that unfinished jobs will still read"""
+        query = db.query(GenerationJob.input_files).filter(
+            GenerationJob.status.in_([JobStatus.PENDING, JobStatus.PROCESSING]))
+        if settings.STORAGE_PROJECT_TTL_HOURS > 0:
+            # Older unfinished jobs were abandoned; their uploads expire normally
+            query = query.filter(GenerationJob.created_at >= now - timedelta(hours=settings.STORAGE_PROJECT_TTL_HOURS))
+        return {os.path.abspath(path) for (files,) in query for path in files or [] if isinstance(path, str)}
+    
+    def _upload_items(self, user_id: Optional[str] = None, pinned: Set[str] = frozenset()) -> List[StoredItem]:
+        items = []
+        upload_root = self.upload_dir
+        if not upload_root.is_dir():
+            return items
+        user_dirs = [upload_root / user_id] if user_id is not None else upload_root.iterdir()
+        for user_dir in user_dirs:
+            if not user_dir.is_dir():
+                continue
+            for entry in os.scandir(user_dir):
+                if entry.is_file():
+                    stat = entry.stat()
+                    items.append(StoredItem(user_dir.name, datetime.utcfromtimestamp(stat.st_mtime), stat.st_size,
+                                            Path(entry.path), pinned=os.path.abspath(entry.path) in pinned))
+        return items
+    
+    @staticmethod
+    def _select(items: List[StoredItem], now: datetime) -> List[StoredItem]:
+        """TTL first, then LRU per user, then LRU overall; items used within the grace period are kept"""
+        def expired(item: StoredItem) -> bool:
+            hours = settings.STORAGE_PROJECT_TTL_HOURS if item.job_id else settings.STORAGE_UPLOAD_TTL_HOURS
+            return not item.pinned and hours > 0 and item.last_used < now - timedelta(hours=hours)
+        
+        grace = now - timedelta(minutes=settings.STORAGE_EVICTION_GRACE_MINUTES)
+        doomed = {i.path: i for i in items if expired(i)}
+        kept = sorted((i for i in items if i.path not in doomed), key=lambda i: i.last_used)
+        
+        def trim(candidates: List[StoredItem], limit: int):
+            total = sum(i.size for i in candidates)
+            for item in candidates:
+                if total <= limit:
+                    break
+                if item.last_used < grace and not item.pinned:
+                    doomed[item.path] = item
+                    total -= item.size
+        
+        if settings.STORAGE_USER_QUOTA_MB > 0:
+            by_user: Dict[str, List[StoredItem]] = {}
+            for item in kept:
+                by_user.setdefault(item.user_id, []).append(item)
+            for user_items in by_user.values():
+                trim(user_items, settings.STORAGE_USER_QUOTA_MB * MB)
+        if settings.STORAGE_MAX_TOTAL_MB > 0:
+            trim([i for i in kept if i.path not in doomed], settings.STORAGE_MAX_TOTAL_MB * MB)
+        return list(doomed.values())
+    
+    def usage(self, user_id: str) -> Dict:
+        with self.session_factory() as db:
+            items = self._project_items(db, user_id)
+        items += self._upload_items(user_id)
+        used = sum(i.size for i in items)
+        return {"bytes_used": used, "quota_bytes": settings.STORAGE_USER_QUOTA_MB * MB, "items": len(items)}
+    
+    # --- removal -------------------------------------------------------------
+    
+    @staticmethod
+    def _project_size(path: Path) -> int:
+        if path.is_file():
+            return path.stat().st_size
+        size = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    size += os.stat(os.path.join(root, name)).st_size
+                except FileNotFoundError:
+                    pass
+        archive = ProjectArchive(path).path
+        return size + (archive.stat().st_size if archive.exists() else 0)
+    
+    def _evict_project(self, path: Path) -> int:
+        """Remove tree, archive and index; returns the bytes removed"""
+        if path.is_file():
+            return self._remove_upload(path)
+        freed = 0
+        archive = ProjectArchive(path)
+        with archive.lock:
+            if archive.path.exists():
+                freed += archive.path.stat().st_size
+            archive.discard()
+        ProjectIndex(path).forget()
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    freed += os.stat(os.path.join(root, name)).st_size
+                except FileNotFoundError:
+                    pass
+        shutil.rmtree(path, ignore_errors=True)
+        return freed
+    
+    @staticmethod
+    def _remove_upload(path: Path) -> int:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            return size
+        except FileNotFoundError:
+            return 0
+    
+    # --- background task -----------------------------------------------------
+    
+    def start(self):
+        if settings.STORAGE_SWEEP_INTERVAL_SECONDS > 0 and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+    
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                print(f"[STORAGE] Sweep failed: {e}")
+            await asyncio.sleep(settings.STORAGE_SWEEP_INTERVAL_SECONDS)
+
+storage_manager = StorageManager()
@@ -0,0 +1,410 @@
+"""
+Tailwind utility classes compiled ahead of time.
+
+Generated pages used to load the Tailwind Play CDN, which compiles the CSS in
+the browser on every page load. compile_utilities() turns the class names a
+project actually uses into a static stylesheet with Tailwind v3 values
+(preflight included), so nothing is compiled at run time and unused utilities
+are never shipped. Only a subset of Tailwind is covered: is_unknown_utility()
+tells callers which classes would need the CDN after all.
+"""
+import re
+from functools import lru_cache
+from typing import Callable, Iterable, List, Optional, Tuple
+
+PALETTE = {
+    "gray": ["#f9fafb", "#f3f4f6", "#e5e7eb", "#d1d5db", "#9ca3af", "#6b7280", "#4b5563", "#374151", "#1f2937", "#111827"],
+    "slate": ["#f8fafc", "#f1f5f9", "#e2e8f0", "#cbd5e1", "#94a3b8", "#64748b", "#475569", "#334155", "#1e293b", "#0f172a"],
+    "red": ["#fef2f2", "#fee2e2", "#fecaca", "#fca5a5", "#f87171", "#ef4444", "#dc2626", "#b91c1c", "#991b1b", "#7f1d1d"],
+    "orange": ["#fff7ed", "#ffedd5", "#fed7aa", "#fdba74", "#fb923c", "#f97316", "#ea580c", "#c2410c", "#9a3412", "#7c2d12"],
+    "yellow": ["#fefce8", "#fef9c3", "#fef08a", "#fde047", "#facc15", "#eab308", "#ca8a04", "#a16207", "#854d0e", "#713f12"],
+    "green": ["#f0fdf4", "#dcfce7", "#bbf7d0", "#86efac", "#4ade80", "#22c55e", "#16a34a", "#15803d", "#166534", "#14532d"],
+    "emerald": ["#ecfdf5", "#d1fae5", "#a7f3d0", "#6ee7b7", "#34d399", "#10b981", "#059669", "#047857", "#065f46", "#064e3b"],
+    "cyan": ["#ecfeff", "#cffafe", "#a5f3fc", "#67e8f9", "#22d3ee", "#06b6d4", "#0891b2", "#0e7490", "#155e75", "#164e63"],
+    "blue": ["#eff6ff", "#dbeafe", "#bfdbfe", "#93c5fd", "#60a5fa", "#3b82f6", "#2563eb", "#1d4ed8", "#1e40af", "#1e3a8a"],
+    "indigo": ["#eef2ff", "#e0e7ff", "#c7d2fe", "#a5b4fc", "#818cf8", "#6366f1", "#4f46e5", "#4338ca", "#3730a3", "#312e81"],
+    "purple": ["#faf5ff", "#f3e8ff", "#e9d5ff", "#d8b4fe", "#c084fc", "#a855f7", "#9333ea", "#7e22ce", "#6b21a8", "#581c87"],
+    "pink": ["#fdf2f8", "#fce7f3", "#fbcfe8", "#f9a8d4", "#f472b6", "#ec4899", "#db2777", "#be185d", "#9d174d", "#831843"],
+}
+SHADES = ["50", "100", "200", "300", "400", "500", "600", "700", "800", "900"]
+SCREENS = {"sm": 640, "md": 768, "lg": 1024, "xl": 1280, "2xl": 1536}
+PSEUDO_CLASSES = {"hover": ":hover", "focus": ":focus", "focus-within": ":focus-within", "focus-visible": ":focus-visible",
+                  "active": ":active", "visited": ":visited", "disabled": ":disabled", "first": ":first-child",
+                  "last": ":last-child", "odd": ":nth-child(odd)", "even": ":nth-child(even)"}
+FONT_SIZES = {"xs": (".75rem", "1rem"), "sm": (".875rem", "1.25rem"), "base": ("1rem", "1.5rem"),
+              "lg": ("1.125rem", "1.75rem"), "xl": ("1.25rem", "1.75rem"), "2xl": ("1.5rem", "2rem"),
+              "3xl": ("1.875rem", "2.25rem"), "4xl": ("2.25rem", "2.5rem"), "5xl": ("3rem", "1"),
+              "6xl": ("3.75rem", "1"), "7xl": ("4.5rem", "1"), "8xl": ("6rem", "1"), "9xl": ("8rem", "1")}
+FONT_WEIGHTS = {"thin": 100, "extralight": 200, "light": 300, "normal": 400, "medium": 500,
+                "semibold": 600, "bold": 700, "extrabold": 800, "black": 900}
+MAX_WIDTHS = {"xs": "20rem", "sm": "24rem", "md": "28rem", "lg": "32rem", "xl": "36rem", "2xl": "42rem",
+              "3xl": "48rem", "4xl": "56rem", "5xl": "64rem", "6xl": "72rem", "7xl": "80rem",
+              "full": "100%", "none": "none", "prose": "65ch", "min": "min-content", "max": "max-content"}
+RADII = {"none": "0px", "sm": ".125rem", "": ".25rem", "md": ".375rem", "lg": ".5rem", "xl": ".75rem",
+         "2xl": "1rem", "3xl": "1.5rem", "full": "9999px"}
+SHADOWS = {"sm": "0 1px 2px 0 rgb(0 0 0 / .05)",
+           "": "0 1px 3px 0 rgb(0 0 0 / .1), 0 1px 2px -1px rgb(0 0 0 / .1)",
+           "md": "0 4px 6px -1px rgb(0 0 0 / .1), 0 2px 4px -2px rgb(0 0 0 / .1)",
+           "lg": "0 10px 15px -3px rgb(0 0 0 / .1), 0 4px 6px -4px rgb(0 0 0 / .1)",
+           "xl": "0 20px 25px -5px rgb(0 0 0 / .1), 0 8px 10px -6px rgb(0 0 0 / .1)",
+           "2xl": "0 25px 50px -12px rgb(0 0 0 / .25)",
+           "inner": "inset 0 2px 4px 0 rgb(0 0 0 / .05)",
+           "none": "0 0 #0000"}
+BLURS = {"none": "0", "sm": "4px", "": "8px", "md": "12px", "lg": "16px", "xl": "24px", "2xl": "40px", "3xl": "64px"}
+TRANSITIONS = {"": "color, background-color, border-color, text-decoration-color, fill, stroke, opacity, box-shadow, transform, filter, backdrop-filter",
+               "all": "all", "colors": "color, background-color, border-color, text-decoration-color, fill, stroke",
+               "opacity": "opacity", "shadow": "box-shadow", "transform": "transform"}
+GRADIENT_DIRECTIONS = {"t": "top", "tr": "top right", "r": "right", "br": "bottom right",
+                       "b": "bottom", "bl": "bottom left", "l": "left", "tl": "top left"}
+DISPLAYS = {"block": "block", "inline-block": "inline-block", "inline": "inline", "flex": "flex",
+            "inline-flex": "inline-flex", "grid": "grid", "inline-grid": "inline-grid", "table": "table",
+            "table-row": "table-row", "table-cell": "table-cell", "contents": "contents",
+            "flow-root": "flow-root", "list-item": "list-item", "hidden": "none"}
+KEYFRAMES = {
+    "spin": "@keyframes spin { to { transform: rotate(360deg) } }",
+    "ping": "@keyframes ping { 75%, 100% { transform: scale(2); opacity: 0 } }",
+    "pulse": "@keyframes pulse { 50% { opacity: .5 } }",
+    "bounce": "@keyframes bounce { 0%, 100% { transform: translateY(-25%); animation-timing-function: cubic-bezier(.8, 0, 1, 1) } "
+              "50% { transform: none; animation-timing-function: cubic-bezier(0, 0, .2, 1) } }",
+}
+ANIMATIONS = {"none": "none", "spin": "spin 1s linear infinite", "ping": "ping 1s cubic-bezier(0, 0, .2, 1) infinite",
+              "pulse": "pulse 2s cubic-bezier(.4, 0, .6, 1) infinite", "bounce": "bounce 1s infinite"}
+
+TRANSFORM = ("transform: translate(var(--tw-translate-x), var(--tw-translate-y)) rotate(var(--tw-rotate)) "
+             "scaleX(var(--tw-scale-x)) scaleY(var(--tw-scale-y))")
+BOX_SHADOW = "box-shadow: var(--tw-ring-offset-shadow), var(--tw-ring-shadow), var(--tw-shadow)"
+CHILDREN = "{} > :not([hidden]) ~ :not([hidden])"
+
+# Condensed Tailwind v3 preflight, plus the defaults of the variables the utilities compose
+PREFLIGHT = """*, ::before, ::after { box-sizing: border-box; border-width: 0; border-style: solid; border-color: #e5e7eb }
+html { line-height: 1.5; -webkit-text-size-adjust: 100%; tab-size: 4; font-family: ui-sans-serif, system-ui, -apple-system, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif }
+body { margin: 0; line-height: inherit }
+hr { height: 0; color: inherit; border-top-width: 1px }
+h1, h2, h3, h4, h5, h6 { font-size: inherit; font-weight: inherit }
+a { color: inherit; text-decoration: inherit }
+b, strong { font-weight: bolder }
+code, kbd, samp, pre { font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, monospace; font-size: 1em }
+small { font-size: 80% }
+table { text-indent: 0; border-color: inherit; border-collapse: collapse }
+button, input, optgroup, select, textarea { font-family: inherit; font-size: 100%; font-weight: inherit; line-height: inherit; color: inherit; margin: 0; padding: 0 }
+button, select { text-transform: none }
+button, [type=button], [type=reset], [type=submit] { -webkit-appearance: button; background-color: transparent; background-image: none }
+blockquote, dl, dd, h1, h2, h3, h4, h5, h6, hr, figure, p, pre, fieldset { margin: 0 }
+fieldset, legend { padding: 0 }
+ol, ul, menu { list-style: none; margin: 0; padding: 0 }
+textarea { resize: vertical }
+input::placeholder, textarea::placeholder { opacity: 1; color: #9ca3af }
+button, [role=button] { cursor: pointer }
+:disabled { cursor: default }
+img, svg, video, canvas, audio, iframe, embed, object { display: block; vertical-align: middle }
+img, video { max-width: 100%; height: auto }
+[hidden] { display: none }
+*, ::before, ::after { --tw-translate-x: 0; --tw-translate-y: 0; --tw-rotate: 0; --tw-scale-x: 1; --tw-scale-y: 1; --tw-ring-offset-width: 0px; --tw-ring-offset-color: #fff; --tw-ring-color: rgb(59 130 246 / .5); --tw-ring-offset-shadow: 0 0 #0000; --tw-ring-shadow: 0 0 #0000; --tw-shadow: 0 0 #0000; --tw-shadow-colored: 0 0 #0000 }
+"""
+
+# First segment of every utility family compiled below (after variants and a leading "-")
+ROOTS = frozenset("""container static fixed absolute relative sticky inset top right bottom left z col row
+m mx my mt mr mb ml p px py pt pr pb pl block inline flex grid table hidden contents w h min max
+grow shrink basis order items justify self content place gap space divide overflow truncate whitespace
+break rounded border bg from via to text font leading tracking uppercase lowercase capitalize italic
+underline line no placeholder opacity shadow ring outline blur backdrop transition duration ease delay
+transform scale rotate translate animate cursor select pointer visible invisible list object aspect
+sr antialiased appearance resize normal not flow""".split())
+
+RULES: List[Tuple["re.Pattern", Callable, bool]] = []
+
+
+def rule(pattern: str, negative: bool = False):
+    """Registers a utility; registration order is the order of the rules in the stylesheet"""
+    def register(producer):
+        RULES.append((re.compile(pattern + "$"), producer, negative))
+        return producer
+    return register
+
+
+# --- values ------------------------------------------------------------------
+
+def spacing(value: str, negative: bool = False) -> Optional[str]:
+    if value == "px":
+        size = "1px"
+    elif value == "0":
+        size = "0px"
+    elif re.fullmatch(r"\d+(\.5)?", value) and float(value) <= 96:
+        size = f"{float(value) / 4:g}rem"
+    else:
+        return None
+    return f"-{size}" if negative and size != "0px" else size
+
+
+def size(value: str, negative: bool = False, screen: str = "100vw") -> Optional[str]:
+    """Spacing scale, fractions, full/screen/auto"""
+    fraction = re.fullmatch(r"(\d+)/(\d+)", value)
+    if fraction and int(fraction.group(2)):
+        result = f"{int(fraction.group(1)) / int(fraction.group(2)) * 100:g}%"
+    else:
+        result = {"full": "100%", "screen": screen, "auto": "auto", "min": "min-content",
+                  "max": "max-content", "fit": "fit-content"}.get(value)
+    if result is None:
+        return spacing(value, negative)
+    if negative:
+        return None if result == "auto" or not result[0].isdigit() else f"-{result}"
+    return result
+
+
+def channels(name: str) -> Optional[Tuple[int, int, int]]:
+    if name == "white":
+        return 255, 255, 255
+    if name == "black":
+        return 0, 0, 0
+    family, _, shade = name.rpartition("-")
+    if family not in PALETTE or shade not in SHADES:
+        return None
+    value = PALETTE[family][SHADES.index(shade)]
+    return int(value[1:3], 16), int(value[3:5], 16), int(value[5:7], 16)
+
+
+def color(value: str, alpha: Optional[float] = None) -> Optional[str]:
+    """white, black, transparent, current or <family>-<shade>, with an optional /<opacity>"""
+    name, _, opacity = value.partition("/")
+    if name in ("transparent", "current", "inherit") and not opacity:
+        return {"transparent": "transparent", "current": "currentColor", "inherit": "inherit"}[name]
+    rgb = channels(name)
+    if rgb is None or (opacity and not (opacity.isdigit() and int(opacity) <= 100)):
+        return None
+    if opacity:
+        alpha = int(opacity) / 100
+    if alpha is None:
+        return "#{:02x}{:02x}{:02x}".format(*rgb)
+    return f"rgb({rgb[0]} {rgb[1]} {rgb[2]} / {alpha:g})"
+
+
+def escape(name: str) -> str:
+    return re.sub(r"([^A-Za-z0-9_-])", r"\\\1", name)
+
+
+def _sides(properties: Tuple[str, ...], value: Optional[str]) -> Optional[str]:
+    return None if value is None else "; ".join(f"{prop}: {value}" for prop in properties)
+
+
+# --- utilities, in Tailwind's order --------------------------------------------
+
+rule(r"(static|fixed|absolute|relative|sticky)")(lambda m, neg: f"position: {m.group(1)}")
+rule(r"inset-(.+)", negative=True)(lambda m, neg: _sides(("top", "right", "bottom", "left"), size(m.group(1), neg)))
+rule(r"inset-x-(.+)", negative=True)(lambda m, neg: _sides(("left", "right"), size(m.group(1), neg)))
+rule(r"inset-y-(.+)", negative=True)(lambda m, neg: _sides(("top", "bottom"), size(m.group(1), neg)))
+rule(r"(top|right|bottom|left)-(.+)", negative=True)(lambda m, neg: _sides((m.group(1),), size(m.group(2), neg)))
+rule(r"(visible|invisible)")(lambda m, neg: f"visibility: {'hidden' if m.group(1) == 'invisible' else 'visible'}")
+rule(r"z-(0|10|20|30|40|50|auto)")(lambda m, neg: f"z-index: {m.group(1)}")
+rule(r"col-span-(\d+|full)")(lambda m, neg: "grid-column: 1 / -1" if m.group(1) == "full"
+                                             else f"grid-column: span {m.group(1)} / span {m.group(1)}")
+rule(r"m-(.+)", negative=True)(lambda m, neg: _sides(("margin",), size(m.group(1), neg)))
+rule(r"mx-(.+)", negative=True)(lambda m, neg: _sides(("margin-left", "margin-right"), size(m.group(1), neg)))
+rule(r"my-(.+)", negative=True)(lambda m, neg: _sides(("margin-top", "margin-bottom"), size(m.group(1), neg)))
+rule(r"m([trbl])-(.+)", negative=True)(lambda m, neg: _sides(
+    ({"t": "margin-top", "r": "margin-right", "b": "margin-bottom", "l": "margin-left"}[m.group(1)],), size(m.group(2), neg)))
+rule(r"sr-only")(lambda m, neg: "position: absolute; width: 1px; height: 1px; padding: 0; margin: -1px; overflow: hidden; "
+                                "clip: rect(0, 0, 0, 0); white-space: nowrap; border-width: 0")
+rule(r"(" + "|".join(DISPLAYS) + ")")(lambda m, neg: f"display: {DISPLAYS[m.group(1)]}")
+rule(r"aspect-(square|video)")(lambda m, neg: f"aspect-ratio: {'1 / 1' if m.group(1) == 'square' else '16 / 9'}")
+rule(r"h-(.+)")(lambda m, neg: _sides(("height",), size(m.group(1), screen="100vh")))
+rule(r"max-h-(.+)")(lambda m, neg: _sides(("max-height",), size(m.group(1), screen="100vh")))
+rule(r"min-h-(0|full|screen)")(lambda m, neg: f"min-height: {size(m.group(1), screen='100vh')}")
+rule(r"w-(.+)")(lambda m, neg: _sides(("width",), size(m.group(1))))
+rule(r"min-w-(0|full)")(lambda m, neg: f"min-width: {size(m.group(1))}")
+rule(r"max-w-(.+)")(lambda m, neg: _sides(("max-width",), MAX_WIDTHS.get(m.group(1))))
+rule(r"flex-(1|auto|initial|none)")(lambda m, neg: "flex: " + {"1": "1 1 0%", "auto": "1 1 auto",
+                                                               "initial": "0 1 auto", "none": "none"}[m.group(1)])
+rule(r"(?:flex-)?shrink(-0)?")(lambda m, neg: f"flex-shrink: {0 if m.group(1) else 1}")
+rule(r"(?:flex-)?grow(-0)?")(lambda m, neg: f"flex-grow: {0 if m.group(1) else 1}")
+rule(r"translate-(x|y)-(.+)", negative=True)(lambda m, neg: size(m.group(2), neg) and (
+    f"--tw-translate-{m.group(1)}: {size(m.group(2), neg)}; {TRANSFORM}"))
+rule(r"rotate-(0|1|2|3|6|12|45|90|180)", negative=True)(
+    lambda m, neg: f"--tw-rotate: {'-' if neg and m.group(1) != '0' else ''}{m.group(1)}deg; {TRANSFORM}")
+rule(r"scale-(0|50|75|90|95|100|105|110|125|150)")(
+    lambda m, neg: f"--tw-scale-x: {int(m.group(1)) / 100:g}; --tw-scale-y: {int(m.group(1)) / 100:g}; {TRANSFORM}")
+rule(r"scale-(x|y)-(0|50|75|90|95|100|105|110|125|150)")(
+    lambda m, neg: f"--tw-scale-{m.group(1)}: {int(m.group(2)) / 100:g}; {TRANSFORM}")
+rule(r"transform")(lambda m, neg: TRANSFORM)
+rule(r"transform-none")(lambda m, neg: "transform: none")
+rule(r"animate-(" + "|".join(ANIMATIONS) + ")")(lambda m, neg: f"animation: {ANIMATIONS[m.group(1)]}")
+rule(r"cursor-(pointer|default|not-allowed|wait|text|move)")(lambda m, neg: f"cursor: {m.group(1)}")
+rule(r"select-(none|text|all|auto)")(lambda m, neg: f"-webkit-user-select: {m.group(1)}; user-select: {m.group(1)}")
+rule(r"pointer-events-(none|auto)")(lambda m, neg: f"pointer-events: {m.group(1)}")
+rule(r"resize(-none|-y|-x)?")(lambda m, neg: "resize: " + {None: "both", "-none": "none", "-y": "vertical",
+                                                           "-x": "horizontal"}[m.group(1)])
+rule(r"list-(none|disc|decimal)")(lambda m, neg: f"list-style-type: {m.group(1)}")
+rule(r"list-(inside|outside)")(lambda m, neg: f"list-style-position: {m.group(1)}")
+rule(r"appearance-none")(lambda m, neg: "-webkit-appearance: none; appearance: none")
+rule(r"grid-cols-(\d+|none)")(lambda m, neg: "grid-template-columns: " + (
+    "none" if m.group(1) == "none" else f"repeat({m.group(1)}, minmax(0, 1fr))"))
+rule(r"grid-rows-(\d+|none)")(lambda m, neg: "grid-template-rows: " + (
+    "none" if m.group(1) == "none" else f"repeat({m.group(1)}, minmax(0, 1fr))"))
+rule(r"flex-(row|row-reverse|col|col-reverse)")(lambda m, neg: "flex-direction: " + m.group(1).replace("col", "column"))
+rule(r"flex-(wrap|wrap-reverse|nowrap)")(lambda m, neg: f"flex-wrap: {m.group(1)}")
+rule(r"place-items-(start|end|center|stretch)")(lambda m, neg: f"place-items: {m.group(1)}")
+rule(r"content-(center|start|end|between|around)")(lambda m, neg: "align-content: " + {
+    "start": "flex-start", "end": "flex-end", "between": "space-between", "around": "space-around"}.get(m.group(1), m.group(1)))
+rule(r"items-(start|end|center|baseline|stretch)")(lambda m, neg: "align-items: " + {
+    "start": "flex-start", "end": "flex-end"}.get(m.group(1), m.group(1)))
+rule(r"justify-(start|end|center|between|around|evenly)")(lambda m, neg: "justify-content: " + {
+    "start": "flex-start", "end": "flex-end", "between": "space-between", "around": "space-around",
+    "evenly": "space-evenly"}.get(m.group(1), m.group(1)))
+rule(r"self-(auto|start|end|center|stretch)")(lambda m, neg: "align-self: " + {
+    "start": "flex-start", "end": "flex-end"}.get(m.group(1), m.group(1)))
+rule(r"gap-(.+)")(lambda m, neg: _sides(("gap",), spacing(m.group(1))))
+rule(r"gap-x-(.+)")(lambda m, neg: _sides(("column-gap",), spacing(m.group(1))))
+rule(r"gap-y-(.+)")(lambda m, neg: _sides(("row-gap",), spacing(m.group(1))))
+rule(r"space-x-(.+)", negative=True)(lambda m, neg: spacing(m.group(1), neg) and (
+    f"margin-left: {spacing(m.group(1), neg)}", CHILDREN))
+rule(r"space-y-(.+)", negative=True)(lambda m, neg: spacing(m.group(1), neg) and (
+    f"margin-top: {spacing(m.group(1), neg)}", CHILDREN))
+rule(r"divide-(x|y)(-\d+)?")(lambda m, neg: (
+    f"border-{'left' if m.group(1) == 'x' else 'top'}-width: {(m.group(2) or '-1')[1:]}px", CHILDREN))
+rule(r"divide-(.+)")(lambda m, neg: color(m.group(1)) and (f"border-color: {color(m.group(1))}", CHILDREN))
+rule(r"overflow-(auto|hidden|visible|scroll)")(lambda m, neg: f"overflow: {m.group(1)}")
+rule(r"overflow-(x|y)-(auto|hidden|visible|scroll)")(lambda m, neg: f"overflow-{m.group(1)}: {m.group(2)}")
+rule(r"truncate")(lambda m, neg: "overflow: hidden; text-overflow: ellipsis; white-space: nowrap")
+rule(r"whitespace-(normal|nowrap|pre|pre-line|pre-wrap)")(lambda m, neg: f"white-space: {m.group(1)}")
+rule(r"break-(words|all)")(lambda m, neg: "overflow-wrap: break-word" if m.group(1) == "words" else "word-break: break-all")
+rule(r"rounded(?:-(" + "|".join(r for r in RADII if r) + "))?")(lambda m, neg: f"border-radius: {RADII[m.group(1) or '']}")
+rule(r"rounded-([tbrl])(?:-(" + "|".join(r for r in RADII if r) + "))?")(lambda m, neg: "; ".join(
+    f"border-{corner}-radius: {RADII[m.group(2) or '']}" for corner in {
+        "t": ("top-left", "top-right"), "r": ("top-right", "bottom-right"),
+        "b": ("bottom-right", "bottom-left"), "l": ("top-left", "bottom-left")}[m.group(1)]))
+rule(r"border(-0|-2|-4|-8)?")(lambda m, neg: f"border-width: {(m.group(1) or '-1')[1:]}px")
+rule(r"border-([xytrbl])(-0|-2|-4|-8)?")(lambda m, neg: "; ".join(
+    f"border-{side}-width: {(m.group(2) or '-1')[1:]}px" for side in {
+        "x": ("left", "right"), "y": ("top", "bottom"), "t": ("top",), "r": ("right",),
+        "b": ("bottom",), "l": ("left",)}[m.group(1)]))
+rule(r"border-(solid|dashed|dotted|double|none)")(lambda m, neg: f"border-style: {m.group(1)}")
+rule(r"border-(.+)")(lambda m, neg: _sides(("border-color",), color(m.group(1))))
+rule(r"bg-(.+)")(lambda m, neg: _sides(("background-color",), color(m.group(1))))
+rule(r"bg-gradient-to-(t|tr|r|br|b|bl|l|tl)")(
+    lambda m, neg: f"background-image: linear-gradient(to {GRADIENT_DIRECTIONS[m.group(1)]}, var(--tw-gradient-stops))")
+rule(r"bg-none")(lambda m, neg: "background-image: none")
+rule(r"from-(.+)")(lambda m, neg: color(m.group(1)) and (
+    f"--tw-gradient-from: {color(m.group(1))}; --tw-gradient-to: {_transparent(m.group(1))}; "
+    "--tw-gradient-stops: var(--tw-gradient-from), var(--tw-gradient-to)"))
+rule(r"via-(.+)")(lambda m, neg: color(m.group(1)) and (
+    f"--tw-gradient-to: {_transparent(m.group(1))}; "
+    f"--tw-gradient-stops: var(--tw-gradient-from), {color(m.group(1))}, var(--tw-gradient-to)"))
+rule(r"to-(.+)")(lambda m, neg: _sides(("--tw-gradient-to",), color(m.group(1))))
+rule(r"bg-(cover|contain)")(lambda m, neg: f"background-size: {m.group(1)}")
+rule(r"bg-clip-(text|border|padding|content)")(lambda m, neg: "; ".join(
+    f"{prop}: {m.group(1) if m.group(1) == 'text' else m.group(1) + '-box'}"
+    for prop in ("-webkit-background-clip", "background-clip")))
+rule(r"bg-(center|top|bottom)")(lambda m, neg: f"background-position: {m.group(1)}")
+rule(r"bg-no-repeat")(lambda m, neg: "background-repeat: no-repeat")
+rule(r"object-(cover|contain|fill|none)")(lambda m, neg: f"object-fit: {m.group(1)}")
+rule(r"p-(.+)")(lambda m, neg: _sides(("padding",), spacing(m.group(1))))
+rule(r"px-(.+)")(lambda m, neg: _sides(("padding-left", "padding-right"), spacing(m.group(1))))
+rule(r"py-(.+)")(lambda m, neg: _sides(("padding-top", "padding-bottom"), spacing(m.group(1))))
+rule(r"p([trbl])-(.+)")(lambda m, neg: _sides(
+    ({"t": "padding-top", "r": "padding-right", "b": "padding-bottom", "l": "padding-left"}[m.group(1)],), spacing(m.group(2))))
+rule(r"text-(left|center|right|justify)")(lambda m, neg: f"text-align: {m.group(1)}")
+rule(r"font-(sans|serif|mono)")(lambda m, neg: "font-family: " + {
+    "sans": 'ui-sans-serif, system-ui, -apple-system, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif',
+    "serif": "ui-serif, Georgia, Cambria, \"Times New Roman\", Times, serif",
+    "mono": "ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, monospace"}[m.group(1)])
+rule(r"text-(" + "|".join(FONT_SIZES) + ")")(
+    lambda m, neg: f"font-size: {FONT_SIZES[m.group(1)][0]}; line-height: {FONT_SIZES[m.group(1)][1]}")
+rule(r"font-(" + "|".join(FONT_WEIGHTS) + ")")(lambda m, neg: f"font-weight: {FONT_WEIGHTS[m.group(1)]}")
+rule(r"(uppercase|lowercase|capitalize|normal-case)")(
+    lambda m, neg: "text-transform: " + ("none" if m.group(1) == "normal-case" else m.group(1)))
+rule(r"(italic|not-italic)")(lambda m, neg: f"font-style: {'italic' if m.group(1) == 'italic' else 'normal'}")
+rule(r"leading-(none|tight|snug|normal|relaxed|loose|\d+)")(lambda m, neg: _sides(("line-height",), {
+    "none": "1", "tight": "1.25", "snug": "1.375", "normal": "1.5", "relaxed": "1.625", "loose": "2"}.get(
+    m.group(1)) or spacing(m.group(1))))
+rule(r"tracking-(tighter|tight|normal|wide|wider|widest)")(lambda m, neg: "letter-spacing: " + {
+    "tighter": "-.05em", "tight": "-.025em", "normal": "0em", "wide": ".025em", "wider": ".05em", "widest": ".1em"}[m.group(1)])
+rule(r"text-(.+)")(lambda m, neg: _sides(("color",), color(m.group(1))))
+rule(r"(underline|line-through|no-underline)")(
+    lambda m, neg: "text-decoration-line: " + ("none" if m.group(1) == "no-underline" else m.group(1)))
+rule(r"antialiased")(lambda m, neg: "-webkit-font-smoothing: antialiased; -moz-osx-font-smoothing: grayscale")
+rule(r"placeholder-(.+)")(lambda m, neg: color(m.group(1)) and (f"color: {color(m.group(1))}", "{}::placeholder"))
+rule(r"opacity-(\d+)")(lambda m, neg: int(m.group(1)) <= 100 and f"opacity: {int(m.group(1)) / 100:g}" or None)
+rule(r"shadow(?:-(" + "|".join(s for s in SHADOWS if s) + "))?")(lambda m, neg: (
+    f"--tw-shadow: {SHADOWS[m.group(1) or '']}; "
+    f"--tw-shadow-colored: {re.sub(r'rgb[(][^)]*[)]', 'var(--tw-shadow-color)', SHADOWS[m.group(1) or ''])}; {BOX_SHADOW}"))
+rule(r"shadow-(.+)")(lambda m, neg: color(m.group(1)) and (
+    f"--tw-shadow-color: {color(m.group(1))}; --tw-shadow: var(--tw-shadow-colored)"))
+rule(r"outline-none")(lambda m, neg: "outline: 2px solid transparent; outline-offset: 2px")
+rule(r"ring(-0|-1|-2|-4|-8)?")(lambda m, neg: (
+    "--tw-ring-offset-shadow: 0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color); "
+    f"--tw-ring-shadow: 0 0 0 calc({(m.group(1) or '-3')[1:]}px + var(--tw-ring-offset-width)) var(--tw-ring-color); "
+    f"{BOX_SHADOW}"))
+rule(r"ring-offset-(0|1|2|4|8)")(lambda m, neg: f"--tw-ring-offset-width: {m.group(1)}px")
+rule(r"ring-(.+)")(lambda m, neg: _sides(("--tw-ring-color",), color(m.group(1))))
+rule(r"blur(?:-(" + "|".join(b for b in BLURS if b) + "))?")(lambda m, neg: f"filter: blur({BLURS[m.group(1) or '']})")
+rule(r"backdrop-blur(?:-(" + "|".join(b for b in BLURS if b) + "))?")(lambda m, neg: "; ".join(
+    f"{prop}: blur({BLURS[m.group(1) or '']})" for prop in ("-webkit-backdrop-filter", "backdrop-filter")))
+rule(r"transition(?:-(all|colors|opacity|shadow|transform))?")(lambda m, neg: (
+    f"transition-property: {TRANSITIONS[m.group(1) or '']}; "
+    "transition-timing-function: cubic-bezier(.4, 0, .2, 1); transition-duration: 150ms"))
+rule(r"transition-none")(lambda m, neg: "transition-property: none")
+rule(r"delay-(\d+)")(lambda m, neg: f"transition-delay: {m.group(1)}ms")
+rule(r"duration-(\d+)")(lambda m, neg: f"transition-duration: {m.group(1)}ms")
+rule(r"ease-(linear|in|out|in-out)")(lambda m, neg: "transition-timing-function: " + {
+    "linear": "linear", "in": "cubic-bezier(.4, 0, 1, 1)", "out": "cubic-bezier(0, 0, .2, 1)",
+    "in-out": "cubic-bezier(.4, 0, .2, 1)"}[m.group(1)])
+
+
+def _transparent(value: str) -> str:
+    """The color of a gradient stop at 0 opacity, so gradients fade instead of going through gray"""
+    rgb = channels(value.partition("/")[0])
+    return f"rgb({rgb[0]} {rgb[1]} {rgb[2]} / 0)" if rgb else "transparent"
+
+
+CONTAINER = ".container { width: 100% }\n" + "".join(
+    f"@media (min-width: {width}px) {{ .container {{ max-width: {width}px }} }}\n" for width in SCREENS.values())
+
+
+@lru_cache(maxsize=4096)
+def compile_class(name: str) -> Optional[Tuple[tuple, str]]:
+    """(sort key, CSS rule) of a utility class with its variants, or None when it is not supported"""
+    *variants, base = name.split(":")
+    negative = base.startswith("-")
+    utility = base[1:] if negative else base
+    for index, (pattern, producer, negatable) in enumerate(RULES):
+        match = pattern.match(utility)
+        if match and (negatable or not negative):
+            output = producer(match, negative)
+            if output:
+                break
+    else:
+        return None
+    declarations, selector = output if isinstance(output, tuple) else (output, "{}")
+    
+    screen, pseudo, group = 0, "", ""
+    for variant in variants:
+        if variant in SCREENS and not screen:
+            screen = SCREENS[variant]
+        elif variant in PSEUDO_CLASSES:
+            pseudo += PSEUDO_CLASSES[variant]
+        elif variant == "group-hover":
+            group = ".group:hover "
+        else:
+            return None
+    css = f"{group}{selector.format('.' + escape(name) + pseudo)} {{ {declarations} }}"
+    if screen:
+        css = f"@media (min-width: {screen}px) {{ {css} }}"
+    # Tailwind's order: screens ascending, plain utilities before variants, then rule order
+    return (screen, bool(pseudo or group), index, pseudo, name), css
+
+
+def is_unknown_utility(name: str) -> bool:
+    """A Tailwind-looking class (known family prefix) that compile_class() cannot produce"""
+    base = name.split(":")[-1].lstrip("-")
+    return base.split("-")[0] in ROOTS and name != "container" and compile_class(name) is None
+
+
+def compile_utilities(candidates: Iterable[str]) -> str:
+    """Stylesheet for the supported classes among candidates; anything else is ignored"""
+    compiled = sorted(filter(None, (compile_class(name) for name in set(candidates))))
+    animations = {name.split(":")[-1][len("animate-"):] for name in candidates if name.split(":")[-1].startswith("animate-")}
+    parts = [PREFLIGHT]
+    if "container" in candidates:
+        parts.append(CONTAINER)
+    parts += [KEYFRAMES[name] + "\n" for name in sorted(animations) if name in KEYFRAMES]
+    parts += [css + "\n" for _, css in compiled]
+    return "".join(parts)
@@ -0,0 +1,114 @@
+"""
+In-memory project tree used while a project is generated.
+
+Generation phases write into a VirtualTree instead of the project directory.
+Once every phase has finished, flush() writes the whole tree into a staging
+directory next to the project and renames it into place. A crash or a failed
+phase therefore never leaves a half-written project behind. The sizes and
+sha256 hashes recorded in memory feed the file index, and the ZIP is built
+from the same bytes, so nothing is read back from disk.
+"""
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+from .blob_store import BlobStore
+from .zip_stream import StreamingZip, STREAM_CHUNK, is_excluded
+
+class VirtualTree:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._files: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+    
+    def relative(self, path) -> str:
+        path = Path(path)
+        if path.is_absolute():
+            path = path.relative_to(self.root)
+        return path.as_posix()
+    
+    def write(self, path, content):
+        """path: project-relative, or absolute under root"""
+        data = content.encode('utf-8') if isinstance(content, str) else bytes(content)
+        with self._lock:
+            self._files[self.relative(path)] = data
+    
+    def read_text(self, path) -> Optional[str]:
+        with self._lock:
+            data = self._files.get(self.relative(path))
+        return data.decode('utf-8') if data is not None else None
+    
+    def __contains__(self, path) -> bool:
+        return self.relative(path) in self._files
+    
+    def __len__(self) -> int:
+        return len(self._files)
+    
+    def files(self) -> Dict[str, Tuple[int, str]]:
+        """Project-relative path -> (size, sha256)"""
+        with self._lock:
+            items = sorted(self._files.items())
+        return {rel: (len(data), hashlib.sha256(data).hexdigest()) for rel, data in items}
+    
+    # --- disk ----------------------------------------------------------------
+    
+    def flush(self, blobs: Optional[BlobStore] = None) -> Path:
+        """Write everything under a staging dir, then rename it over root"""
+        parent = self.root.parent
+        parent.mkdir(parents=True, exist_ok=True)
+        self._remove_leftovers()
+        staging = parent / f".{self.root.name}.{uuid.uuid4().hex}.staging"
+        try:
+            with self._lock:
+                items = list(self._files.items())
+            for rel, data in items:
+                target = staging / rel
+                if blobs is not None:
+                    blobs.materialize(target, data)
+                else:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_bytes(data)
+            
+            # A directory cannot be renamed over a non-empty one: move the old tree aside first
+            old = None
+            if self.root.exists():
+                old = parent / f".{self.root.name}.{uuid.uuid4().hex}.old"
+                os.rename(self.root, old)
+            os.rename(staging, self.root)
+            if old is not None:
+                shutil.rmtree(old, ignore_errors=True)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return self.root
+    
+    def _remove_leftovers(self):
+        """Staging or superseded trees of this project left by an interrupted flush"""
+        for pattern in (f".{self.root.name}.*.staging", f".{self.root.name}.*.old"):
+            for leftover in self.root.parent.glob(pattern):
+                shutil.rmtree(leftover, ignore_errors=True)
+    
+    # --- archive -------------------------------------------------------------
+    
+    def zip_chunks(self, hashes: Dict[str, Tuple[int, str]], compresslevel: Optional[int] = None) -> Iterator[bytes]:
+        """The flushed project as a ZIP built from memory (entries prefixed with the folder name); only stat()s the files"""
+        writer = StreamingZip(compresslevel)
+        prefix = self.root.name + '/'
+        with self._lock:
+            items = sorted(self._files.items())
+        pending, pending_size = [], 0
+        for rel, data in items:
+            full_path = self.root / rel
+            if is_excluded(full_path):
+                continue
+            stat = full_path.stat()
+            chunk = writer.add_bytes(data, prefix + rel, stat.st_mtime, stat.st_mode, hashes[rel][1])
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= STREAM_CHUNK:
+                yield b''.join(pending)
+                pending, pending_size = [], 0
+        pending.append(writer.finish())
+        yield b''.join(pending)
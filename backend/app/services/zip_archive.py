@@ -0,0 +1,168 @@
+"""
+On-disk project_<id>.zip kept in sync incrementally.
+
+The archive is written at generation time from the in-memory tree (or, when
+missing, as a by-product of a streamed download). After an
+edit, the entries before the old central directory are copied as they are
+into a new file, followed by the changed entries (the only ones compressed
+again) and a new central directory. The new file is renamed over the old
+one, so a download or a resumed Range request still reading the old archive
+keeps its inode and never sees a half-written file. Superseded entries
+become dead space, and the archive is rebuilt once that space outweighs the
+live data.
+"""
+import hashlib
+import os
+import threading
+import uuid
+import zipfile
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+from .project_files import ProjectIndex
+from .zip_stream import StreamingZip, FLAG_DATA_DESCRIPTOR, is_excluded, iter_archive_files, stream_project_zip
+
+class ProjectArchive:
+    _locks = {}
+    _locks_guard = threading.Lock()
+    
+    def __init__(self, project_dir: Path):
+        self.project_dir = Path(project_dir)
+        self.path = Path(f"{self.project_dir}.zip")
+        self.prefix = self.project_dir.name + '/'
+    
+    @property
+    def lock(self) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(str(self.path), threading.Lock())
+    
+    def current(self) -> Optional[Path]:
+        return self.path if self.path.is_file() else None
+    
+    def discard(self):
+        self.path.unlink(missing_ok=True)
+    
+    def _part_path(self) -> Path:
+        return self.path.with_name(f"{self.path.name}.{uuid.uuid4().hex}.part")
+    
+    def stream_and_store(self) -> Iterator[bytes]:
+        """Stream a fresh ZIP and keep a copy, installed only if the whole archive was produced"""
+        yield from self._store(stream_project_zip(self.project_dir))
+    
+    def store(self, chunks: Iterable[bytes]):
+        """Install an archive produced elsewhere (e.g. from a generation's in-memory tree)"""
+        for _ in self._store(chunks):
+            pass
+    
+    def _store(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        part = self._part_path()
+        completed = False
+        sha = hashlib.sha256()
+        try:
+            with open(part, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    sha.update(chunk)
+                    yield chunk
+            with self.lock:
+                os.replace(part, self.path)
+                # The download ETag is this hash; spare the next request a re-read
+                ProjectIndex.remember_digest(self.path, sha.hexdigest())
+            completed = True
+        finally:
+            if not completed:
+                part.unlink(missing_ok=True)
+    
+    def rebuild(self):
+        for _ in self.stream_and_store():
+            pass
+    
+    def update(self, changed_paths: Iterable[str]) -> bool:
+        """Rewrite only the given project-relative paths (added, modified or deleted).
+
+        Returns False when there is no archive yet; the next download builds it.
+        """
+        changed = {p.replace('\\', '/').lstrip('/') for p in changed_paths if p}
+        if not changed or self.current() is None:
+            return False
+        
+        with self.lock:
+            try:
+                with zipfile.ZipFile(self.path) as zf:
+                    entries = {info.filename: info for info in zf.infolist()}
+                    cd_offset = zf.start_dir
+                
+                replaced = {}
+                for rel in sorted(changed):
+                    arcname = self.prefix + rel
+                    entries.pop(arcname, None)
+                    full_path = self.project_dir / rel
+                    if full_path.is_file() and not is_excluded(full_path):
+                        replaced[arcname] = full_path
+                
+                writer = StreamingZip(offset=cd_offset)
+                for info in entries.values():
+                    writer.adopt(info)
+                
+                part = self._part_path()
+                sha = hashlib.sha256()
+                try:
+                    with open(self.path, 'rb') as src, open(part, 'wb') as f:
+                        remaining = cd_offset
+                        while remaining > 0:
+                            chunk = src.read(min(1024 * 1024, remaining))
+                            if not chunk:
+                                raise IOError("archive shorter than its central directory offset")
+                            remaining -= len(chunk)
+                            sha.update(chunk)
+                            f.write(chunk)
+                        for arcname, full_path in replaced.items():
+                            for chunk in writer.add_file(full_path, arcname):
+                                sha.update(chunk)
+                                f.write(chunk)
+                        tail = writer.finish()
+                        sha.update(tail)
+                        f.write(tail)
+                    # Readers holding the old file keep it; new opens get the updated one
+                    os.replace(part, self.path)
+                finally:
+                    part.unlink(missing_ok=True)
+                ProjectIndex.remember_digest(self.path, sha.hexdigest())
+            except Exception as e:
+                print(f"[ARCHIVE] Incremental update failed, dropping archive: {e}")
+                self.discard()
+                return False
+        
+        live = sum(self._record_size(info) for info in entries.values()) + writer.offset - cd_offset
+        if live < writer.offset / 2:
+            print(f"[ARCHIVE] Compacting {self.path.name}")
+            self.rebuild()
+        print(f"[ARCHIVE] Updated {len(changed)} entr{'y' if len(changed) == 1 else 'ies'} in {self.path.name}")
+        return True
+    
+    def sync(self) -> bool:
+        """Find changed files by size and timestamp (no content reads), then update() those"""
+        if self.current() is None:
+            return False
+        with zipfile.ZipFile(self.path) as zf:
+            entries = {info.filename[len(self.prefix):]: info for info in zf.infolist()}
+        
+        changed = set(entries)
+        for file_path in iter_archive_files(self.project_dir):
+            rel = str(file_path.relative_to(self.project_dir)).replace('\\', '/')
+            info = entries.get(rel)
+            if info is not None:
+                changed.discard(rel)
+                if info.file_size == file_path.stat().st_size and self._same_dos_time(info, file_path):
+                    continue
+            changed.add(rel)
+        return self.update(changed)
+    
+    @staticmethod
+    def _same_dos_time(info: zipfile.ZipInfo, file_path: Path) -> bool:
+        """ZIP timestamps have 2-second resolution"""
+        disk = zipfile.ZipInfo.from_file(file_path).date_time
+        return info.date_time[:5] == disk[:5] and info.date_time[5] // 2 == disk[5] // 2
+    
+    @staticmethod
+    def _record_size(info: zipfile.ZipInfo) -> int:
+        return 30 + len(info.filename.encode('utf-8')) + info.compress_size + (16 if info.flag_bits & FLAG_DATA_DESCRIPTOR else 0)
@@ -0,0 +1,225 @@
+"""
+Streaming ZIP writer: the archive is produced chunk by chunk straight into the
+HTTP response, without a temporary file. Compressed entry bodies are cached by
+content hash, so downloading an unchanged project again costs almost no CPU.
+"""
+import os
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+from ..core.config import settings
+from .project_files import ProjectIndex
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+FLAG_DATA_DESCRIPTOR = 0x08
+FLAG_UTF8 = 0x800
+
+# Already-compressed formats: deflating them again only burns CPU
+STORED_SUFFIXES = {'.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.br', '.7z', '.rar',
+                   '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.ico',
+                   '.woff', '.woff2', '.mp3', '.mp4', '.webm', '.pdf',
+                   '.docx', '.xlsx', '.pptx', '.jar', '.whl'}
+# Editor backups and scratch files are never shipped
+EXCLUDED_SUFFIXES = {'.backup', '.bak', '.tmp', '.swp', '.pyc'}
+
+STREAM_CHUNK = 64 * 1024
+
+def is_excluded(path: Path) -> bool:
+    return path.suffix in EXCLUDED_SUFFIXES or path.name.endswith('~')
+
+def _dos_datetime(mtime: float) -> Tuple[int, int]:
+    t = time.localtime(max(mtime, 315532800))  # zip dates start in 1980
+    return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+class EntryCache:
+    """Byte-bounded LRU of compressed entry bodies keyed by (sha256, method, level)"""
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+    
+    def put(self, key, entry: Tuple[int, int, bytes, int]):
+        """entry = (crc32, uncompressed size, body, method)"""
+        body = entry[2]
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                return
+            self._data[key] = entry
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.size -= len(evicted[2])
+    
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {"entries": len(self._data), "bytes": self.size, "hits": self.hits,
+                "misses": self.misses, "hit_rate": round(self.hits / total, 4) if total else 0.0}
+
+entry_cache = EntryCache(settings.ZIP_CACHE_MB * 1024 * 1024)
+
+def compress_entry(data: bytes, method: int, level: int) -> Tuple[int, bytes, int]:
+    """(crc32, body, method); falls back to STORED when deflate does not pay off"""
+    crc = zlib.crc32(data)
+    if method == ZIP_DEFLATED:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        body = compressor.compress(data) + compressor.flush()
+        if len(body) < len(data):
+            return crc, body, ZIP_DEFLATED
+    return crc, data, ZIP_STORED
+
+class StreamingZip:
+    """Writes a ZIP archive as an iterator of byte chunks (no ZIP64: entries and archive stay under 4 GiB)"""
+    
+    def __init__(self, compresslevel: Optional[int] = None, offset: int = 0):
+        self.level = settings.ZIP_COMPRESSION_LEVEL if compresslevel is None else compresslevel
+        self.offset = offset
+        self.central = []
+    
+    def _emit(self, data: bytes) -> bytes:
+        self.offset += len(data)
+        return data
+    
+    def _local_header(self, name: bytes, flags: int, method: int, dostime: int, dosdate: int,
+                      crc: int, csize: int, usize: int) -> bytes:
+        return struct.pack('<IHHHHHIIIHH', 0x04034b50, 20, flags, method, dostime, dosdate,
+                           crc, csize, usize, len(name), 0) + name
+    
+    def _record(self, name: bytes, flags: int, method: int, dostime: int, dosdate: int,
+                crc: int, csize: int, usize: int, mode: int, header_offset: int):
+        # Owner-writable once extracted, even when the project file is a read-only shared blob
+        self._central_entry(name, flags, method, dostime, dosdate, crc, csize, usize,
+                            ((mode | 0o200) & 0xFFFF) << 16, header_offset)
+    
+    def _central_entry(self, name: bytes, flags: int, method: int, dostime: int, dosdate: int,
+                       crc: int, csize: int, usize: int, external_attr: int, header_offset: int):
+        self.central.append(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, (3 << 8) | 20, 20, flags, method,
+                                        dostime, dosdate, crc, csize, usize, len(name), 0, 0, 0, 0,
+                                        external_attr, header_offset) + name)
+    
+    def adopt(self, info: zipfile.ZipInfo):
+        """Keep an entry already written earlier in the file (incremental updates)"""
+        year, month, day, hour, minute, second = info.date_time
+        self._central_entry(info.filename.encode('utf-8'), info.flag_bits | FLAG_UTF8, info.compress_type,
+                            (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day,
+                            info.CRC, info.compress_size, info.file_size, info.external_attr, info.header_offset)
+    
+    def add_file(self, path: Path, arcname: str, digest: Optional[str] = None) -> Iterator[bytes]:
+        stat = path.stat()
+        name = arcname.encode('utf-8')
+        dostime, dosdate = _dos_datetime(stat.st_mtime)
+        method = ZIP_STORED if path.suffix.lower() in STORED_SUFFIXES else ZIP_DEFLATED
+        header_offset = self.offset
+        
+        if stat.st_size > settings.ZIP_CACHE_MAX_ENTRY_KB * 1024:
+            yield from self._add_streamed(path, name, method, dostime, dosdate, stat.st_mode, header_offset)
+            return
+        
+        key = (digest or ProjectIndex.digest(path, stat), method, self.level)
+        cached = entry_cache.get(key)
+        if cached is None:
+            data = path.read_bytes()
+            crc, body, entry_method = compress_entry(data, method, self.level)
+            cached = (crc, len(data), body, entry_method)
+            entry_cache.put(key, cached)
+        crc, usize, body, entry_method = cached
+        
+        flags = FLAG_UTF8
+        yield self._emit(self._local_header(name, flags, entry_method, dostime, dosdate, crc, len(body), usize))
+        yield self._emit(body)
+        self._record(name, flags, entry_method, dostime, dosdate, crc, len(body), usize, stat.st_mode, header_offset)
+    
+    def add_bytes(self, data: bytes, arcname: str, mtime: float, mode: int = 0o100644, digest: Optional[str] = None) -> bytes:
+        """Entry for content already in memory (a freshly generated project)"""
+        name = arcname.encode('utf-8')
+        dostime, dosdate = _dos_datetime(mtime)
+        method = ZIP_STORED if Path(arcname).suffix.lower() in STORED_SUFFIXES else ZIP_DEFLATED
+        header_offset = self.offset
+        
+        key = (digest, method, self.level) if digest else None
+        cached = entry_cache.get(key) if key else None
+        if cached is None:
+            crc, body, entry_method = compress_entry(data, method, self.level)
+            cached = (crc, len(data), body, entry_method)
+            if key:
+                entry_cache.put(key, cached)
+        crc, usize, body, entry_method = cached
+        
+        flags = FLAG_UTF8
+        header = self._emit(self._local_header(name, flags, entry_method, dostime, dosdate, crc, len(body), usize))
+        self._record(name, flags, entry_method, dostime, dosdate, crc, len(body), usize, mode, header_offset)
+        return header + self._emit(body)
+    
+    def _add_streamed(self, path: Path, name: bytes, method: int, dostime: int, dosdate: int,
+                      mode: int, header_offset: int) -> Iterator[bytes]:
+        """Large files: compress while reading; sizes and CRC follow in a data descriptor"""
+        flags = FLAG_UTF8 | FLAG_DATA_DESCRIPTOR
+        yield self._emit(self._local_header(name, flags, method, dostime, dosdate, 0, 0, 0))
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15) if method == ZIP_DEFLATED else None
+        crc = usize = csize = 0
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(STREAM_CHUNK), b''):
+                crc = zlib.crc32(chunk, crc)
+                usize += len(chunk)
+                out = compressor.compress(chunk) if compressor else chunk
+                if out:
+                    csize += len(out)
+                    yield self._emit(out)
+        if compressor:
+            out = compressor.flush()
+            csize += len(out)
+            yield self._emit(out)
+        yield self._emit(struct.pack('<IIII', 0x08074b50, crc, csize, usize))
+        self._record(name, flags, method, dostime, dosdate, crc, csize, usize, mode, header_offset)
+    
+    def finish(self) -> bytes:
+        directory = b''.join(self.central)
+        end = struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, len(self.central), len(self.central),
+                          len(directory), self.offset, 0)
+        return self._emit(directory + end)
+
+def iter_archive_files(project_dir: Path) -> Iterator[Path]:
+    for root, dirs, files in os.walk(project_dir):
+        dirs[:] = sorted(d for d in dirs if d not in ('__pycache__', '.git', 'node_modules'))
+        for file in sorted(files):
+            file_path = Path(root) / file
+            if not is_excluded(file_path):
+                yield file_path
+
+def stream_project_zip(project_dir: Path, compresslevel: Optional[int] = None) -> Iterator[bytes]:
+    """Yield the project as a ZIP, entries prefixed with the project folder name like the old archives"""
+    project_dir = Path(project_dir)
+    writer = StreamingZip(compresslevel)
+    pending = []
+    pending_size = 0
+    for file_path in iter_archive_files(project_dir):
+        arcname = str(file_path.relative_to(project_dir.parent)).replace('\\', '/')
+        for chunk in writer.add_file(file_path, arcname):
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= STREAM_CHUNK:
+                yield b''.join(pending)
+                pending, pending_size = [], 0
+    pending.append(writer.finish())
+    yield b''.join(pending)
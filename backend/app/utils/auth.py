@@ -1,23 +1,72 @@
+import hashlib
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
+from ..core.config import settings
 from ..core.database import get_db
 from ..core.security import decode_access_token
 from ..models.user import User
+from .cache import TTLCache
 
 security = HTTPBearer()
 
+# token digest -> verified payload, user id -> detached User
+token_cache = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+user_cache = TTLCache(maxsize=settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+
+def decode_token_cached(token: str):
+    """Verify a JWT once; recently seen tokens skip signature checks until the cache entry or `exp` runs out"""
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            return payload
+        token_cache.invalidate(key)
+    
+    payload = decode_access_token(token)
+    if payload:
+        token_cache.set(key, payload, ttl=payload.get("exp", 0) - time.time() if "exp" in payload else None)
+    return payload
+
+def invalidate_user(user_id: str):
+    """Drop a user's cached record and every cached token issued for it"""
+    user_cache.invalidate(user_id)
+    token_cache.invalidate_where(lambda _, payload: payload.get("sub") == user_id)
+
+def auth_cache_stats() -> dict:
+    return {"users": user_cache.stats(), "tokens": token_cache.stats()}
+
+@event.listens_for(User, "after_delete")
+def _evict_deleted_user(mapper, connection, target):
+    invalidate_user(target.id)
+
+@event.listens_for(User, "after_update")
+def _evict_updated_user(mapper, connection, target):
+    if inspect(target).attrs.password_hash.history.has_changes():
+        invalidate_user(target.id)
+    else:
+        user_cache.invalidate(target.id)
+
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)) -> User:
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = decode_token_cached(token)
     
     if not payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
     
     user_id = payload.get("sub")
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+    
     user = db.query(User).filter(User.id == user_id).first()
     
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     
+    # Detach so the cached instance outlives this request's session
+    db.expunge(user)
+    user_cache.set(user_id, user)
     return user
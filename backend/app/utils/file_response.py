@@ -0,0 +1,129 @@
+"""
+File downloads with conditional GET and byte ranges.
+
+send_file() answers If-None-Match / If-Modified-Since with 304 and a single
+"bytes=" range with 206 (If-Range guards resumes against a changed artifact).
+The body goes out in chunks read off the event loop: uvicorn offers no ASGI
+zero-copy send extension to hand the file to sendfile().
+"""
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote
+import anyio
+from fastapi import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+from .http_cache import etag_matches
+
+class FileRangeResponse(Response):
+    """Bytes [start, end] of a file"""
+    
+    chunk_size = 64 * 1024
+    
+    def __init__(self, path: Path, start: int, end: int, status_code: int = 200,
+                 headers: Optional[Dict[str, str]] = None, media_type: Optional[str] = None):
+        self.path = path
+        self.start = start
+        self.length = max(end - start + 1, 0)
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+        self.headers["content-length"] = str(self.length)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD" or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        
+        async with await anyio.open_file(self.path, mode="rb") as f:
+            await f.seek(self.start)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await f.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                # File shrank under us; close the body rather than hang the client
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """(start, end) of a single "bytes=" range, (-1, -1) if unsatisfiable, None to ignore it"""
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None  # multipart ranges are not worth it for zips; send the whole file
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                return (-1, -1)
+            return (max(size - suffix, 0), size - 1)
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        return (-1, -1)
+    if start > end:
+        return None
+    return (start, min(end, size - 1))
+
+def _not_modified_since(request: Request, mtime: float) -> bool:
+    header = request.headers.get("if-modified-since")
+    if not header or "if-none-match" in request.headers:
+        return False
+    try:
+        return int(mtime) <= parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+def _if_range_ok(request: Request, etag: str, last_modified: str) -> bool:
+    header = request.headers.get("if-range")
+    if not header:
+        return True
+    header = header.strip()
+    if header.startswith('"') or header.startswith("W/"):
+        return header == etag
+    return header == last_modified
+
+def send_file(request: Request, path: Path, etag: str, filename: Optional[str] = None,
+              media_type: str = "application/octet-stream") -> Response:
+    """200, 206, 304 or 416 for a file on disk, depending on the request's conditional headers"""
+    stat = os.stat(path)
+    size = stat.st_size
+    last_modified = formatdate(stat.st_mtime, usegmt=True)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, no-cache",
+    }
+    
+    if etag_matches(request, etag) or _not_modified_since(request, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+    
+    if filename:
+        quoted = quote(filename)
+        headers["Content-Disposition"] = (f'attachment; filename="{filename}"' if quoted == filename
+                                          else f"attachment; filename*=utf-8''{quoted}")
+    
+    range_header = request.headers.get("range")
+    if range_header and request.method in ("GET", "HEAD") and _if_range_ok(request, etag, last_modified):
+        byte_range = parse_range(range_header, size)
+        if byte_range == (-1, -1):
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            return FileRangeResponse(path, start, end, 206, headers, media_type)
+    
+    return FileRangeResponse(path, 0, size - 1, 200, headers, media_type)
@@ -0,0 +1,33 @@
+import hashlib
+from typing import Iterable
+from fastapi import Request
+
+def strong_etag(digest: str) -> str:
+    return f'"{digest}"'
+
+def combined_etag(parts: Iterable[str]) -> str:
+    sha = hashlib.sha256()
+    for part in parts:
+        sha.update(part.encode("utf-8"))
+        sha.update(b"\0")
+    return strong_etag(sha.hexdigest())
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check; ignores the -gzip/-br suffix CompressionMiddleware adds to encoded variants"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    bare = etag.strip('"')
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        candidate = candidate.strip('"')
+        for suffix in ("-gzip", "-br"):
+            if candidate.endswith(suffix):
+                candidate = candidate[:-len(suffix)]
+        if candidate == bare:
+            return True
+    return False
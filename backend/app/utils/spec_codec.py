@@ -0,0 +1,50 @@
+import gzip
+import hashlib
+import json
+from typing import Dict, Tuple
+from ..core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # gzip fallback when zstandard is not installed
+    zstandard = None
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+
+def spec_hash(spec: Dict) -> str:
+    """Stable content hash: key order does not change it"""
+    canonical = json.dumps(spec, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def compress_spec(spec: Dict) -> bytes:
+    raw = json.dumps(spec, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if settings.SPEC_COMPRESSION == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=settings.SPEC_COMPRESSION_LEVEL).compress(raw)
+    return gzip.compress(raw, compresslevel=min(settings.SPEC_COMPRESSION_LEVEL, 9))
+
+def decompress_spec(blob: bytes) -> Dict:
+    """Format is detected from the magic bytes, so rows written with either codec stay readable"""
+    if blob.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("Spec is zstd-compressed but zstandard is not installed")
+        raw = zstandard.ZstdDecompressor().decompress(blob)
+    elif blob.startswith(GZIP_MAGIC):
+        raw = gzip.decompress(blob)
+    else:
+        raw = blob
+    return json.loads(raw.decode("utf-8"))
+
+def summarize_spec(spec: Dict) -> Dict:
+    app_config = spec.get("appConfig", {})
+    return {
+        "app_name": app_config.get("name", "Unknown"),
+        "app_description": app_config.get("description", ""),
+        "entity_count": len(spec.get("database", {}).get("entities", [])),
+        "endpoint_count": len(spec.get("api", {}).get("endpoints", [])),
+        "page_count": len(spec.get("ui", {}).get("pages", [])),
+    }
+
+def encode_spec(spec: Dict) -> Tuple[bytes, str, Dict]:
+    """Compressed body, content hash and summary fields, all computed once at save time"""
+    return compress_spec(spec), spec_hash(spec), summarize_spec(spec)
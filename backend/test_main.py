@@ -1,4 +1,5 @@
 import pytest
+from pathlib import Path
 from fastapi.testclient import TestClient
 from app.main import app
 
@@ -30,3 +31,650 @@ def test_login():
     })
     assert response.status_code == 200
     assert "access_token" in response.json()
+
+def test_sqlite_engine_pragmas_pool_and_migrations(tmp_path, monkeypatch):
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import create_engine, event, inspect, text
+    from app.core import database
+    from app.core.config import settings
+    assert database._engine_kwargs("sqlite://") == {"connect_args": {"check_same_thread": False}}
+    assert database._engine_kwargs("postgresql://db/app")["pool_pre_ping"] is True
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    kwargs = database._engine_kwargs(url)
+    assert (kwargs["pool_size"], kwargs["max_overflow"]) == (settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+    engine = create_engine(url, **kwargs)
+    event.listen(engine, "connect", database._set_sqlite_pragmas)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+    
+    # A database created by create_all() before migrations existed: baseline tables, no alembic_version
+    config = Config(str(database.MIGRATIONS_DIR.parent / "alembic.ini"))
+    config.set_main_option("script_location", str(database.MIGRATIONS_DIR))
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.upgrade(config, "0001")
+        conn.execute(text("DROP TABLE alembic_version"))
+    monkeypatch.setattr(database, "engine", engine)
+    database.migrate()
+    inspector = inspect(engine)
+    assert {"spec_blob", "evicted_at"} <= {c["name"] for c in inspector.get_columns("generation_jobs")}
+    assert "ix_projects_user_created" in {i["name"] for i in inspector.get_indexes("projects")}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT version_num FROM alembic_version")).scalar() == "0002"
+
+def test_list_projects_keyset_pagination():
+    client.post("/api/v1/auth/register", json={
+        "email": "pager@example.com",
+        "password": "testpass123"
+    })
+    token = client.post("/api/v1/auth/login", json={
+        "email": "pager@example.com",
+        "password": "testpass123"
+    }).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for i in range(3):
+        client.post("/api/v1/projects", json={"name": f"p{i}"}, headers=headers)
+    
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/projects", params=params, headers=headers)
+        assert response.status_code == 200
+        seen += [p["id"] for p in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) >= 3
+
+def test_list_jobs_is_limited_to_own_projects():
+    tokens = {}
+    for email in ("owner@example.com", "other@example.com"):
+        client.post("/api/v1/auth/register", json={"email": email, "password": "testpass123"})
+        tokens[email] = {"Authorization": "Bearer " + client.post("/api/v1/auth/login", json={
+            "email": email, "password": "testpass123"}).json()["access_token"]}
+    owner, other = tokens["owner@example.com"], tokens["other@example.com"]
+    project_id = client.post("/api/v1/projects", json={"name": "jobs"}, headers=owner).json()["id"]
+    job_ids = [client.post("/api/v1/generation/job", json={"project_id": project_id}, headers=owner).json()["id"] for _ in range(3)]
+    
+    first = client.get("/api/v1/generation/jobs", params={"project_id": project_id, "limit": 2}, headers=owner)
+    rest = client.get("/api/v1/generation/jobs", headers=owner,
+                      params={"project_id": project_id, "limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+    assert [j["id"] for j in first.json() + rest.json()] == job_ids[::-1]
+    assert client.get("/api/v1/generation/jobs", params={"project_id": project_id}, headers=other).status_code == 404
+    assert not set(job_ids) & {j["id"] for j in client.get("/api/v1/generation/jobs", headers=other).json()}
+
+def test_spec_preview_uses_summary():
+    client.post("/api/v1/auth/register", json={
+        "email": "spec@example.com",
+        "password": "testpass123"
+    })
+    token = client.post("/api/v1/auth/login", json={
+        "email": "spec@example.com",
+        "password": "testpass123"
+    }).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    project_id = client.post("/api/v1/projects", json={"name": "spec"}, headers=headers).json()["id"]
+    job_id = client.post("/api/v1/generation/job", json={"project_id": project_id}, headers=headers).json()["id"]
+    spec = {
+        "appConfig": {"name": "Shop", "description": "demo"},
+        "database": {"entities": [{"name": "Product", "columns": []}]},
+        "api": {"endpoints": [{"method": "GET", "path": "/products"}, {"method": "POST", "path": "/products"}]},
+        "ui": {"pages": []}
+    }
+    client.post(f"/api/v1/generation/job/{job_id}/save-spec", json=spec, headers=headers)
+    
+    preview = client.get(f"/api/v1/generation/job/{job_id}/preview", headers=headers).json()
+    assert (preview["appName"], preview["entities"], preview["endpoints"], preview["pages"]) == ("Shop", 1, 2, 0)
+    assert "fullSpec" not in preview
+    full = client.get(f"/api/v1/generation/job/{job_id}/preview?full=true", headers=headers).json()
+    assert full["fullSpec"] == spec
+
+def test_current_user_is_cached():
+    client.post("/api/v1/auth/register", json={
+        "email": "cache@example.com",
+        "password": "testpass123"
+    })
+    token = client.post("/api/v1/auth/login", json={
+        "email": "cache@example.com",
+        "password": "testpass123"
+    }).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    before = client.get("/api/v1/auth/cache-stats", headers=headers).json()["users"]["hits"]
+    client.get("/api/v1/projects", headers=headers)
+    after = client.get("/api/v1/auth/cache-stats", headers=headers).json()["users"]["hits"]
+    assert after >= before + 2
+
+def test_manifest_and_file_are_cached_and_compressed(tmp_path, monkeypatch):
+    from app.core.config import settings
+    client.post("/api/v1/auth/register", json={"email": "files@example.com", "password": "testpass123"})
+    headers = {"Authorization": "Bearer " + client.post("/api/v1/auth/login", json={
+        "email": "files@example.com", "password": "testpass123"}).json()["access_token"]}
+    project_id = client.post("/api/v1/projects", json={"name": "files"}, headers=headers).json()["id"]
+    job_id = client.post("/api/v1/generation/job", json={"project_id": project_id}, headers=headers).json()["id"]
+    monkeypatch.setattr(settings, "GENERATED_DIR", str(tmp_path))
+    (tmp_path / f"project_{job_id}" / "backend").mkdir(parents=True)
+    (tmp_path / f"project_{job_id}" / "backend" / "main.py").write_text("print('hello')\n" * 200)
+    (tmp_path / f"project_{job_id}" / "README.md").write_text("# tiny\n")
+    
+    from app.services.storage_manager import storage_manager
+    for missing in ("manifest", "files", "file?file_path=README.md"):
+        assert client.get(f"/api/v1/generation/job/not-a-job/{missing}", headers=headers).status_code == 404
+    assert "not-a-job" not in storage_manager._accessed
+    
+    manifest = client.get(f"/api/v1/generation/job/{job_id}/manifest", headers=headers)
+    assert manifest.status_code == 200 and manifest.json()["total"] == 2
+    assert {f["path"] for f in manifest.json()["files"]} == {"README.md", "backend/main.py"}
+    assert client.get(f"/api/v1/generation/job/{job_id}/manifest", headers={
+        **headers, "If-None-Match": manifest.headers["etag"]}).status_code == 304
+    
+    url = f"/api/v1/generation/job/{job_id}/file"
+    big = client.get(url, params={"file_path": "backend/main.py"}, headers={**headers, "Accept-Encoding": "gzip;q=1, br;q=0"})
+    assert big.headers["content-encoding"] == "gzip" and big.headers["etag"].endswith('-gzip"')
+    assert big.json()["content"].startswith("print('hello')")
+    assert client.get(url, params={"file_path": "backend/main.py"}, headers={
+        **headers, "If-None-Match": big.headers["etag"]}).status_code == 304
+    plain = client.get(url, params={"file_path": "backend/main.py"}, headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and plain.json() == big.json()
+    small = client.get(url, params={"file_path": "README.md"}, headers={**headers, "Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers and small.json() == {"content": "# tiny\n"}
+    assert client.get(url, params={"file_path": "../secret"}, headers=headers).status_code == 404
+
+def test_compression_negotiation_and_non_body_messages():
+    import asyncio
+    from app.core.compression import CompressionMiddleware, negotiate_encoding
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert negotiate_encoding("brotli, gzip;q=0") is None  # "br" is not a substring match
+    assert negotiate_encoding("*;q=0.3, br;q=0") == "gzip"
+    assert negotiate_encoding("identity") is None
+    
+    async def file_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/zip")]})
+        await send({"type": "http.response.pathsend", "path": "/tmp/x.zip"})
+    
+    sent = []
+    
+    async def collect(message):
+        sent.append(message["type"])
+    
+    scope = {"type": "http", "method": "GET", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(CompressionMiddleware(file_app)(scope, None, collect))
+    assert sent == ["http.response.start", "http.response.pathsend"]
+
+def test_download_supports_range_and_etag(tmp_path):
+    from app.core.database import SessionLocal
+    from app.models.generation_job import GenerationJob
+    client.post("/api/v1/auth/register", json={
+        "email": "download@example.com",
+        "password": "testpass123"
+    })
+    token = client.post("/api/v1/auth/login", json={
+        "email": "download@example.com",
+        "password": "testpass123"
+    }).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    project_id = client.post("/api/v1/projects", json={"name": "dl"}, headers=headers).json()["id"]
+    job_id = client.post("/api/v1/generation/job", json={"project_id": project_id}, headers=headers).json()["id"]
+    project_dir = tmp_path / f"project_{job_id}"
+    project_dir.mkdir()
+    (project_dir / "main.py").write_text("print('hello')\n" * 200)
+    with SessionLocal() as db:
+        db.get(GenerationJob, job_id).output_path = str(project_dir)
+        db.commit()
+    
+    url = f"/api/v1/generation/download/{job_id}"
+    full = client.get(url, headers=headers).content  # first download streams and stores the archive
+    response = client.get(url, headers=headers)
+    assert response.content == full and response.headers["accept-ranges"] == "bytes"
+    etag = response.headers["etag"]
+    
+    partial = client.get(url, headers={**headers, "Range": "bytes=10-", "If-Range": etag})
+    assert partial.status_code == 206 and partial.content == full[10:]
+    assert partial.headers["content-range"] == f"bytes 10-{len(full) - 1}/{len(full)}"
+    assert client.get(url, headers={**headers, "If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={**headers, "Range": f"bytes={len(full)}-"}).status_code == 416
+
+def test_archive_update_leaves_open_downloads_intact(tmp_path):
+    import hashlib, io, zipfile
+    from app.services.project_files import ProjectIndex
+    from app.services.zip_archive import ProjectArchive
+    project = tmp_path / "project_upd"
+    project.mkdir()
+    (project / "a.py").write_text("a = 1\n" * 500)
+    (project / "b.py").write_text("b = 2\n")
+    archive = ProjectArchive(project)
+    archive.rebuild()
+    old = archive.path.read_bytes()
+    
+    with open(archive.path, "rb") as download:  # a download in flight
+        head = download.read(100)
+        (project / "b.py").write_text("b = 3\n" * 50)
+        (project / "c.py").write_text("c = 4\n")
+        assert archive.update(["b.py", "c.py"])
+        assert head + download.read() == old
+    with zipfile.ZipFile(io.BytesIO(old)) as zf:
+        assert zf.testzip() is None and zf.read("project_upd/b.py") == b"b = 2\n"
+    with zipfile.ZipFile(archive.path) as zf:
+        assert zf.testzip() is None and zf.read("project_upd/b.py") == b"b = 3\n" * 50
+        assert sorted(zf.namelist()) == ["project_upd/a.py", "project_upd/b.py", "project_upd/c.py"]
+    assert ProjectIndex.digest(archive.path) == hashlib.sha256(archive.path.read_bytes()).hexdigest()
+    assert not list(tmp_path.glob("*.part"))
+
+def test_file_index_cache_is_lru_and_bounded(tmp_path, monkeypatch):
+    import os
+    from collections import OrderedDict
+    from app.core.config import settings
+    from app.services.project_files import ProjectIndex
+    monkeypatch.setattr(ProjectIndex, "_instances", OrderedDict())
+    monkeypatch.setattr(ProjectIndex, "_digests", {})
+    monkeypatch.setattr(settings, "FILE_INDEX_MAX_PROJECTS", 2)
+    for name in "abc":
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "main.py").write_text(f"# {name}\n")
+    
+    assert not ProjectIndex.load(tmp_path / "missing").exists() and not ProjectIndex._instances
+    a = ProjectIndex.load(tmp_path / "a")
+    ProjectIndex.load(tmp_path / "b")
+    assert ProjectIndex.load(tmp_path / "a") is a  # a hit makes "a" the most recently used
+    ProjectIndex.load(tmp_path / "c")
+    assert list(ProjectIndex._instances) == [os.path.abspath(tmp_path / n) for n in "ac"]
+    assert set(ProjectIndex._digests) == set(ProjectIndex._instances)  # "b"'s digests left with its index
+    assert os.path.abspath(tmp_path / "a" / "main.py") in ProjectIndex._digests[os.path.abspath(tmp_path / "a")]
+    a.forget()
+    assert os.path.abspath(tmp_path / "a") not in ProjectIndex._digests
+
+def test_blob_store_never_leaks_writes_between_projects(tmp_path):
+    import os, stat
+    from app.services.blob_store import BlobStore
+    from app.services.project_files import ProjectIndex
+    store = BlobStore(tmp_path / ".blobs")
+    assert store.mode in ("reflink", "hardlink") and not list((tmp_path / ".blobs").iterdir())  # the probe cleans up
+    a = store.materialize(tmp_path / "a" / "Dockerfile", "FROM python:3.11-slim\n")
+    b = store.materialize(tmp_path / "b" / "Dockerfile", "FROM python:3.11-slim\n")
+    blob = next(p for p in (tmp_path / ".blobs").rglob("*") if p.is_file())
+    if store.mode == "hardlink":
+        assert a.stat().st_ino == b.stat().st_ino == blob.stat().st_ino
+        assert not a.stat().st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+    else:
+        with open(a, "r+") as f:  # e.g. the preview app or an editor writing in place
+            f.write("FROM python:3.12")
+    ProjectIndex(tmp_path / "a").write_text("Dockerfile", "FROM python:3.12-slim\n")  # auto-fix, improve
+    assert b.read_text() == blob.read_text() == "FROM python:3.11-slim\n"
+    
+    store.gc(max_idle_hours=0)
+    assert blob.exists() == (store.mode == "hardlink")  # still linked from "b"
+    b.unlink()
+    store.gc(max_idle_hours=0)
+    assert not blob.exists()
+    
+    copies = BlobStore(tmp_path / ".copies")
+    BlobStore._modes[str(copies.root)] = "copy"
+    c = copies.materialize(tmp_path / "c" / "Dockerfile", "FROM python:3.11-slim\n")
+    assert c.stat().st_nlink == 1 and not list((tmp_path / ".copies").iterdir())
+
+def test_storage_sweep_evicts_stale_project(tmp_path, monkeypatch):
+    import os
+    from datetime import datetime, timedelta
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.core.config import settings
+    from app.core.database import Base
+    from app.models import GenerationJob, JobStatus, Project, User
+    from app.services.blob_store import BlobStore
+    from app.services.storage_manager import StorageManager
+    # Nothing outside tmp_path: own database, upload dir and generated dir
+    monkeypatch.setattr(settings, "GENERATED_DIR", str(tmp_path / "generated"))
+    monkeypatch.setattr(settings, "STORAGE_PROJECT_TTL_HOURS", 72)
+    monkeypatch.setattr(settings, "STORAGE_UPLOAD_TTL_HOURS", 24)
+    engine = create_engine(f"sqlite:///{tmp_path / 'storage.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    manager = StorageManager(Session, upload_dir=tmp_path / "uploads", blob_store=BlobStore(tmp_path / ".blobs"))
+    
+    project_dir = tmp_path / "generated" / "project_old"
+    project_dir.mkdir(parents=True)
+    (project_dir / "main.py").write_text("x = 1\n" * 1000)
+    (tmp_path / "uploads" / "u1").mkdir(parents=True)
+    stale, pending = tmp_path / "uploads" / "u1" / "stale.pdf", tmp_path / "uploads" / "u1" / "pending.pdf"
+    for upload in (stale, pending):
+        upload.write_bytes(b"%PDF" * 100)
+        os.utime(upload, (0, 0))
+    with Session() as db:
+        db.add(User(id="u1", email="storage@example.com", password_hash="x"))
+        db.add(Project(id="p1", name="old", user_id="u1"))
+        old = GenerationJob(id="old", project_id="p1", status=JobStatus.COMPLETED, output_path=str(project_dir),
+                            last_accessed_at=datetime.utcnow() - timedelta(days=30))
+        old.set_spec({"appConfig": {"name": "Old"}})
+        db.add(old)
+        db.add(GenerationJob(id="new", project_id="p1", status=JobStatus.PENDING, input_files=[str(pending)]))
+        db.commit()
+    
+    assert manager.usage("u1")["items"] == 3 and manager.usage("someone-else")["items"] == 0
+    # An id without a row (unknown, or deleted with its project) must not abort the sweep
+    manager.touch("nonexistent")
+    manager.touch("new")
+    metrics = manager.sweep()
+    assert not project_dir.exists() and metrics["last_bytes_reclaimed"] >= 6000
+    assert not stale.exists() and pending.exists()
+    with Session() as db:
+        job = db.get(GenerationJob, "old")
+        assert job.evicted_at is not None and job.get_spec() == {"appConfig": {"name": "Old"}}
+        assert db.get(GenerationJob, "new").last_accessed_at is not None
+
+def test_phases_run_after_their_inputs():
+    import threading
+    from app.services.phase_graph import Phase, run_phases
+    barrier = threading.Barrier(2, timeout=5)  # both independent phases must be running at once
+    results, timings = run_phases([
+        Phase("a", lambda: (barrier.wait(), "a")[1]),
+        Phase("b", lambda: (barrier.wait(), "b")[1]),
+        Phase("c", lambda a, b: a + b, requires=("a", "b")),
+    ])
+    assert results["c"] == "ab" and set(timings) == {"a", "b", "c"}
+
+def test_scaffold_generates_runnable_crud(tmp_path):
+    from app.services.code_generator import CodeGenerator
+    spec = {
+        "appConfig": {"name": "Shop"},
+        "database": {"entities": [{"name": "Product", "columns": [
+            {"name": "name", "type": "string", "required": True}, {"name": "class", "type": "float"}]}]},
+        "api": {"endpoints": [{"method": "GET", "path": "/api/v1/products"}, {"method": "POST", "path": "/api/v1/checkout"}]},
+        "ui": {"pages": [{"route": "/", "title": "Home", "components": ["Product list"]}]}
+    }
+    project = tmp_path / CodeGenerator(str(tmp_path)).generate_project(spec, "project_scaffold")
+    for path in list((project / "backend").rglob("*.py")) + [project / "frontend" / "app.py"]:
+        compile(path.read_text(encoding="utf-8"), str(path), "exec")
+    assert 'prefix="/api/v1/products"' in (project / "backend" / "routers" / "product.py").read_text()
+    assert "status_code=501" in (project / "backend" / "routers" / "custom_endpoints.py").read_text()
+
+def test_artifact_templates_render_linearly():
+    from app.services.artifact_templates import artifact_templates
+    assert artifact_templates.precompile() >= 15
+    endpoints = [{"method": "GET", "path": f"/api/v1/r{i}", "description": f"Endpoint {i}"} for i in range(2000)]
+    readme = artifact_templates.render("project/README.md.j2", app_name="Big", description="", entities=[],
+                                       endpoints=endpoints, pages=[])
+    assert "- `GET /api/v1/r1999` - Endpoint 1999" in readme
+    page = artifact_templates.render("project/frontend/page.html.j2", app={}, title="T",
+                                     components=["<script>x</script> list"], colors={"primary": "#000"})
+    assert "&lt;script&gt;x&lt;/script&gt; list" in page
+    timings = artifact_templates.benchmark({"deploy/k8s-deployment.yaml.j2": {"app_name": "a"},
+                                            "project/render.yaml.j2": {"app_name": "a"}}, runs=20)
+    assert set(timings) == {"deploy/k8s-deployment.yaml.j2", "project/render.yaml.j2"}
+    assert artifact_templates.stats()["project/README.md.j2"]["renders"] >= 1
+
+def test_endpoint_code_is_validated_and_sent_back():
+    from types import SimpleNamespace
+    from app.services.code_generator import CodeGenerator
+    from app.services.code_validator import CodeValidator
+    from app.services.scaffold import CrudScaffold
+    spec = {"database": {"entities": [{"name": "Order", "columns": [{"name": "total", "type": "float"}]}]},
+            "api": {"endpoints": [{"method": "POST", "path": "/api/v1/orders/{order_id}/cancel"}]}}
+    scaffold = CrudScaffold(spec)
+    replies = iter([
+        '@router.post("/api/v1/orders/{order_id}/cancel")\ndef cancel(db: Session = Depends(get_db)):\n    return {}',
+        '@router.post("/api/v1/orders/{order_id}/cancel")\ndef cancel(order_id: int, db: Session = Depends(get_db)):\n    return {}',
+    ])
+    prompts = []
+    def create(model, messages):
+        prompts.append(messages[-1]["content"])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=next(replies)))])
+    generator = CodeGenerator("/tmp")
+    generator.ai_service.code_model = "test-model"
+    generator.ai_service.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    code, calls = generator._implement_endpoint(scaffold.custom_endpoints[0], scaffold, CodeValidator(scaffold.backend_files()))
+    assert "order_id: int" in code and calls == 2
+    assert "lacks path parameter(s) order_id" in prompts[1]
+
+def test_snippet_cache_reuses_endpoint_code_across_entities(tmp_path):
+    from types import SimpleNamespace
+    from app.services.code_generator import CodeGenerator
+    from app.services.scaffold import CrudScaffold
+    calls = []
+    def create(model, messages):
+        calls.append(model)
+        code = ('@router.post("/api/v1/orders/{order_id}/cancel")\n'
+                'def cancel_order(order_id: int, db: Session = Depends(get_db)):\n'
+                '    order = db.get(models.Order, order_id)\n'
+                '    order.status = "cancelled"\n'
+                '    return {"id": order.id}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=code))])
+    generator = CodeGenerator(str(tmp_path))
+    generator.ai_service.code_model = "test-model"
+    generator.ai_service.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    def spec(name, path):
+        return {"database": {"entities": [{"name": name, "columns": [{"name": "status", "type": "string"}]}]},
+                "api": {"endpoints": [{"method": "POST", "path": path, "description": f"Cancel a {name.lower()}"}]}}
+    
+    generator._generate_backend(tmp_path / "a", CrudScaffold(spec("Order", "/api/v1/orders/{order_id}/cancel")), True)
+    assert len(calls) == 1 and generator.snippet_stats["hits"] == 0
+    generator._generate_backend(tmp_path / "b", CrudScaffold(spec("Course", "/courses/{id}/cancel")), True)
+    assert len(calls) == 1 and generator.snippet_stats == {"lookups": 1, "hits": 1, "hit_rate": 1.0, "saved_calls": 1}
+    code = generator.tree.read_text(tmp_path / "b" / "backend" / "routers" / "custom_endpoints.py")
+    assert '@router.post("/courses/{id}/cancel")' in code and "db.get(models.Course, id)" in code
+
+def test_generation_flushes_tree_once_with_index_and_zip(tmp_path):
+    import hashlib, json, zipfile
+    from app.services.code_generator import CodeGenerator
+    spec = {"database": {"entities": [{"name": "Note", "columns": [{"name": "body", "type": "text"}]}]}}
+    generator = CodeGenerator(str(tmp_path))
+    (tmp_path / "project_vt").mkdir()
+    (tmp_path / "project_vt" / "stale.txt").write_text("old")
+    (tmp_path / ".project_vt.dead.staging").mkdir()
+    project = Path(generator.generate_project(spec, "project_vt"))
+    assert not (project / "stale.txt").exists()
+    assert sorted(p.name for p in tmp_path.iterdir() if p.name.startswith(".project_vt")) == []
+    entries = {e["path"]: e for e in json.loads(Path(f"{project}.index.json").read_text())["files"]}
+    readme = (project / "README.md").read_bytes()
+    assert entries["README.md"]["hash"] == hashlib.sha256(readme).hexdigest()
+    with zipfile.ZipFile(f"{project}.zip") as archive:
+        assert archive.testzip() is None
+        assert archive.read("project_vt/README.md") == readme
+        assert len(archive.namelist()) == len(entries)
+
+def test_scaffold_models_have_indexes_and_lazy_relationships(tmp_path):
+    import subprocess, sys
+    from app.services.scaffold import CrudScaffold
+    spec = {"database": {"entities": [
+        {"name": "User", "columns": [{"name": "email", "type": "string", "unique": True}],
+         "relationships": [{"type": "one-to-many", "target": "Order"}]},
+        {"name": "Order", "columns": [{"name": "status", "type": "string"}], "indexes": ["status"],
+         "relationships": [{"type": "many-to-one", "target": "User"}, {"type": "many-to-many", "target": "Product"}]},
+        {"name": "Product", "columns": [{"name": "name", "type": "string"}]},
+    ]}}
+    for name, source in CrudScaffold(spec).backend_files().items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(source)
+    probe = (
+        "import models\n"
+        "from sqlalchemy.orm import configure_mappers\n"
+        "configure_mappers()\n"
+        "print(sorted(i.name for i in models.Order.__table__.indexes))\n"
+        "print(models.Order.user.property.lazy, models.User.orders.property.lazy, models.Order.products.property.lazy)\n"
+        "from sqlalchemy import event\n"
+        "from database import Base, SessionLocal, engine\n"
+        "Base.metadata.create_all(engine)\n"
+        "with SessionLocal() as db:\n"
+        "    products = [models.Product(name=str(i)) for i in range(5)]\n"
+        "    db.add(models.User(email='a', orders=[models.Order(status='new', products=products) for _ in range(20)]))\n"
+        "    db.commit()\n"
+        "statements = []\n"
+        "event.listen(engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))\n"
+        "with SessionLocal() as db:\n"
+        "    user = db.get(models.User, 1)\n"
+        "    print(len(statements), len(db.identity_map))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], cwd=tmp_path, capture_output=True, text=True,
+                            env={"DATABASE_URL": "sqlite://", "PATH": ""})
+    assert result.returncode == 0, result.stderr
+    # Reading one row runs one query and loads that row only, not the graph around it
+    assert result.stdout.split("\n")[:3] == ["['ix_orders_status_id', 'ix_orders_user_id_id']", "select select select", "1 1"]
+
+def run_generated_tests(scaffold, path):
+    """Write the scaffold's backend and run its own test suite; returns pytest's output"""
+    import subprocess, sys
+    files = dict(scaffold.backend_files(), **{"tests/__init__.py": "", "tests/test_crud.py": scaffold.tests()})
+    for name, source in files.items():
+        (path / name).parent.mkdir(parents=True, exist_ok=True)
+        (path / name).write_text(source)
+    result = subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"], cwd=path,
+                            capture_output=True, text=True, env={"DATABASE_URL": f"sqlite:///{path / 't.db'}", "PATH": ""})
+    assert result.returncode == 0, result.stdout
+    return result.stdout
+
+def test_scaffold_crud_pages_with_cursor_and_bulk_endpoints(tmp_path):
+    from app.services.scaffold import CrudScaffold
+    scaffold = CrudScaffold({"database": {"entities": [
+        {"name": "Ticket", "columns": [{"name": "code", "type": "string", "unique": True, "required": True},
+                                       {"name": "state", "type": "string"}], "indexes": ["state"]}]}})
+    assert "state: Optional[str] = Query(None)" in scaffold.router(scaffold.entities[0])
+    assert "3 passed" in run_generated_tests(scaffold, tmp_path)
+
+def test_scaffold_caches_get_endpoints_from_spec_hints(tmp_path):
+    from app.services.scaffold import CrudScaffold, ttl_seconds
+    assert [ttl_seconds(h) for h in ("5 minutes", "1h", "30s", 90, "none")] == [300, 3600, 30, 90, 0]
+    scaffold = CrudScaffold({"database": {"entities": [{"name": "Book", "columns": [{"name": "title", "type": "string"}]}]},
+                             "api": {"endpoints": [{"method": "GET", "path": "/api/v1/books", "caching": "5 minutes"}]}})
+    assert "cache.py" in scaffold.backend_files() and "redis" in scaffold.requirements()
+    assert "4 passed" in run_generated_tests(scaffold, tmp_path)
+
+def test_scaffold_rate_limits_endpoints_from_spec(tmp_path):
+    from app.services.scaffold import CrudScaffold, rate_budget
+    assert [rate_budget(h) for h in ("100/hour", "10 per minute", "500/15min", "soon")] == [(100, 3600), (10, 60), (500, 900), None]
+    scaffold = CrudScaffold({"security": {"rate_limiting": True},
+                             "database": {"entities": [{"name": "Book", "columns": [{"name": "title", "type": "string"}]}]},
+                             "api": {"endpoints": [{"method": "POST", "path": "/api/v1/books", "rate_limit": "10/minute"}]}})
+    source = scaffold.backend_files()["rate_limit.py"]
+    assert "('POST', re.compile('^/api/v1/books/?$'), 10, 60)" in source and "DEFAULT_RULE = (None" in source
+    assert "4 passed" in run_generated_tests(scaffold, tmp_path)
+
+def test_frontend_reuses_backend_reads_and_fans_out(tmp_path, monkeypatch):
+    import importlib.util
+    import sys
+    from types import SimpleNamespace
+    from app.services.scaffold import CrudScaffold
+    scaffold = CrudScaffold({"database": {"entities": [
+        {"name": "User", "columns": [{"name": "email", "type": "string"}]},
+        {"name": "Order", "columns": [{"name": "total", "type": "float"}], "relationships": [{"type": "many-to-one", "target": "User"}]}]}})
+    (tmp_path / "app.py").write_text(scaffold.flask_app([]))
+    (tmp_path / "templates").mkdir()
+    for name, template in scaffold.templates().items():
+        (tmp_path / "templates" / name).write_text(template)
+    spec = importlib.util.spec_from_file_location("generated_frontend", tmp_path / "app.py")
+    frontend = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "generated_frontend", frontend)  # Flask finds templates/ next to it
+    spec.loader.exec_module(frontend)
+    
+    calls = []
+    rows = {"/api/v1/users": [{"id": 7, "email": "a@b.c"}], "/api/v1/orders": [], "/api/v1/orders/1": {"id": 1, "user_id": 7}}
+    def get(url, params=None, timeout=None):
+        calls.append(url)
+        return SimpleNamespace(ok=True, status_code=200, headers={}, json=lambda: rows[url[len(frontend.BACKEND_URL):]])
+    frontend.backend = SimpleNamespace(get=get, request=lambda method, url, **kw: SimpleNamespace(ok=True, status_code=201))
+    client = frontend.app.test_client()
+    
+    client.get("/manage/orders")
+    client.get("/manage/orders")
+    assert len(calls) == 1
+    client.post("/manage/orders/new", data={"total": "2"})
+    client.get("/manage/orders")
+    assert len(calls) == 2
+    page = client.get("/manage/orders/1/edit").get_data(as_text=True)
+    assert '<option value="7" selected>a@b.c</option>' in page and len(calls) == 4
+
+def test_generated_pages_link_precompiled_compressed_assets(tmp_path, monkeypatch):
+    import asyncio, gzip, importlib.util, sys
+    from app.services.code_generator import CodeGenerator
+    spec = {"performance": {"minification": True, "compression": "gzip"},
+            "ui": {"pages": [{"route": "/", "title": "Home", "components": ["ContactForm"]}]},
+            "database": {"entities": [{"name": "Note", "columns": [{"name": "body", "type": "text"}]}]}}
+    frontend_path = Path(CodeGenerator(str(tmp_path)).generate_project(spec, "project_assets")) / "frontend"
+    pages = [p.read_text() for p in (frontend_path / "templates").iterdir()]
+    assert pages and not any("cdn.tailwindcss.com" in page or "<style>" in page for page in pages)
+    assets = sorted(p.name for p in (frontend_path / "static" / "assets").iterdir())
+    css = next(name for name in assets if name.startswith("app.") and name.endswith(".css"))
+    assert css + ".gz" in assets and not any(name.endswith(".br") for name in assets)
+    assert f'href="/assets/{css}"' in (frontend_path / "templates" / "index.html").read_text()
+    
+    spec = importlib.util.spec_from_file_location("generated_assets_frontend", frontend_path / "app.py")
+    frontend = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "generated_assets_frontend", frontend)
+    spec.loader.exec_module(frontend)
+    response = frontend.app.test_client().get(f"/assets/{css}", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "gzip" and response.mimetype == "text/css"
+    assert "immutable" in response.headers["Cache-Control"]
+    assert b".bg-gradient-to-r{" in gzip.decompress(response.data)
+    
+    # Whole-line // comments go, except inside template literals and block comments
+    from app.services.asset_pipeline import minify_js
+    script = "  // note\n  const t = `a\n  // kept\n`;\n  /* x\n  // y */\n  const r = /'/;\n"
+    assert minify_js(script.replace("  const r = /'/;\n", "")) == "const t = `a\n  // kept\n`;\n/* x\n// y */"
+    assert minify_js(script) == script  # cannot follow the regex literal: left as is
+    
+    # Pages of the multi-agent factory go through the same build
+    from app.services.ai_factory import AIFactory
+    factory = AIFactory("test-key")
+    result = asyncio.run(factory._phase_optimize({"html": factory._create_fallback_html("Demo", {}), "assets": {}}))
+    assert "cdn.tailwindcss.com" not in result["html"]
+    assert any(f'href="/assets/{name}"' in result["html"] for name in result["assets"] if name.startswith("app."))
+
+def test_generated_images_are_multi_stage_and_sized_from_scalability(tmp_path, monkeypatch):
+    import runpy
+    from app.services.code_generator import CodeGenerator
+    spec = {"scalability": {"scaling_strategy": {"vertical": {"recommended": "2 vCPU, 512MB RAM"}}},
+            "database": {"entities": [{"name": "Note", "columns": [{"name": "body", "type": "text"}]}]}}
+    project = Path(CodeGenerator(str(tmp_path)).generate_project(spec, "project_images"))
+    for package in ("backend", "frontend"):
+        dockerfile = (project / package / "Dockerfile").read_text()
+        assert dockerfile.count("FROM python:3.11-slim") == 3 and "USER app" in dockerfile
+        assert "compileall" in dockerfile and "pip install -r requirements.txt" not in dockerfile
+        requirements = (project / package / "requirements.txt").read_text()
+        assert requirements.endswith("\n") and "\n\n" not in requirements
+    assert "WEB_CONCURRENCY=2" in (project / "backend" / "Dockerfile").read_text()
+    assert "tests/" in (project / "backend" / ".dockerignore").read_text()
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    config = runpy.run_path(str(project / "frontend" / "gunicorn.conf.py"))
+    assert config["MAX_WORKERS"] == 4 and config["workers"] <= 4
+    assert "CACHE_BACKEND=memory" in (project / ".env").read_text()
+    # Two API workers with a rate limit share their buckets through Redis
+    spec["security"] = {"rate_limiting": True}
+    project = Path(CodeGenerator(str(tmp_path)).generate_project(spec, "project_shared"))
+    compose = (project / "docker-compose.yml").read_text()
+    assert "RATE_LIMIT_BACKEND=redis" in compose and "image: redis:7-alpine" in compose
+    assert "REDIS_URL=" in (project / ".env").read_text()
+    # Without Redis, each of several workers enforces its share of the budget
+    monkeypatch.setenv("WEB_CONCURRENCY", "2")
+    monkeypatch.setenv("RATE_LIMIT_BACKEND", "memory")
+    limiter = runpy.run_path(str(project / "backend" / "rate_limit.py"))
+    assert limiter["RateLimiter"](None, limiter["MemoryBuckets"]()).shares == 2
+
+def test_scaffold_emits_weighted_load_test_from_spec(tmp_path):
+    import json, subprocess, sys
+    from app.services.scaffold import CrudScaffold
+    scaffold = CrudScaffold({"database": {"entities": [
+        {"name": "Author", "columns": [{"name": "name", "type": "string", "required": True}]},
+        {"name": "Book", "columns": [{"name": "title", "type": "string"}],
+         "relationships": [{"type": "many-to-one", "target": "Author"}]}]}})
+    scenarios = {s["name"]: s for s in scaffold.load_scenarios()}
+    assert scenarios["GET /api/v1/books"]["weight"] > scenarios["POST /api/v1/books"]["weight"]
+    assert scenarios["POST /api/v1/books"]["body"]["author_id"] == "ref:/api/v1/authors"
+    assert scenarios["PATCH /api/v1/books/{id}"]["params"] == {"id": "/api/v1/books"}
+    files = dict(scaffold.backend_files(), **{"tests/__init__.py": "", "tests/loadtest.py": scaffold.load_test()})
+    for name, source in files.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(source)
+    probe = (
+        "import asyncio, json, httpx, main\n"
+        "from tests import loadtest\n"
+        "report = asyncio.run(loadtest.run('http://test', [(1, 3)], transport=httpx.ASGITransport(app=main.app)))\n"
+        "print(json.dumps(report))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], cwd=tmp_path, capture_output=True, text=True,
+                            env={"DATABASE_URL": f"sqlite:///{tmp_path / 't.db'}", "RATE_LIMIT_ENABLED": "0", "PATH": ""})
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report["requests"] > 0 and report["errors"] == 0 and report["throughput_rps"] > 0
+    assert report["latency_ms"]["p95"] is not None and "GET /api/v1/books" in report["scenarios"]
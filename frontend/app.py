@@ -6,6 +6,11 @@ app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key')
 
 BACKEND_URL = os.environ.get('BACKEND_API_URL', 'http://localhost:8000')
+PASSTHROUGH_HEADERS = ('ETag', 'Cache-Control', 'X-Next-Cursor', 'Last-Modified')
+CONDITIONAL_HEADERS = ('If-None-Match', 'If-Modified-Since', 'Range', 'If-Range')
+DOWNLOAD_HEADERS = ('Content-Type', 'Content-Length', 'Content-Encoding', 'Content-Disposition', 'Content-Range',
+                    'Accept-Ranges', 'ETag', 'Last-Modified', 'Cache-Control')
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
 
 print(f"="*50)
 print(f"[STARTUP] Backend URL: {BACKEND_URL}")
@@ -68,14 +73,26 @@ def dashboard():
         return redirect(url_for('login'))
     
     headers = {'Authorization': f'Bearer {session["token"]}'}
-    response = requests.get(f'{BACKEND_URL}/api/v1/projects', headers=headers)
+    params = {'cursor': request.args['cursor']} if request.args.get('cursor') else None
+    response = requests.get(f'{BACKEND_URL}/api/v1/projects', headers=headers, params=params)
     
     if response.status_code == 200:
         projects = response.json()
-        return render_template('dashboard.html', projects=projects)
+        return render_template('dashboard.html', projects=projects, next_cursor=response.headers.get('X-Next-Cursor'))
     
     return redirect(url_for('login'))
 
+def stream_download(response):
+    """Relay a backend file response chunk by chunk, bytes untouched (no re-decoding of Content-Encoding)"""
+    headers = {k: response.headers[k] for k in DOWNLOAD_HEADERS if k in response.headers}
+    
+    def generate():
+        with response:
+            for chunk in response.raw.stream(DOWNLOAD_CHUNK_SIZE, decode_content=False):
+                yield chunk
+    
+    return Response(generate(), status=response.status_code, headers=headers, direct_passthrough=True)
+
 @app.route('/api/<path:path>', methods=['GET', 'POST', 'PUT', 'DELETE', 'PATCH'])
 def api_proxy(path):
     """Proxy universel pour toutes les requêtes API"""
@@ -83,6 +100,9 @@ def api_proxy(path):
         return {'error': 'Unauthorized'}, 401
     
     headers = {'Authorization': f'Bearer {session["token"]}'}
+    for name in CONDITIONAL_HEADERS:
+        if request.headers.get(name):
+            headers[name] = request.headers[name]
     url = f'{BACKEND_URL}/api/v1/{path}'
     
     # Ajouter les query params
@@ -119,6 +139,7 @@ def api_proxy(path):
                 files=files,
                 data=request.form,
                 headers=headers,
+                stream=True,
                 timeout=180
             )
         # Gérer JSON
@@ -128,6 +149,7 @@ def api_proxy(path):
                 url=url,
                 json=request.get_json(),
                 headers=headers,
+                stream=True,
                 timeout=300  # 5 minutes pour génération de code
             )
         # Gérer form data
@@ -137,15 +159,25 @@ def api_proxy(path):
                 url=url,
                 data=request.form,
                 headers=headers,
+                stream=True,
                 timeout=180
             )
         
         print(f"[PROXY] Response: {response.status_code}")
         
+        # Keep the backend's caching / pagination headers so the browser can revalidate
+        passthrough = {k: response.headers[k] for k in PASSTHROUGH_HEADERS if k in response.headers}
+        if response.status_code == 304:
+            return Response(status=304, headers=passthrough)
+        
+        # Téléchargements (ZIP, plages 206) : relayés tels quels, sans tout charger en mémoire
+        if 'Content-Disposition' in response.headers or response.status_code in (206, 416):
+            return stream_download(response)
+        
         try:
-            return response.json(), response.status_code
+            return response.json(), response.status_code, passthrough
         except:
-            return {'message': response.text}, response.status_code
+            return {'message': response.text}, response.status_code, passthrough
             
     except requests.exceptions.ConnectionError as e:
         print(f"[PROXY] Connection Error: {e}")